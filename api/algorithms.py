@@ -1,59 +1,221 @@
+import os
+from typing import Dict, List, Literal, Optional
+
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from api.priority_attributes_calculator import PriorityAttributesCalculator
+from pydantic import BaseModel, Field
+from api.batch import run_batch
+from api.graph_store import GraphNotFound, resolve_graph
+from api.priority_attributes_calculator import MAX_PROCESSORS
+from api.process_pool import REQUEST_TIMEOUT, WORKERS, PoolError, run_calculation
+from api.result_cache import cached_call
+from api.streaming import stream_calculation
+from api.timed_route import EncodedJSONResponse, ORJSONResponse, TimedRoute
+
+router = APIRouter(default_response_class=ORJSONResponse, route_class=TimedRoute)
+
+# detail: "schedule" (placements and makespan), "steps" (no candidates) or "full"
+# cursor/limit page through the steps; the response then also carries next_cursor
+# stream=true sends the steps as newline-delimited JSON while they are computed
+# insertion=true lets a task fill an idle gap on a processor instead of only being appended
+DetailLevel = Literal["schedule", "steps", "full"]
 
-router = APIRouter()
+# /brute-force runs in a pool worker and its parallel search starts `workers`
+# processes of its own, so the server bounds both: more workers than
+# BRUTE_FORCE_MAX_WORKERS (default: one per core, at most the pool's size) is
+# a 400, and the search budget is clamped so that it ends well within the
+# request timeout
+BRUTE_FORCE_MAX_WORKERS = int(os.environ.get("BRUTE_FORCE_MAX_WORKERS", min(os.cpu_count() or 1, WORKERS)))
+BRUTE_FORCE_MAX_SECONDS = float(os.environ.get("BRUTE_FORCE_MAX_SECONDS", REQUEST_TIMEOUT / 2))
+BRUTE_FORCE_MAX_NODES = int(os.environ.get("BRUTE_FORCE_MAX_NODES", 10_000_000))
 
 
 class GraphData(BaseModel):
+    # Either the graph itself or the graph_id returned by POST /graph
+    num_processors: int = Field(ge=1, le=MAX_PROCESSORS)
+    nodes: Optional[list] = None
+    edges: Optional[list] = None
+    graph_id: Optional[str] = None
+
+
+class HeterogeneousGraphData(GraphData):
+    # Either a speed per processor (a task then takes weight / speed) or the
+    # cost of every task on every processor, keyed by node id
+    processor_speeds: Optional[List[float]] = None
+    computation_costs: Optional[Dict[str, List[float]]] = None
+
+
+class BatchGraph(BaseModel):
+    nodes: Optional[list] = None
+    edges: Optional[list] = None
+    graph_id: Optional[str] = None
+
+
+class SweepGraphData(BaseModel):
+    # The processor counts come from the query, so no num_processors
+    nodes: Optional[list] = None
+    edges: Optional[list] = None
+    graph_id: Optional[str] = None
+
+
+class BatchJob(BaseModel):
+    graph: int  # index into BatchData.graphs
+    algorithm: str
     num_processors: int
-    nodes: list
-    edges: list
+    insertion: bool = False
+
+
+class BatchData(BaseModel):
+    graphs: List[BatchGraph]
+    jobs: List[BatchJob]
+
+
+@router.post("/hlfet-steps")
+def hlfet_steps(graph_data: GraphData, detail: DetailLevel = "full", cursor: int = 0, limit: Optional[int] = None,
+                stream: bool = False, insertion: bool = False):
+    try:
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_hlfet_steps", detail, cursor, limit, insertion)
+        steps = cached_call(resolve_graph(graph_data),
+                            f"hlfet-steps?detail={detail}&cursor={cursor}&limit={limit}&insertion={insertion}",
+                            lambda json_data: run_calculation(
+                                json_data, "calculate_hlfet_steps", detail, cursor, limit, insertion))
+        return EncodedJSONResponse(steps)
+    except (PoolError, GraphNotFound):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/mcp-steps")
+def mcp_steps(graph_data: GraphData, detail: DetailLevel = "full", cursor: int = 0, limit: Optional[int] = None,
+              stream: bool = False, insertion: bool = False):
+    try:
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_mcp_steps", detail, cursor, limit, insertion)
+        steps = cached_call(resolve_graph(graph_data),
+                            f"mcp-steps?detail={detail}&cursor={cursor}&limit={limit}&insertion={insertion}",
+                            lambda json_data: run_calculation(
+                                json_data, "calculate_mcp_steps", detail, cursor, limit, insertion))
+        return EncodedJSONResponse(steps)
+    except (PoolError, GraphNotFound):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/hlfet-steps", response_model=list)
-def hlfet_steps(graph_data: GraphData):
+@router.post("/etf-steps")
+def etf_steps(graph_data: GraphData, detail: DetailLevel = "full", cursor: int = 0, limit: Optional[int] = None,
+              stream: bool = False, insertion: bool = False):
     try:
-        calculator = PriorityAttributesCalculator(graph_data.dict())
-        steps = calculator.calculate_hlfet_steps()
-        return steps
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_etf_steps", detail, cursor, limit, insertion)
+        steps = cached_call(resolve_graph(graph_data),
+                            f"etf-steps?detail={detail}&cursor={cursor}&limit={limit}&insertion={insertion}",
+                            lambda json_data: run_calculation(
+                                json_data, "calculate_etf_steps", detail, cursor, limit, insertion))
+        return EncodedJSONResponse(steps)
+    except (PoolError, GraphNotFound):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/mcp-steps", response_model=list)
-def mcp_steps(graph_data: GraphData):
+@router.post("/dls-steps")
+def dls_steps(graph_data: GraphData, detail: DetailLevel = "full", cursor: int = 0, limit: Optional[int] = None,
+              stream: bool = False, insertion: bool = False):
     try:
-        calculator = PriorityAttributesCalculator(graph_data.dict())
-        steps = calculator.calculate_mcp_steps()
-        return steps
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_dls_steps", detail, cursor, limit, insertion)
+        steps = cached_call(resolve_graph(graph_data),
+                            f"dls-steps?detail={detail}&cursor={cursor}&limit={limit}&insertion={insertion}",
+                            lambda json_data: run_calculation(
+                                json_data, "calculate_dls_steps", detail, cursor, limit, insertion))
+        return EncodedJSONResponse(steps)
+    except (PoolError, GraphNotFound):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/etf-steps", response_model=list)
-def etf_steps(graph_data: GraphData):
+@router.post("/heft-steps")
+def heft_steps(graph_data: HeterogeneousGraphData, detail: DetailLevel = "full", cursor: int = 0,
+              limit: Optional[int] = None, stream: bool = False):
     try:
-        calculator = PriorityAttributesCalculator(graph_data.dict())
-        steps = calculator.calculate_etf_steps()
-        return steps
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_heft_steps", detail, cursor, limit)
+        steps = cached_call(resolve_graph(graph_data), f"heft-steps?detail={detail}&cursor={cursor}&limit={limit}",
+                            lambda json_data: run_calculation(
+                                json_data, "calculate_heft_steps", detail, cursor, limit))
+        return EncodedJSONResponse(steps)
+    except (PoolError, GraphNotFound):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-# @router.post("/dls-steps", response_model=list)
-# def dls_steps(graph_data: GraphData):
-#     try:
-#         calculator = PriorityAttributesCalculator(graph_data.dict())
-#         steps = calculator.calculate_dls_steps()
-#         return steps
-#     except Exception as e:
-#         raise HTTPException(status_code=400, detail=str(e))
-#
-# @router.post("/brute-force", response_model=list)
-# def brute_force_solution(graph_data: GraphData):
-#     try:
-#         calculator = PriorityAttributesCalculator(graph_data.dict())
-#         steps = calculator.brute_force_solution()
-#         return steps
-#     except Exception as e:
-#         raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/cpop-steps")
+def cpop_steps(graph_data: HeterogeneousGraphData, detail: DetailLevel = "full", cursor: int = 0,
+              limit: Optional[int] = None, stream: bool = False):
+    try:
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_cpop_steps", detail, cursor, limit)
+        steps = cached_call(resolve_graph(graph_data), f"cpop-steps?detail={detail}&cursor={cursor}&limit={limit}",
+                            lambda json_data: run_calculation(
+                                json_data, "calculate_cpop_steps", detail, cursor, limit))
+        return EncodedJSONResponse(steps)
+    except (PoolError, GraphNotFound):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/sweep")
+def processor_sweep(graph_data: SweepGraphData, algorithm: Literal["hlfet", "mcp", "etf", "dls"] = "hlfet",
+                    min_processors: int = 1, max_processors: int = 32, insertion: bool = False):
+    # Makespan, speedup and efficiency for every processor count in the range
+    try:
+        json_data = dict(resolve_graph(graph_data), num_processors=max_processors)
+        curve = cached_call(json_data,
+                            f"sweep?algorithm={algorithm}&min_processors={min_processors}"
+                            f"&max_processors={max_processors}&insertion={insertion}",
+                            lambda json_data: run_calculation(
+                                json_data, "calculate_processor_sweep", algorithm, min_processors,
+                                max_processors, insertion))
+        return EncodedJSONResponse(curve)
+    except (PoolError, GraphNotFound):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/batch")
+def batch(batch_data: BatchData):
+    try:
+        results = run_batch([resolve_graph(graph) for graph in batch_data.graphs],
+                            [dict(job) for job in batch_data.jobs])
+        return ORJSONResponse({"results": results})
+    except (PoolError, GraphNotFound):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/brute-force")
+def brute_force_solution(graph_data: GraphData, time_limit: float = 10.0, node_limit: int = 1_000_000,
+                         workers: Optional[int] = None):
+    try:
+        if workers is None:
+            workers = BRUTE_FORCE_MAX_WORKERS
+        if not 1 <= workers <= BRUTE_FORCE_MAX_WORKERS:
+            raise ValueError(f"Workers must be between 1 and {BRUTE_FORCE_MAX_WORKERS}.")
+        time_limit = min(time_limit, BRUTE_FORCE_MAX_SECONDS)
+        node_limit = min(node_limit, BRUTE_FORCE_MAX_NODES)
+        result = cached_call(resolve_graph(graph_data),
+                             f"brute-force?time_limit={time_limit}&node_limit={node_limit}&workers={workers}",
+                             lambda json_data: run_calculation(
+                                 json_data, "brute_force_solution", time_limit, node_limit, workers, min_nodes=0))
+        return EncodedJSONResponse(result)
+    except (PoolError, GraphNotFound):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,91 @@
+# api/batch.py
+import math
+import time
+from collections import deque
+
+from .priority_attributes_calculator import MAX_PROCESSORS, PriorityAttributesCalculator
+from .process_pool import REQUEST_TIMEOUT, WORKERS, PoolBusy, submit, wait
+
+SCHEDULERS = {
+    "hlfet": "calculate_hlfet_steps",
+    "mcp": "calculate_mcp_steps",
+    "etf": "calculate_etf_steps",
+    "dls": "calculate_dls_steps",
+}
+
+
+def run_graph_jobs(json_data, jobs):
+    # Runs in a worker process: the graph is parsed and its attributes computed
+    # once, then shared by every job on it (they only differ in algorithm and P)
+    try:
+        calculator = PriorityAttributesCalculator(dict(json_data, num_processors=None))
+    except Exception as e:
+        return [{"error": str(e)} for _ in jobs]
+
+    results = []
+    for job in jobs:
+        try:
+            calculator.num_processors = job['num_processors']
+            schedule = getattr(calculator, SCHEDULERS[job['algorithm']])(
+                detail="schedule", insertion=job.get('insertion', False))
+            results.append(schedule)
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+
+def run_batch(graphs, jobs):
+    # Groups jobs by graph and spreads the groups over the process pool. Graphs
+    # with many jobs are split into chunks so that every core gets work.
+    for job in jobs:
+        if not 0 <= job['graph'] < len(graphs):
+            raise ValueError(f"Job refers to graph {job['graph']}, but only {len(graphs)} graphs were sent.")
+        if job['algorithm'] not in SCHEDULERS:
+            raise ValueError(f"Invalid algorithm. Please provide one of: {', '.join(SCHEDULERS)}.")
+        if not 1 <= job['num_processors'] <= MAX_PROCESSORS:
+            raise ValueError(f"num_processors must be between 1 and {MAX_PROCESSORS}.")
+
+    by_graph = {}
+    for index, job in enumerate(jobs):
+        by_graph.setdefault(job['graph'], []).append(index)
+
+    chunks_per_graph = max(1, math.ceil(WORKERS / max(1, len(by_graph))))
+    chunks = []
+    for graph, indices in by_graph.items():
+        chunk_size = max(1, math.ceil(len(indices) / chunks_per_graph))
+        chunks.extend((graph, indices[start:start + chunk_size]) for start in range(0, len(indices), chunk_size))
+
+    # At most WORKERS chunks of the batch are in the pool at a time: enough to
+    # keep every worker busy without taking the slots of other requests. When
+    # the pool is full the batch waits for one of its own chunks, and only a
+    # pool full of other requests' work is a 503.
+    deadline = time.monotonic() + REQUEST_TIMEOUT
+    results = [None] * len(jobs)
+    in_flight = deque()
+
+    def collect():
+        # The whole batch shares one request timeout
+        chunk, future = in_flight.popleft()
+        for index, result in zip(chunk, wait(future, max(0.0, deadline - time.monotonic()))):
+            results[index] = dict(jobs[index], **result)
+
+    try:
+        for graph, chunk in chunks:
+            while True:
+                if len(in_flight) < WORKERS:
+                    try:
+                        future = submit(run_graph_jobs, graphs[graph], [jobs[index] for index in chunk])
+                        break
+                    except PoolBusy:
+                        if not in_flight:
+                            raise
+                collect()
+            in_flight.append((chunk, future))
+        while in_flight:
+            collect()
+        return results
+    except Exception:
+        # Rejected or timed out: drop the chunks that have not started
+        for _, future in in_flight:
+            future.cancel()
+        raise
@@ -0,0 +1,135 @@
+# api/compact_graph.py
+import numpy as np
+
+
+def _numeric_array(values, name):
+    array = np.asarray(values)
+    if array.size == 0:
+        return array.astype(np.int64)
+    if array.dtype.kind in 'biu':
+        return array.astype(np.int64, copy=False)
+    if array.dtype.kind == 'f':
+        return array
+    raise ValueError(f"{name} must be numeric.")
+
+
+def _pointers(keys, num_nodes):
+    pointers = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=num_nodes), out=pointers[1:])
+    return pointers
+
+
+def _deduplicate(sources, targets, costs, num_nodes):
+    # Repeated (source, target) pairs collapse like nx.DiGraph.add_edge: the edge
+    # keeps the position of its first occurrence and the cost of its last one.
+    if len(sources) == 0:
+        return sources, targets, costs
+    keys = sources.astype(np.int64) * num_nodes + targets
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    if len(starts) == len(keys):
+        return sources, targets, costs
+    ends = np.r_[starts[1:], len(keys)] - 1
+    first, last = order[starts], order[ends]
+    position = np.argsort(first, kind='stable')
+    return sources[first[position]], targets[first[position]], costs[last[position]]
+
+
+class CompactGraph:
+    # Array-backed DAG used by the attribute and scheduling passes.
+    #
+    # Node ids are mapped to 0..V-1 in input order. Weights live in a NumPy
+    # array and the edges are stored twice in CSR form: grouped by source for
+    # successors and by target for predecessors, each keeping input order
+    # within a node (the same order nx.DiGraph would iterate them in).
+    def __init__(self, node_ids, weights, sources, targets, costs, index=None):
+        self.node_ids = list(node_ids)
+        self.index = index if index is not None else {node_id: i for i, node_id in enumerate(self.node_ids)}
+        if len(self.index) != len(self.node_ids):
+            raise ValueError("Node ids must be unique.")
+        self.num_nodes = len(self.node_ids)
+        self.weights = _numeric_array(weights, "Node weights")
+        if len(self.weights) != self.num_nodes:
+            raise ValueError("Every node needs exactly one weight.")
+
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        costs = _numeric_array(costs, "Edge costs")
+        if not len(sources) == len(targets) == len(costs):
+            raise ValueError("Edge sources, targets and costs must have the same length.")
+        if len(sources) and (min(sources.min(), targets.min()) < 0 or
+                             max(sources.max(), targets.max()) >= self.num_nodes):
+            raise ValueError("Edge references an unknown node.")
+        sources, targets, costs = _deduplicate(sources, targets, costs, self.num_nodes)
+        self.num_edges = len(sources)
+
+        order = np.argsort(sources, kind='stable')
+        self.succ_ptr = _pointers(sources, self.num_nodes)
+        self.succ_idx = targets[order]
+        self.succ_cost = costs[order]
+
+        order = np.argsort(targets, kind='stable')
+        self.pred_ptr = _pointers(targets, self.num_nodes)
+        self.pred_idx = sources[order]
+        self.pred_cost = costs[order]
+
+        self._generations = None
+        self._topological_order = None
+        self._reverse_topological_order = None
+
+    def weight_list(self):
+        return self.weights.tolist()
+
+    def in_degrees(self):
+        return np.diff(self.pred_ptr).tolist()
+
+    def out_degrees(self):
+        return np.diff(self.succ_ptr).tolist()
+
+    def successors(self, node):
+        return self.succ_idx[self.succ_ptr[node]:self.succ_ptr[node + 1]].tolist()
+
+    def predecessors(self, node):
+        return self.pred_idx[self.pred_ptr[node]:self.pred_ptr[node + 1]].tolist()
+
+    def out_edges(self, node):
+        # (successors, costs) of node
+        start, end = self.succ_ptr[node], self.succ_ptr[node + 1]
+        return self.succ_idx[start:end].tolist(), self.succ_cost[start:end].tolist()
+
+    def in_edges(self, node):
+        # (predecessors, costs) of node
+        start, end = self.pred_ptr[node], self.pred_ptr[node + 1]
+        return self.pred_idx[start:end].tolist(), self.pred_cost[start:end].tolist()
+
+    def generations(self):
+        # Kahn's algorithm level by level, in the order nx.topological_generations yields
+        if self._generations is None:
+            in_degree = self.in_degrees()
+            succ_ptr, succ_idx = self.succ_ptr.tolist(), self.succ_idx.tolist()
+            generations = []
+            current = [node for node in range(self.num_nodes) if in_degree[node] == 0]
+            while current:
+                generations.append(current)
+                following = []
+                for node in current:
+                    for successor in succ_idx[succ_ptr[node]:succ_ptr[node + 1]]:
+                        in_degree[successor] -= 1
+                        if in_degree[successor] == 0:
+                            following.append(successor)
+                current = following
+            if sum(len(generation) for generation in generations) != self.num_nodes:
+                raise ValueError("Graph contains a cycle or graph changed during iteration")
+            self._generations = generations
+        return self._generations
+
+    def topological_order(self):
+        if self._topological_order is None:
+            self._topological_order = [node for generation in self.generations() for node in generation]
+        return self._topological_order
+
+    def reverse_topological_order(self):
+        if self._reverse_topological_order is None:
+            self._reverse_topological_order = self.topological_order()[::-1]
+        return self._reverse_topological_order
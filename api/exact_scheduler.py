@@ -0,0 +1,306 @@
+# api/exact_scheduler.py
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Searches that finish within this many nodes are not worth starting a pool for
+PROBE_NODES = 20_000
+# Subtrees handed out per worker, so that uneven subtrees still keep every core busy
+SUBTREES_PER_WORKER = 8
+
+# (best makespan, explored nodes) shared by the workers of a parallel search,
+# and the states the serial probe before it has fully explored
+_shared = None
+_visited = frozenset()
+
+
+def _init_worker(best, explored, visited):
+    global _shared, _visited
+    _shared = (best, explored)
+    _visited = visited
+
+
+def _search_subtree(scheduler, prefix):
+    scheduler.shared = _shared
+    scheduler.visited = set(_visited)
+    return scheduler.search_subtree(prefix)
+
+
+class BranchAndBoundScheduler:
+    # Depth-first branch-and-bound over (ready task, processor) choices.
+    #
+    # Tasks are appended to a processor at max(processor available time,
+    # data-ready time). Every schedule can be left-shifted until each task
+    # starts at exactly that time, and such a schedule is rebuilt by placing
+    # its tasks in (start time, topological position) order. So only children
+    # that keep that order are expanded: the search stays exact while never
+    # building the same schedule twice.
+    #
+    # Pruning:
+    #   - lower bound: for every ready task its earliest possible start plus
+    #     its static level (the b-level without communication, which
+    #     co-located tasks do not pay), the current makespan and the remaining
+    #     work spread over the processors
+    #   - processor symmetry: an unused processor is only tried once
+    #   - visited states: partial schedules that leave the same future (same
+    #     tasks placed, same processor loads and the same pending messages,
+    #     up to processor relabelling) are only expanded once
+    # The search stops early, without proving optimality, when the time or
+    # node budget runs out.
+    #
+    # With several workers a serial probe searches first, and only a search it
+    # cannot finish is split at the top into subtrees for a process pool. The
+    # workers start from the probe's best makespan and visited states, publish
+    # every better makespan to a shared value and prune against the best one
+    # any of them has found.
+    def __init__(self, graph, num_processors, static_level, upper_bound=float('inf'), schedule=None,
+                 time_limit=10.0, node_limit=1_000_000, max_visited=2_000_000):
+        self.graph = graph
+        self.num_processors = num_processors
+        self.static_level = static_level
+        self.deadline = time.monotonic() + time_limit
+        self.node_limit = node_limit
+        self.max_visited = max_visited
+
+        self.weights = graph.weight_list()
+        self.in_edges = [graph.in_edges(node) for node in range(graph.num_nodes)]
+        self.successors = [graph.successors(node) for node in range(graph.num_nodes)]
+        self.total_work = sum(self.weights)
+        self._max_cost = [max(graph.out_edges(node)[1], default=0) for node in range(graph.num_nodes)]
+        self._position = [0] * graph.num_nodes
+        for position, node in enumerate(graph.topological_order()):
+            self._position[node] = position
+
+        # Best schedule so far as [(node, processor, start_time, end_time)], processors from 0
+        self.best_makespan = upper_bound
+        self.best_schedule = schedule
+        self.improved = False
+        self.explored = 0
+        self.exhausted = False
+        self.shared = None
+        self.visited = set()
+        self._reset()
+
+    def lower_bound(self):
+        # Longest computation-only path, or the total work spread over every processor
+        return max(max(self.static_level, default=0), self.total_work / self.num_processors)
+
+    def solve(self, workers=1):
+        if self.best_makespan <= self.lower_bound():
+            return self.best_makespan, self.best_schedule, True
+
+        node_limit = self.node_limit
+        if workers > 1:
+            self.node_limit = min(node_limit, PROBE_NODES)
+        self._search(self._root())
+        if workers > 1 and self.exhausted and self.explored < node_limit and time.monotonic() < self.deadline:
+            self.node_limit = node_limit
+            self.exhausted = False
+            self._search_parallel(workers)
+        self.node_limit = node_limit
+        return self.best_makespan, self.best_schedule, not self.exhausted
+
+    def search_subtree(self, prefix):
+        # Runs in a worker: replays the placements in prefix, then searches below them
+        self.explored = 0
+        self.improved = False
+        state = self._root()
+        for node, processor, start_time in prefix:
+            state, _ = self._place(state, node, processor, start_time)
+        self._search(state)
+        return (self.best_makespan, self.best_schedule if self.improved else None,
+                self.exhausted, self.explored)
+
+    def _search_parallel(self, workers):
+        # The probe's visited states were all fully explored (_search drops the
+        # ones it was interrupted in), so the workers can skip them too
+        visited = frozenset(self.visited)
+        frontier = self._split(SUBTREES_PER_WORKER * workers)
+        self._reset()
+        self.visited = set()
+        if not frontier:
+            return
+        best = multiprocessing.Value('d', self.best_makespan)
+        explored = multiprocessing.Value('q', self.explored)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(best, explored, visited)) as pool:
+            futures = [pool.submit(_search_subtree, self, prefix) for prefix in frontier]
+            for future in futures:
+                makespan, schedule, exhausted, explored_nodes = future.result()
+                if schedule is not None and makespan < self.best_makespan:
+                    self.best_makespan = makespan
+                    self.best_schedule = schedule
+                self.exhausted = self.exhausted or exhausted
+                self.explored += explored_nodes
+
+    def _split(self, count):
+        # Expands the top of the tree breadth-first until it has count subtrees,
+        # each given by the placements that lead to it
+        frontier = [()]
+        while 0 < len(frontier) < count:
+            next_frontier = []
+            for prefix in frontier:
+                self._reset()
+                state = self._root()
+                for node, processor, start_time in prefix:
+                    state, _ = self._place(state, node, processor, start_time)
+                self.explored += 1
+                for start_time, _, node, processor in self._expand(state) or []:
+                    next_frontier.append(prefix + ((node, processor, start_time),))
+            if not next_frontier:
+                return []
+            frontier = next_frontier
+        return frontier
+
+    def _reset(self):
+        num_nodes = self.graph.num_nodes
+        self._remaining = [len(predecessors) for predecessors, _ in self.in_edges]
+        self._unfinished = [len(successors) for successors in self.successors]
+        self._processor = [None] * num_nodes
+        self._end_time = [None] * num_nodes
+        self._available = [0] * self.num_processors
+        self._placed = []
+
+    def _root(self):
+        # Search state: (placed mask, processors used, (start time, topological
+        # position) of the last placed task, remaining work, ready tasks)
+        return 0, 0, (0, -1), self.total_work, [node for node in range(self.graph.num_nodes)
+                                                if self._remaining[node] == 0]
+
+    def _data_ready(self, node, processor):
+        ready_time = 0
+        predecessors, costs = self.in_edges[node]
+        for predecessor, cost in zip(predecessors, costs):
+            if self._processor[predecessor] == processor:
+                ready_time = max(ready_time, self._end_time[predecessor])
+            else:
+                ready_time = max(ready_time, self._end_time[predecessor] + cost)
+        return ready_time
+
+    def _state_key(self, mask, last):
+        # Nothing can start before last_start any more, so only times past it
+        # matter: per processor, when it is free and the messages its tasks
+        # still owe unplaced successors. Sorted, so relabelled processors match.
+        last_start = last[0]
+        pending = [[] for _ in range(self.num_processors)]
+        for node in self._placed:
+            if self._unfinished[node] and self._end_time[node] + self._max_cost[node] > last_start:
+                pending[self._processor[node]].append((node, self._end_time[node]))
+        return mask, last, tuple(sorted((max(self._available[processor], last_start), tuple(pending[processor]))
+                                        for processor in range(self.num_processors)))
+
+    def _out_of_budget(self):
+        if self.explored % 1024:
+            return self.shared is None and self.explored >= self.node_limit
+        explored = self.explored
+        if self.shared is not None:
+            best, shared_explored = self.shared
+            with shared_explored.get_lock():
+                shared_explored.value += 1024
+                explored = shared_explored.value
+            self.best_makespan = min(self.best_makespan, best.value)
+        return explored >= self.node_limit or time.monotonic() > self.deadline
+
+    def _improve(self, makespan):
+        self.best_makespan = makespan
+        self.best_schedule = [(node, self._processor[node], self._end_time[node] - self.weights[node],
+                               self._end_time[node]) for node in self._placed]
+        self.improved = True
+        if self.shared is not None:
+            best, _ = self.shared
+            with best.get_lock():
+                best.value = min(best.value, makespan)
+
+    def _expand(self, state):
+        # Children of state as (start time, -static level, node, processor), or
+        # None when the state is pruned. Complete schedules are recorded here.
+        mask, used, last, remaining_work, ready = state
+        # Visited key of this state when it is added below, for _search
+        self._key = None
+        if not ready:
+            makespan = max(self._available)
+            if makespan < self.best_makespan:
+                self._improve(makespan)
+            return None
+
+        last_start = last[0]
+        processors = range(min(used + 1, self.num_processors))
+        children = []
+        # Remaining work fits between last_start (or a busy processor's available time) and the makespan
+        lower_bound = max(max(self._available),
+                          (sum(max(available, last_start) for available in self._available) + remaining_work)
+                          / self.num_processors)
+        for node in ready:
+            earliest = float('inf')
+            for processor in processors:
+                start_time = max(self._available[processor], self._data_ready(node, processor))
+                earliest = min(earliest, max(start_time, last_start))
+                if ((start_time, self._position[node]) > last
+                        and start_time + self.static_level[node] < self.best_makespan):
+                    children.append((start_time, -self.static_level[node], node, processor))
+            lower_bound = max(lower_bound, earliest + self.static_level[node])
+        if lower_bound >= self.best_makespan:
+            return None
+
+        if len(self.visited) < self.max_visited:
+            key = self._state_key(mask, last)
+            if key in self.visited:
+                return None
+            self.visited.add(key)
+            self._key = key
+
+        # Earliest start first, then highest static level, so good schedules come first
+        children.sort()
+        return children
+
+    def _place(self, state, node, processor, start_time):
+        # Returns the child state and the processor's previous available time
+        mask, used, last, remaining_work, ready = state
+        end_time = start_time + self.weights[node]
+        previous_available = self._available[processor]
+        self._processor[node] = processor
+        self._end_time[node] = end_time
+        self._available[processor] = end_time
+        self._placed.append(node)
+        predecessors, _ = self.in_edges[node]
+        for predecessor in predecessors:
+            self._unfinished[predecessor] -= 1
+        next_ready = [other for other in ready if other != node]
+        for successor in self.successors[node]:
+            self._remaining[successor] -= 1
+            if self._remaining[successor] == 0:
+                next_ready.append(successor)
+        return (mask | (1 << node), max(used, processor + 1), (start_time, self._position[node]),
+                remaining_work - self.weights[node], next_ready), previous_available
+
+    def _unplace(self, node, processor, previous_available):
+        for successor in self.successors[node]:
+            self._remaining[successor] += 1
+        predecessors, _ = self.in_edges[node]
+        for predecessor in predecessors:
+            self._unfinished[predecessor] += 1
+        self._placed.pop()
+        self._available[processor] = previous_available
+        self._processor[node] = None
+        self._end_time[node] = None
+
+    def _search(self, state):
+        if self.exhausted:
+            return
+        self.explored += 1
+        if self._out_of_budget():
+            self.exhausted = True
+            return
+
+        children = self._expand(state) or []
+        key = self._key
+        for start_time, _, node, processor in children:
+            if start_time + self.static_level[node] >= self.best_makespan:
+                continue
+            child, previous_available = self._place(state, node, processor, start_time)
+            self._search(child)
+            self._unplace(node, processor, previous_available)
+            if self.exhausted:
+                # Only fully explored states may prune later searches
+                self.visited.discard(key)
+                return
@@ -0,0 +1,52 @@
+# api/graph_analytics.py
+import numpy as np
+
+
+def graph_analytics(graph, t_level, b_level, lst):
+    # Whole-graph figures from the attributes of obtain_attribute_dict, in O(V + E):
+    #   critical_path - a longest entry-to-exit path, counting node weights and
+    #                   edge costs: the entry with the highest B-Level, then
+    #                   always the successor that gives its B-Level (first one
+    #                   in edge order on ties)
+    #   slack         - LST - EST of every node
+    #   ccr           - mean edge cost / mean node weight
+    #   width         - size of the largest topological generation. Nodes of a
+    #                   generation are independent, so this is a lower bound of
+    #                   the maximum antichain (computing that exactly needs a
+    #                   bipartite matching)
+    #   levels        - number of nodes in each generation
+    node_ids = graph.node_ids
+    weights = graph.weights
+    costs = graph.succ_cost
+    b_level_array = np.asarray(b_level)
+    generations = graph.generations()
+
+    path, path_edges, length = [], [], 0
+    if graph.num_nodes:
+        entries = np.asarray(generations[0])
+        node = entries[b_level_array[entries].argmax()].item()
+        length = b_level[node]
+        while True:
+            path.append(node_ids[node])
+            start, end = graph.succ_ptr[node], graph.succ_ptr[node + 1]
+            if start == end:
+                break
+            successors = graph.succ_idx[start:end]
+            best = (b_level_array[successors] + costs[start:end]).argmax()
+            successor = successors[best].item()
+            path_edges.append({"source": node_ids[node], "target": node_ids[successor],
+                               "cost": costs[start + best].item()})
+            node = successor
+
+    ccr = 0.0
+    if graph.num_edges:
+        total_weight = weights.sum().item()
+        ccr = (costs.sum().item() / graph.num_edges) / (total_weight / graph.num_nodes) if total_weight else None
+
+    return {
+        "critical_path": {"length": length, "nodes": path, "edges": path_edges},
+        "slack": {node_id: lst[node] - t_level[node] for node, node_id in enumerate(node_ids)},
+        "ccr": ccr,
+        "width": max((len(generation) for generation in generations), default=0),
+        "levels": [len(generation) for generation in generations]
+    }
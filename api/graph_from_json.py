@@ -1,5 +1,8 @@
 # api/graph_from_json.py
-import networkx as nx
+import numpy as np
+
+from .compact_graph import CompactGraph, _numeric_array
+from .graph_from_npy import parse_arrays
 
 
 class GraphGivenJSON:
@@ -7,9 +10,64 @@ class GraphGivenJSON:
         self.json_data = json_data
 
     def parse_json(self):
+        # networkx is only imported by the code that still needs a DiGraph
+        import networkx as nx
+
+        if 'arrays' in self.json_data:
+            raise ValueError("This operation needs the graph as JSON nodes and edges.")
+
         G = nx.DiGraph()
         for node in self.json_data['nodes']:
             G.add_node(node['id'], weight=node['weight'])
         for edge in self.json_data['edges']:
             G.add_edge(edge['source'], edge['target'], cost=edge['cost'])
         return G
+
+    def parse_compact(self):
+        # A binary upload carries typed arrays instead of nodes and edges
+        if 'arrays' in self.json_data:
+            return parse_arrays(self.json_data['arrays'])
+        node_ids, weights, sources, targets, costs, index = self._columns()
+        return CompactGraph(node_ids, weights, sources, targets, costs, index=index)
+
+    def to_arrays(self):
+        # The graph as the arrays of a binary upload (see graph_from_npy), e.g.
+        # to keep it in the graph store. Node ids must all be integers or all strings.
+        node_ids, weights, sources, targets, costs, _ = self._columns()
+        if not (all(isinstance(node_id, str) for node_id in node_ids) or
+                all(isinstance(node_id, int) and not isinstance(node_id, bool) for node_id in node_ids)):
+            raise ValueError("Node ids must be all integers or all strings.")
+        ids = np.array(node_ids) if node_ids else np.zeros(0, dtype=np.int64)
+        if ids.dtype.kind not in 'iuU':
+            raise ValueError("Node ids must fit in 64 bits.")
+        return {
+            "weights": _numeric_array(weights, "Node weights"),
+            "sources": np.array(sources, dtype=np.int32),
+            "targets": np.array(targets, dtype=np.int32),
+            "costs": _numeric_array(costs, "Edge costs"),
+            "node_ids": ids
+        }
+
+    def _columns(self):
+        index = {}
+        node_ids = []
+        weights = []
+        for node in self.json_data['nodes']:
+            if node['id'] in index:
+                weights[index[node['id']]] = node['weight']
+            else:
+                index[node['id']] = len(node_ids)
+                node_ids.append(node['id'])
+                weights.append(node['weight'])
+
+        sources = []
+        targets = []
+        costs = []
+        for edge in self.json_data['edges']:
+            if edge['source'] not in index or edge['target'] not in index:
+                raise ValueError(f"Edge ({edge['source']}, {edge['target']}) references an unknown node.")
+            sources.append(index[edge['source']])
+            targets.append(index[edge['target']])
+            costs.append(edge['cost'])
+
+        return node_ids, weights, sources, targets, costs, index
@@ -0,0 +1,51 @@
+# api/graph_from_npy.py
+import io
+
+import numpy as np
+
+from .compact_graph import CompactGraph
+
+_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+
+def load_npy(buffer, name):
+    # 1-D array over the data of a .npy file held in buffer, without copying it.
+    # Object arrays are refused: loading them would unpickle client data.
+    stream = io.BytesIO(buffer)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version not in _HEADER_READERS:
+            raise ValueError(f"version {version[0]}.{version[1]} is not supported")
+        shape, fortran_order, dtype = _HEADER_READERS[version](stream)
+    except ValueError as e:
+        raise ValueError(f"{name} is not a valid .npy file: {e}")
+    if dtype.hasobject:
+        raise ValueError(f"{name} must not be an object array.")
+    if len(shape) != 1:
+        raise ValueError(f"{name} must be a 1-D array.")
+    try:
+        return np.frombuffer(buffer, dtype=dtype, count=shape[0], offset=stream.tell())
+    except ValueError:
+        raise ValueError(f"{name} is shorter than its header says.")
+
+
+def parse_arrays(arrays):
+    # CompactGraph straight from the arrays: int32 sources/targets and int64 or
+    # float64 weights/costs are used as they are, other dtypes are converted once
+    for name in ("sources", "targets"):
+        if arrays[name].dtype.kind not in 'iu':
+            raise ValueError(f"{name} must be an integer array.")
+    weights = arrays['weights']
+    node_ids = arrays.get('node_ids')
+    if node_ids is None:
+        node_ids = range(len(weights))
+    elif node_ids.dtype.kind not in 'iuU':
+        raise ValueError("node_ids must be an integer or string array.")
+    elif len(node_ids) != len(weights):
+        raise ValueError("node_ids needs one id per weight.")
+    else:
+        node_ids = node_ids.tolist()
+    return CompactGraph(node_ids, weights, arrays['sources'], arrays['targets'], arrays['costs'])
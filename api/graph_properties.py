@@ -1,52 +1,107 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from .priority_attributes_calculator import PriorityAttributesCalculator
+from pydantic import BaseModel, Field
+from .graph_store import GraphNotFound, graph_store, resolve_graph
+from .priority_attributes_calculator import MAX_PROCESSORS
+from .process_pool import PoolError, run_calculation
+from .result_cache import cached_call
+from .streaming import stream_calculation
+from .timed_route import EncodedJSONResponse, ORJSONResponse, TimedRoute
 from typing import Optional
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse, route_class=TimedRoute)
 
 
 class GraphData(BaseModel):
-    num_processors: Optional[int] = None
+    # Either the graph itself or the graph_id returned by POST /graph
+    num_processors: Optional[int] = Field(None, ge=1, le=MAX_PROCESSORS)
+    nodes: Optional[list] = None
+    edges: Optional[list] = None
+    graph_id: Optional[str] = None
+
+
+class GraphUpload(BaseModel):
     nodes: list
     edges: list
 
 
-@router.post("/properties", response_model=dict)
+@router.post("")
+def register_graph(graph_upload: GraphUpload):
+    # Keeps the graph on the server; later requests send {"graph_id": ...} instead of it
+    try:
+        key, arrays = graph_store.register(dict(graph_upload))
+        return {"graph_id": key, "num_nodes": len(arrays['weights']), "num_edges": len(arrays['sources'])}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/{graph_id}")
+def delete_graph(graph_id: str):
+    graph_store.delete(graph_id)
+    return {"graph_id": graph_id, "deleted": True}
+
+
+@router.post("/properties")
 def calculate_properties(graph_data: GraphData):
     try:
-        calculator = PriorityAttributesCalculator(graph_data.dict())
-        properties = calculator.obtain_attribute_dict()
-        return properties
+        properties = cached_call(resolve_graph(graph_data), "properties",
+                                 lambda json_data: run_calculation(json_data, "obtain_attribute_dict"))
+        return EncodedJSONResponse(properties)
+    except (PoolError, GraphNotFound):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/analytics")
+def calculate_analytics(graph_data: GraphData):
+    # Critical path nodes and edges, per-node slack, CCR, width and per-level node counts
+    try:
+        analytics = cached_call(resolve_graph(graph_data), "analytics",
+                                lambda json_data: run_calculation(json_data, "calculate_graph_analytics"))
+        return EncodedJSONResponse(analytics)
+    except (PoolError, GraphNotFound):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/properties/sl")
-async def calculate_sl_steps(graph_data: GraphData):
+def calculate_sl_steps(graph_data: GraphData, stream: bool = False):
     try:
-        calculator = PriorityAttributesCalculator(graph_data.dict())
-        sl_steps = calculator.calculate_sl_steps()
-        return sl_steps
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_sl_steps")
+        sl_steps = cached_call(resolve_graph(graph_data), "properties/sl",
+                               lambda json_data: run_calculation(json_data, "calculate_sl_steps"))
+        return EncodedJSONResponse(sl_steps)
+    except (PoolError, GraphNotFound):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/properties/lst")
-def calculate_properties(graph_data: GraphData):
+def calculate_properties(graph_data: GraphData, stream: bool = False):
     try:
-        calculator = PriorityAttributesCalculator(graph_data.dict())
-        properties = calculator.calculate_lst_steps()
-        return properties
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_lst_steps")
+        properties = cached_call(resolve_graph(graph_data), "properties/lst",
+                                 lambda json_data: run_calculation(json_data, "calculate_lst_steps"))
+        return EncodedJSONResponse(properties)
+    except (PoolError, GraphNotFound):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/properties/est")
-def calculate_properties(graph_data: GraphData):
+def calculate_properties(graph_data: GraphData, stream: bool = False):
     try:
-        calculator = PriorityAttributesCalculator(graph_data.dict())
-        properties = calculator.calculate_est_steps()
-        return properties
+        if stream:
+            return stream_calculation(resolve_graph(graph_data), "iter_est_steps")
+        properties = cached_call(resolve_graph(graph_data), "properties/est",
+                                 lambda json_data: run_calculation(json_data, "calculate_est_steps"))
+        return EncodedJSONResponse(properties)
+    except (PoolError, GraphNotFound):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
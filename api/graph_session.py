@@ -0,0 +1,266 @@
+# api/graph_session.py
+import heapq
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from .level_engine import LevelEngine
+from .metrics import phase, register_gauge
+from .mutable_graph import MutableGraph
+from .priority_attributes_calculator import PriorityAttributesCalculator
+from .schedule_memo import ScheduleMemo
+
+ATTRIBUTES = ("SL", "T-Level", "B-Level", "LST")
+SCHEDULERS = ("hlfet", "mcp", "etf", "dls", "heft", "cpop")
+# List schedulers whose previous schedule is replayed up to the first changed task
+REPLAYED = ("hlfet", "mcp")
+EDITS = ("add_node", "remove_node", "set_weight", "add_edge", "remove_edge", "set_cost")
+
+
+class SessionNotFound(Exception):
+    pass
+
+
+def _field(edit, name):
+    if name not in edit:
+        raise ValueError(f"'{edit.get('op')}' needs '{name}'.")
+    return edit[name]
+
+
+class GraphSession:
+    # A graph kept on the server and edited in place. Each edit recomputes SL,
+    # T-Level, B-Level and LST only for the nodes it can reach: forward from
+    # the edited node for T-Level, backward for the others (LST also from exit
+    # nodes whose T-Level changed), stopping wherever a value comes out the
+    # same. Everything else the calculator caches is dropped, and HLFET/MCP
+    # replay their previous schedule up to the first task the edit affects.
+    # Results are the ones the stateless endpoints give for to_json().
+    def __init__(self, json_data):
+        self.graph = MutableGraph(json_data)
+        self.calculator = PriorityAttributesCalculator(json_data, graph=self.graph)
+        self.lock = threading.Lock()
+        self.version = 0
+        self.memos = {}
+        self.results = {}
+        with phase("attributes"):
+            self._recompute()
+        self.calculator.invalidate(keep=self.values)
+
+    def _recompute(self):
+        levels = LevelEngine(self.graph)
+        t_level = levels.t_level()
+        self.values = {
+            "SL": levels.as_list("SL", levels.sl()),
+            "T-Level": levels.as_list("T-Level", t_level),
+            "B-Level": levels.as_list("B-Level", levels.b_level()),
+            "LST": levels.as_list("LST", levels.lst(t_level))
+        }
+        self.value_types = self.graph.value_types
+
+    def to_json(self):
+        return dict(self.graph.to_json(), num_processors=self.calculator.num_processors)
+
+    def apply(self, edits):
+        # Edits run in order; when one fails, the ones before it stay applied.
+        # Returns how many node values were recomputed per attribute.
+        recomputed = dict.fromkeys(ATTRIBUTES, 0)
+        try:
+            for number, edit in enumerate(edits):
+                try:
+                    for name, count in self._apply(edit).items():
+                        recomputed[name] += count
+                except ValueError as e:
+                    raise ValueError(f"Edit {number}: {e}")
+        finally:
+            self.version += 1
+            self.results = {}
+            self.calculator.invalidate(keep=self.values)
+        return recomputed
+
+    def _apply(self, edit):
+        if not isinstance(edit, dict) or edit.get('op') not in EDITS:
+            raise ValueError(f"Every edit needs an 'op', one of: {', '.join(EDITS)}.")
+        graph = self.graph
+        op = edit['op']
+        if op == "add_node":
+            node = graph.add_node(_field(edit, 'id'), _field(edit, 'weight'))
+            for values in self.values.values():
+                values.append(None)
+            return self._update(t_level=[node], sl=[node], b_level=[node], lst=[node])
+        if op == "remove_node":
+            node = graph.node(_field(edit, 'id'))
+            edges = ([(edit['id'], graph.node_ids[target]) for target in graph.successors(node)] +
+                     [(graph.node_ids[source], edit['id']) for source in graph.predecessors(node)])
+            counts = [self._apply({"op": "remove_edge", "source": source_id, "target": target_id})
+                      for source_id, target_id in edges]
+            graph.remove_node(edit['id'])
+            for values in self.values.values():
+                del values[node]
+            # node indices after it moved down
+            self.memos = {}
+            # nothing left to propagate, unless its weight was the last float
+            counts.append(self._update())
+            return {name: sum(count[name] for count in counts) for name in ATTRIBUTES}
+        if op == "set_weight":
+            node = graph.set_weight(_field(edit, 'id'), _field(edit, 'weight'))
+            self._touch(node)
+            return self._update(t_level=graph.successors(node), sl=[node], b_level=[node], lst=[node])
+
+        source_id, target_id = _field(edit, 'source'), _field(edit, 'target')
+        if op == "add_edge":
+            source, target = graph.add_edge(source_id, target_id, _field(edit, 'cost'))
+        elif op == "remove_edge":
+            source, target = graph.remove_edge(source_id, target_id)
+        else:
+            source, target = graph.set_cost(source_id, target_id, _field(edit, 'cost'))
+            self._touch(target)
+            return self._update(t_level=[target], b_level=[source], lst=[source])
+        self._touch(target)
+        return self._update(t_level=[target], sl=[source], b_level=[source], lst=[source])
+
+    def _touch(self, node):
+        for memo in self.memos.values():
+            memo.touch(node)
+
+    def _update(self, t_level=(), sl=(), b_level=(), lst=()):
+        # Recomputes the attributes from the given nodes on
+        if self.graph.value_types != self.value_types:
+            # Weights or costs turned into floats (or back): so do the start
+            # times and the type of every attribute value
+            self.memos = {}
+            with phase("attributes"):
+                self._recompute()
+            return dict.fromkeys(ATTRIBUTES, self.graph.num_nodes)
+
+        graph = self.graph
+        succ, pred, weights = graph.succ, graph.pred, graph.weight_values
+        # Values have the types of the stateless calculator (LevelEngine.as_list):
+        # sums of weights follow the weights, anything with a cost in it is a
+        # float once weights or costs are, entry nodes start from the int 0
+        as_weight = float if self.value_types[0] else int
+        as_value = float if any(self.value_types) else int
+        sl_values, t_values, b_values, lst_values = (self.values[name] for name in ATTRIBUTES)
+
+        def compute_t_level(node):
+            if not pred[node]:
+                return 0
+            return as_value(max(t_values[p] + weights[p] + cost for p, cost in pred[node].items()))
+
+        def compute_sl(node):
+            if not succ[node]:
+                return as_weight(weights[node])
+            return as_weight(max(sl_values[s] for s in succ[node]) + weights[node])
+
+        def compute_b_level(node):
+            if not succ[node]:
+                return as_weight(weights[node])
+            return as_value(weights[node] + max(b_values[s] + cost for s, cost in succ[node].items()))
+
+        def compute_lst(node):
+            # exit nodes start from their EST (t-level)
+            if not succ[node]:
+                return t_values[node]
+            return as_value(min(lst_values[s] - cost for s, cost in succ[node].items()) - weights[node])
+
+        with phase("attributes"):
+            recomputed = {}
+            changed, recomputed["T-Level"] = self._propagate(t_values, t_level, compute_t_level, succ, 1)
+            lst = list(lst) + [node for node in changed if not succ[node]]
+            recomputed["SL"] = self._propagate(sl_values, sl, compute_sl, pred, -1)[1]
+            recomputed["B-Level"] = self._propagate(b_values, b_level, compute_b_level, pred, -1)[1]
+            recomputed["LST"] = self._propagate(lst_values, lst, compute_lst, pred, -1)[1]
+        return recomputed
+
+    def _propagate(self, values, seeds, compute, dependents, direction):
+        # Recomputes values[node] for the seeds and, whenever a value changes,
+        # for its dependents. Nodes are taken in topological order (direction
+        # 1) or reverse (-1), so each one comes after every node it reads.
+        # Returns the changed nodes and how many nodes were recomputed.
+        position = self.graph.position
+        queued = set(seeds)
+        heap = [(direction * position[node], node) for node in queued]
+        heapq.heapify(heap)
+        changed = []
+        while heap:
+            _, node = heapq.heappop(heap)
+            value = compute(node)
+            # 0 and 0.0 differ in the response, e.g. when an entry node gets a predecessor
+            if value != values[node] or type(value) is not type(values[node]):
+                values[node] = value
+                changed.append(node)
+                for dependent in dependents[node]:
+                    if dependent not in queued:
+                        queued.add(dependent)
+                        heapq.heappush(heap, (direction * position[dependent], dependent))
+        return changed, len(queued)
+
+    def properties(self, attribute=None):
+        return self.calculator.obtain_attribute_dict(attribute)
+
+    def run(self, algorithm, detail="full", cursor=0, limit=None, insertion=False):
+        # Same result as /algorithm/<algorithm>-steps on to_json(), computed
+        # once per graph version
+        if algorithm not in SCHEDULERS:
+            raise ValueError(f"Invalid algorithm. Please provide one of: {', '.join(SCHEDULERS)}.")
+        key = (algorithm, detail, cursor, limit, insertion)
+        if key not in self.results:
+            self.results[key] = self._run(*key)
+        return self.results[key]
+
+    def _run(self, algorithm, detail, cursor, limit, insertion):
+        calculator = self.calculator
+        if algorithm in ("heft", "cpop"):
+            return getattr(calculator, f"calculate_{algorithm}_steps")(detail, cursor, limit)
+        if algorithm not in REPLAYED:
+            return getattr(calculator, f"calculate_{algorithm}_steps")(detail, cursor, limit, insertion)
+
+        # The memo needs every step, so the whole run is traced and then paged
+        page = calculator._trace(detail, cursor, limit)
+        trace = calculator._trace(detail, 0, None)
+        memo_key = (algorithm, detail, insertion)
+        memo = self.memos.setdefault(memo_key, ScheduleMemo())
+        try:
+            result = trace.collect(getattr(calculator, f"_{algorithm}_steps")(trace, insertion, memo))
+        except Exception:
+            del self.memos[memo_key]
+            raise
+        return result if detail == "schedule" else page.page(result[page.cursor:page.stop])
+
+
+class SessionStore:
+    # Open sessions by id. The least recently used one is closed once there
+    # are more than max_sessions.
+    def __init__(self, max_sessions):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, json_data):
+        session = GraphSession(json_data)
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id, session
+
+    def get(self, session_id):
+        with self._lock:
+            if session_id not in self._sessions:
+                raise SessionNotFound(f"Session {session_id} does not exist or was closed.")
+            self._sessions.move_to_end(session_id)
+            return self._sessions[session_id]
+
+    def close(self, session_id):
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                raise SessionNotFound(f"Session {session_id} does not exist or was closed.")
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+sessions = SessionStore(int(os.environ.get("MAX_SESSIONS", 64)))
+
+register_gauge("graph_sessions", "Open graph editing sessions.", lambda: len(sessions))
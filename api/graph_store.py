@@ -0,0 +1,157 @@
+# api/graph_store.py
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .graph_from_json import GraphGivenJSON
+from .graph_from_npy import parse_arrays
+from .metrics import register_gauge
+
+# Graphs uploaded once to POST /graph and then referred to by graph_id. They
+# are kept as the arrays of a binary upload, so a request by id skips JSON
+# decoding and row parsing. The least recently used graphs leave memory once
+# MAX_BYTES or MAX_GRAPHS is exceeded; with GRAPH_SPILL_DIR set they are
+# written there as .npy files and memory-mapped when used again, up to
+# SPILL_MAX_BYTES on disk.
+MAX_BYTES = int(os.environ.get("GRAPH_STORE_MAX_BYTES", 256 * 2 ** 20))
+MAX_GRAPHS = int(os.environ.get("GRAPH_STORE_MAX_GRAPHS", 1024))
+SPILL_DIR = os.environ.get("GRAPH_SPILL_DIR")
+SPILL_MAX_BYTES = int(os.environ.get("GRAPH_SPILL_MAX_BYTES", 2 ** 30))
+
+ARRAY_NAMES = ("weights", "sources", "targets", "costs", "node_ids")
+
+
+class GraphNotFound(Exception):
+    status_code = 404
+
+
+def graph_id(arrays):
+    # Content hash: equal graphs get the same id however their JSON was written
+    digest = hashlib.sha256()
+    for name in ARRAY_NAMES:
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{array.dtype.str}:{len(array)};".encode())
+        digest.update(array)
+    return digest.hexdigest()
+
+
+def _size(arrays):
+    return sum(array.nbytes for array in arrays.values())
+
+
+class GraphStore:
+    def __init__(self, max_bytes, max_graphs, spill_dir=None, spill_max_bytes=0):
+        self.max_bytes = max_bytes
+        self.max_graphs = max_graphs
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+        self.bytes = 0
+        self.spilled_bytes = 0
+        self._graphs = OrderedDict()  # id -> arrays, least recently used first
+        self._spilled = OrderedDict()  # id -> bytes on disk
+        self._lock = threading.Lock()
+        if spill_dir is not None:
+            # A directory of this process's own, removed when it exits
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix="graphs-", dir=spill_dir)
+            atexit.register(shutil.rmtree, self.spill_dir, ignore_errors=True)
+
+    def register(self, json_data):
+        # Parses and checks the graph once (unknown nodes, cycles); returns (id, arrays)
+        arrays = GraphGivenJSON(json_data).to_arrays()
+        parse_arrays(arrays).generations()
+        key = graph_id(arrays)
+        with self._lock:
+            if key in self._graphs:
+                self._graphs.move_to_end(key)
+                return key, self._graphs[key]
+            self._graphs[key] = arrays
+            self.bytes += _size(arrays)
+            self._evict()
+        return key, arrays
+
+    def get(self, key):
+        with self._lock:
+            if key in self._graphs:
+                self._graphs.move_to_end(key)
+                return self._graphs[key]
+            if key in self._spilled:
+                self._spilled.move_to_end(key)
+                return {name: np.load(self._path(key, name), mmap_mode='r') for name in ARRAY_NAMES}
+        raise GraphNotFound(f"Graph {key} is not registered. Upload it again to POST /graph.")
+
+    def delete(self, key):
+        with self._lock:
+            found = False
+            if key in self._graphs:
+                self.bytes -= _size(self._graphs.pop(key))
+                found = True
+            if key in self._spilled:
+                self._drop_spilled(key)
+                found = True
+        if not found:
+            raise GraphNotFound(f"Graph {key} is not registered.")
+
+    def _path(self, key, name):
+        return os.path.join(self.spill_dir, key, f"{name}.npy")
+
+    def _evict(self):
+        while self._graphs and (self.bytes > self.max_bytes or len(self._graphs) > self.max_graphs):
+            key, arrays = self._graphs.popitem(last=False)
+            size = _size(arrays)
+            self.bytes -= size
+            if self.spill_dir is not None and size <= self.spill_max_bytes and key not in self._spilled:
+                os.makedirs(os.path.join(self.spill_dir, key), exist_ok=True)
+                for name in ARRAY_NAMES:
+                    np.save(self._path(key, name), arrays[name])
+                self._spilled[key] = size
+                self.spilled_bytes += size
+        while self.spilled_bytes > self.spill_max_bytes:
+            self._drop_spilled(next(iter(self._spilled)))
+
+    def _drop_spilled(self, key):
+        # Arrays still mapped by a running request stay readable after the unlink
+        self.spilled_bytes -= self._spilled.pop(key)
+        shutil.rmtree(os.path.join(self.spill_dir, key), ignore_errors=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "graphs": len(self._graphs),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "spilled_graphs": len(self._spilled),
+                "spilled_bytes": self.spilled_bytes
+            }
+
+
+graph_store = GraphStore(MAX_BYTES, MAX_GRAPHS, SPILL_DIR, SPILL_MAX_BYTES)
+
+
+def resolve_graph(graph_data):
+    # Request model -> json_data for the calculator: the body as sent, or the
+    # stored arrays of its graph_id (with the request's processor settings)
+    json_data = dict(graph_data)
+    key = json_data.pop('graph_id', None)
+    if key is None:
+        if json_data.get('nodes') is None or json_data.get('edges') is None:
+            raise ValueError("Send the graph's nodes and edges, or the graph_id of a graph uploaded to POST /graph.")
+        return json_data
+    if json_data.get('nodes') is not None or json_data.get('edges') is not None:
+        raise ValueError("Send either graph_id or nodes and edges, not both.")
+    json_data.pop('nodes', None)
+    json_data.pop('edges', None)
+    return dict(json_data, arrays=graph_store.get(key), graph_id=key)
+
+
+register_gauge("graph_store_graphs", "Graphs held in memory by the graph store.", lambda: len(graph_store._graphs))
+register_gauge("graph_store_bytes", "Bytes of the graphs held in memory by the graph store.",
+               lambda: graph_store.bytes)
+register_gauge("graph_store_spilled_bytes", "Bytes of the graphs spilled to memory-mapped files.",
+               lambda: graph_store.spilled_bytes)
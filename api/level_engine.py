@@ -0,0 +1,114 @@
+# api/level_engine.py
+import numpy as np
+
+
+class LevelEngine:
+    # Level-synchronous computation of SL, T-Level, B-Level and LST.
+    #
+    # Nodes are renumbered by position in the topological order, so every
+    # topological generation is a contiguous block and so are its in-edges and
+    # out-edges in the re-sorted CSR arrays. Each attribute is then computed
+    # one whole generation at a time with a segmented max/min (ufunc.reduceat)
+    # over those edge blocks: forward passes read the finished generations
+    # above, backward passes the ones below.
+    def __init__(self, graph):
+        self.graph = graph
+        num_nodes = graph.num_nodes
+        self.order = np.asarray(graph.topological_order(), dtype=np.int64)
+        self.bounds = np.cumsum([0] + [len(generation) for generation in graph.generations()])
+        position = np.empty(num_nodes, dtype=np.int64)
+        position[self.order] = np.arange(num_nodes)
+
+        in_degree = np.diff(graph.pred_ptr)
+        targets = np.repeat(np.arange(num_nodes), in_degree)
+        by_target = np.argsort(position[targets], kind='stable')
+        self.in_ptr = np.r_[0, np.cumsum(in_degree[self.order])]
+        self.in_src = graph.pred_idx[by_target]
+        self.in_cost = graph.pred_cost[by_target]
+
+        out_degree = np.diff(graph.succ_ptr)
+        sources = np.repeat(np.arange(num_nodes), out_degree)
+        by_source = np.argsort(position[sources], kind='stable')
+        self.out_ptr = np.r_[0, np.cumsum(out_degree[self.order])]
+        self.out_dst = graph.succ_idx[by_source]
+        self.out_cost = graph.succ_cost[by_source]
+
+        self.dtype = np.result_type(graph.weights, graph.pred_cost)
+
+    def _levels(self):
+        return zip(self.bounds[:-1], self.bounds[1:])
+
+    def _backward(self, leaf_values, edge_values, reduce, finish, dtype=None):
+        # values[v] = finish(v, reduce(edge_values(out-edges of v))) or leaf_values[v] for exit nodes
+        leaf_values = np.asarray(leaf_values)
+        values = np.array(leaf_values, dtype=np.result_type(leaf_values, self.dtype if dtype is None else dtype))
+        for lo, hi in reversed(list(self._levels())):
+            start, end = self.out_ptr[lo], self.out_ptr[hi]
+            if start == end:
+                continue
+            nodes = self.order[lo:hi]
+            offsets = self.out_ptr[lo:hi] - start
+            has_successors = self.out_ptr[lo + 1:hi + 1] > self.out_ptr[lo:hi]
+            segment = edge_values(values, self.out_dst[start:end], self.out_cost[start:end])
+            nodes = nodes[has_successors]
+            values[nodes] = finish(nodes, reduce.reduceat(segment, offsets[has_successors]))
+        return values
+
+    def _weights(self, weights):
+        # Node weights, or per-node overrides (e.g. mean costs over heterogeneous processors)
+        return self.graph.weights if weights is None else np.asarray(weights)
+
+    def t_level(self, weights=None):
+        weights = self._weights(weights)
+        t_level = np.zeros(self.graph.num_nodes, dtype=np.result_type(weights, self.dtype))
+        for lo, hi in list(self._levels())[1:]:
+            # every node below the first generation has at least one predecessor
+            start, end = self.in_ptr[lo], self.in_ptr[hi]
+            sources = self.in_src[start:end]
+            segment = t_level[sources] + weights[sources] + self.in_cost[start:end]
+            t_level[self.order[lo:hi]] = np.maximum.reduceat(segment, self.in_ptr[lo:hi] - start)
+        return t_level
+
+    def sl(self):
+        weights = self.graph.weights
+        return self._backward(weights,
+                              lambda sl, successors, costs: sl[successors],
+                              np.maximum,
+                              lambda nodes, max_successor_sl: max_successor_sl + weights[nodes],
+                              weights.dtype)
+
+    def b_level(self, weights=None):
+        weights = self._weights(weights)
+        return self._backward(weights,
+                              lambda b_level, successors, costs: b_level[successors] + costs,
+                              np.maximum,
+                              lambda nodes, max_successor: weights[nodes] + max_successor)
+
+    def lst(self, t_level=None):
+        weights = self.graph.weights
+        # exit nodes start from their EST (t-level)
+        return self._backward(self.t_level() if t_level is None else t_level,
+                              lambda lst, successors, costs: lst[successors] - costs,
+                              np.minimum,
+                              lambda nodes, min_successor_lst: min_successor_lst - weights[nodes])
+
+    def as_list(self, attribute, values):
+        # values.tolist() with the types the pure-Python loops give. With float
+        # weights or costs those are floats, except values that never add a
+        # float: entry nodes keep the T-Level 0 they start from (and isolated
+        # nodes the LST taken from it), and with only float costs SL and the
+        # B-Level of exit nodes are sums of integer weights.
+        listed = values.tolist()
+        if values.dtype.kind != 'f':
+            return listed
+        if attribute == "T-Level":
+            for node in self.order[:self.bounds[1]].tolist():
+                listed[node] = 0
+        elif attribute == "LST":
+            isolated = (np.diff(self.graph.pred_ptr) == 0) & (np.diff(self.graph.succ_ptr) == 0)
+            for node in np.flatnonzero(isolated).tolist():
+                listed[node] = 0
+        elif attribute == "B-Level" and self.graph.weights.dtype.kind != 'f':
+            for node in np.flatnonzero(np.diff(self.graph.succ_ptr) == 0).tolist():
+                listed[node] = int(listed[node])
+        return listed
@@ -0,0 +1,256 @@
+# api/metrics.py
+import bisect
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from .result_cache import result_cache
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Slow-request profiling: off unless PROFILE_THRESHOLD (seconds) is set. A
+# PROFILE_SAMPLE_RATE share of the requests runs under cProfile, one at a
+# time, and the profiles of those slower than the threshold are kept.
+PROFILE_THRESHOLD = float(os.environ["PROFILE_THRESHOLD"]) if os.environ.get("PROFILE_THRESHOLD") else None
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 1.0))
+PROFILE_DIR = os.environ.get("PROFILE_DIR")
+slow_profiles = deque(maxlen=int(os.environ.get("PROFILE_KEEP", 20)))
+_profile_lock = threading.Lock()
+
+
+class _Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.buckets), 0, 0.0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += 1
+        series[2] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, count, total) in sorted(self.series.items()):
+            label_text = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+        return lines
+
+
+class _Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series = {}
+
+    def inc(self, labels, amount=1):
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.series.items()):
+            label_text = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, labels))
+            lines.append(f"{self.name}{{{label_text}}} {value}")
+        return lines
+
+
+_lock = threading.Lock()
+_requests = _Counter("requests_total", "Requests by endpoint and status code.", ("endpoint", "status"))
+_request_duration = _Histogram("request_duration_seconds", "Time to answer a request, body decoding included.",
+                               ("endpoint",), DURATION_BUCKETS)
+_phase_duration = _Histogram("phase_duration_seconds", "Time spent in each phase of a request, nested phases excluded.",
+                             ("endpoint", "phase"), DURATION_BUCKETS)
+_graph_nodes = _Histogram("graph_nodes", "Nodes of the graphs parsed by the endpoints.", ("endpoint",), SIZE_BUCKETS)
+_graph_edges = _Histogram("graph_edges", "Edges of the graphs parsed by the endpoints.", ("endpoint",), SIZE_BUCKETS)
+_profiles = _Counter("slow_request_profiles_total", "Profiled requests slower than PROFILE_THRESHOLD.", ("endpoint",))
+_pool_events = _Counter("process_pool_events_total",
+                        "Requests the process pool rejected (rejected), gave up on (timeout) or lost a worker in (broken).",
+                        ("event",))
+# name -> (help text, callable returning the current value)
+_gauges = {}
+
+
+class _RequestRecord:
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.phases = {}
+        self.nested = []
+        self.graphs = []
+        self.status = 500
+        self.start = self.mark = time.perf_counter()
+
+
+# Record of the request being handled; unset outside requests (benchmarks, pool workers)
+_current = contextvars.ContextVar("request_record", default=None)
+
+
+@contextmanager
+def phase(name):
+    # Adds the time spent inside the block to the request's phase, minus the
+    # time of any phase nested in it, so that the phases add up to the request
+    record = _current.get()
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    record.nested.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = record.nested.pop()
+        if record.nested:
+            record.nested[-1] += elapsed
+        record.phases[name] = record.phases.get(name, 0.0) + elapsed - nested
+
+
+def observe_graph(num_nodes, num_edges):
+    record = _current.get()
+    if record is not None:
+        record.graphs.append((num_nodes, num_edges))
+
+
+@contextmanager
+def worker_phases():
+    # Collects phases in a pool worker, to be sent back with the result and
+    # merged into the request with merge_phases
+    record = _RequestRecord(None)
+    token = _current.set(record)
+    try:
+        yield record
+    finally:
+        _current.reset(token)
+
+
+def merge_phases(phases, graphs):
+    # Called inside the phase that waited for the worker, which then only keeps the waiting time
+    record = _current.get()
+    if record is None:
+        return
+    for name, seconds in phases.items():
+        record.phases[name] = record.phases.get(name, 0.0) + seconds
+    if record.nested:
+        record.nested[-1] += sum(phases.values())
+    record.graphs.extend(graphs)
+
+
+def count_pool_event(event):
+    with _lock:
+        _pool_events.inc((event,))
+
+
+def register_gauge(name, help_text, value):
+    _gauges[name] = (help_text, value)
+
+
+def start_profiler():
+    # Profiler for a sampled request, or None
+    if PROFILE_THRESHOLD is None or random.random() >= PROFILE_SAMPLE_RATE:
+        return None
+    # A single profiler can be active at a time
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profiler(profiler, endpoint, seconds):
+    # Keeps the profile when the request was slower than the threshold
+    profiler.disable()
+    _profile_lock.release()
+    if seconds < PROFILE_THRESHOLD:
+        return
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(40)
+    profile = {"endpoint": endpoint, "seconds": seconds, "time": time.time(), "stats": stream.getvalue()}
+    if PROFILE_DIR:
+        profile["file"] = os.path.join(PROFILE_DIR, f"{endpoint.strip('/').replace('/', '_')}-{time.time_ns()}.prof")
+        profiler.dump_stats(profile["file"])
+    with _lock:
+        _profiles.inc((endpoint,))
+    slow_profiles.append(profile)
+
+
+@contextmanager
+def timed_request(endpoint):
+    # Collects the phases of one request; the caller sets record.status
+    record = _RequestRecord(endpoint)
+    token = _current.set(record)
+    try:
+        yield record
+    finally:
+        _current.reset(token)
+        _observe_request(record)
+
+
+def endpoint_entered():
+    # Time between decoding the body and entering the endpoint: validation, dependencies
+    record = _current.get()
+    if record is not None:
+        record.phases["validate"] = time.perf_counter() - record.mark
+
+
+def body_decoded():
+    record = _current.get()
+    if record is not None:
+        record.mark = time.perf_counter()
+
+
+def _observe_request(record):
+    # Whatever no phase covers (error handling, FastAPI's own work) is "other"
+    seconds = time.perf_counter() - record.start
+    record.phases["other"] = max(0.0, seconds - sum(record.phases.values()))
+    with _lock:
+        _requests.inc((record.endpoint, str(record.status)))
+        _request_duration.observe((record.endpoint,), seconds)
+        for name, seconds in record.phases.items():
+            _phase_duration.observe((record.endpoint, name), seconds)
+        for num_nodes, num_edges in record.graphs:
+            _graph_nodes.observe((record.endpoint,), num_nodes)
+            _graph_edges.observe((record.endpoint,), num_edges)
+
+
+def render():
+    # Prometheus text exposition format
+    with _lock:
+        lines = []
+        for metric in (_requests, _request_duration, _phase_duration, _graph_nodes, _graph_edges, _profiles,
+                       _pool_events):
+            lines.extend(metric.render())
+    for name, (help_text, value) in _gauges.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value()}"]
+    cache = result_cache.stats()
+    for name, kind, help_text, value in (
+            ("result_cache_hits_total", "counter", "Result cache lookups answered from the cache.", cache["hits"]),
+            ("result_cache_misses_total", "counter", "Result cache lookups that computed the result.",
+             cache["misses"]),
+            ("result_cache_deduplicated_total", "counter",
+             "Result cache lookups that waited for the same computation in flight.", cache["deduplicated"]),
+            ("result_cache_entries", "gauge", "Results held by the cache.", cache["entries"]),
+            ("result_cache_bytes", "gauge", "Bytes of the results held by the cache.", cache["bytes"]),
+            ("result_cache_hit_ratio", "gauge", "Share of lookups that did not compute.", cache["hit_rate"])):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,284 @@
+# api/mutable_graph.py
+import numpy as np
+
+from .compact_graph import _numeric_array, _pointers
+
+
+def _check_number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number.")
+
+
+class MutableGraph:
+    # CompactGraph interface over per-node edge dicts, for session graphs that
+    # are edited one node or edge at a time.
+    #
+    # Successors and predecessors keep insertion order, which is the order
+    # CompactGraph gives the same edges sent as JSON with new edges at the end,
+    # so the schedulers break ties the same way. Weights and costs are kept as
+    # sent and converted like CompactGraph converts them (the weights, or the
+    # costs, all become floats once one of them is a float). position is a topological order that edge
+    # insertions repair locally (Pearce-Kelly); generations() is recomputed
+    # only when a scheduler asks for it after the structure changed.
+    def __init__(self, json_data):
+        # Parsed like GraphGivenJSON.parse_compact: a repeated node keeps its
+        # first position and last weight, a repeated edge its first position
+        # and last cost
+        self.index = {}
+        self.node_ids = []
+        self.weight_values = []
+        for node in json_data['nodes']:
+            if node['id'] in self.index:
+                self.weight_values[self.index[node['id']]] = node['weight']
+            else:
+                self.index[node['id']] = len(self.node_ids)
+                self.node_ids.append(node['id'])
+                self.weight_values.append(node['weight'])
+        self.num_nodes = len(self.node_ids)
+        _numeric_array(self.weight_values, "Node weights")
+
+        # (source, target) -> cost in input order, and the same edges by node
+        self.edges = {}
+        for edge in json_data['edges']:
+            if edge['source'] not in self.index or edge['target'] not in self.index:
+                raise ValueError(f"Edge ({edge['source']}, {edge['target']}) references an unknown node.")
+            self.edges[self.index[edge['source']], self.index[edge['target']]] = edge['cost']
+        _numeric_array(list(self.edges.values()), "Edge costs")
+        self.num_edges = len(self.edges)
+        self.succ = [{} for _ in range(self.num_nodes)]
+        self.pred = [{} for _ in range(self.num_nodes)]
+        for (source, target), cost in self.edges.items():
+            self.succ[source][target] = cost
+            self.pred[target][source] = cost
+
+        self._float_weights = sum(isinstance(weight, float) for weight in self.weight_values)
+        self._float_costs = sum(isinstance(cost, float) for cost in self.edges.values())
+        self._weights_changed()
+        self._structure_changed()
+        order = self.topological_order()
+        if len(order) != self.num_nodes:
+            raise ValueError("Graph contains a cycle or graph changed during iteration")
+        self.position = [0] * self.num_nodes
+        for position, node in enumerate(order):
+            self.position[node] = position
+        self._next_position = self.num_nodes
+
+    def _structure_changed(self):
+        self._generations = None
+        self._topological_order = None
+        self._reverse_topological_order = None
+        self._costs_changed()
+
+    def _costs_changed(self):
+        self._csr = None
+
+    def _weights_changed(self):
+        self._weights = None
+
+    @property
+    def value_types(self):
+        # Whether the weights and the costs are floats; attribute values are
+        # floats once either is
+        return self._float_weights > 0, self._float_costs > 0
+
+    @property
+    def weights(self):
+        if self._weights is None:
+            self._weights = _numeric_array(self.weight_values, "Node weights")
+        return self._weights
+
+    def weight_list(self):
+        return self.weights.tolist()
+
+    def in_degrees(self):
+        return [len(edges) for edges in self.pred]
+
+    def out_degrees(self):
+        return [len(edges) for edges in self.succ]
+
+    def successors(self, node):
+        return list(self.succ[node])
+
+    def predecessors(self, node):
+        return list(self.pred[node])
+
+    def _costs(self, edges):
+        if self._float_costs:
+            return [float(cost) for cost in edges.values()]
+        return list(edges.values())
+
+    def out_edges(self, node):
+        return list(self.succ[node]), self._costs(self.succ[node])
+
+    def in_edges(self, node):
+        return list(self.pred[node]), self._costs(self.pred[node])
+
+    def _build_csr(self):
+        # CSR arrays for the LevelEngine, in the same per-node order as CompactGraph
+        def csr(adjacency):
+            keys = np.repeat(np.arange(self.num_nodes), [len(edges) for edges in adjacency])
+            indices = np.array([other for edges in adjacency for other in edges], dtype=np.int32)
+            costs = _numeric_array([cost for edges in adjacency for cost in edges.values()], "Edge costs")
+            return _pointers(keys, self.num_nodes), indices, costs
+
+        self._csr = csr(self.succ) + csr(self.pred)
+
+    def _array(self, position):
+        if self._csr is None:
+            self._build_csr()
+        return self._csr[position]
+
+    succ_ptr = property(lambda self: self._array(0))
+    succ_idx = property(lambda self: self._array(1))
+    succ_cost = property(lambda self: self._array(2))
+    pred_ptr = property(lambda self: self._array(3))
+    pred_idx = property(lambda self: self._array(4))
+    pred_cost = property(lambda self: self._array(5))
+
+    def generations(self):
+        # Kahn's algorithm level by level, as in CompactGraph.generations
+        if self._generations is None:
+            in_degree = self.in_degrees()
+            generations = []
+            current = [node for node in range(self.num_nodes) if in_degree[node] == 0]
+            while current:
+                generations.append(current)
+                following = []
+                for node in current:
+                    for successor in self.succ[node]:
+                        in_degree[successor] -= 1
+                        if in_degree[successor] == 0:
+                            following.append(successor)
+                current = following
+            self._generations = generations
+        return self._generations
+
+    def topological_order(self):
+        if self._topological_order is None:
+            self._topological_order = [node for generation in self.generations() for node in generation]
+        return self._topological_order
+
+    def reverse_topological_order(self):
+        if self._reverse_topological_order is None:
+            self._reverse_topological_order = self.topological_order()[::-1]
+        return self._reverse_topological_order
+
+    def node(self, node_id):
+        if node_id not in self.index:
+            raise ValueError(f"Node {node_id} does not exist.")
+        return self.index[node_id]
+
+    def edge(self, source_id, target_id):
+        source, target = self.node(source_id), self.node(target_id)
+        if target not in self.succ[source]:
+            raise ValueError(f"Edge ({source_id}, {target_id}) does not exist.")
+        return source, target
+
+    def add_node(self, node_id, weight):
+        _check_number(weight, "Node weight")
+        if node_id in self.index:
+            raise ValueError(f"Node {node_id} already exists.")
+        node = self.num_nodes
+        self.index[node_id] = node
+        self.node_ids.append(node_id)
+        self.weight_values.append(weight)
+        self._float_weights += isinstance(weight, float)
+        self.succ.append({})
+        self.pred.append({})
+        self.position.append(self._next_position)
+        self._next_position += 1
+        self.num_nodes += 1
+        self._weights_changed()
+        self._structure_changed()
+        return node
+
+    def remove_node(self, node_id):
+        # Only isolated nodes; the nodes after it move down by one index
+        node = self.node(node_id)
+        if self.succ[node] or self.pred[node]:
+            raise ValueError(f"Node {node_id} still has edges.")
+        del self.node_ids[node]
+        self._float_weights -= isinstance(self.weight_values.pop(node), float)
+        del self.succ[node], self.pred[node], self.position[node]
+        self.num_nodes -= 1
+        renumber = lambda other: other - (other > node)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.succ = [{renumber(other): cost for other, cost in edges.items()} for edges in self.succ]
+        self.pred = [{renumber(other): cost for other, cost in edges.items()} for edges in self.pred]
+        self.edges = {(renumber(source), renumber(target)): cost for (source, target), cost in self.edges.items()}
+        self._weights_changed()
+        self._structure_changed()
+        return node
+
+    def set_weight(self, node_id, weight):
+        _check_number(weight, "Node weight")
+        node = self.node(node_id)
+        self._float_weights += isinstance(weight, float) - isinstance(self.weight_values[node], float)
+        self.weight_values[node] = weight
+        self._weights_changed()
+        return node
+
+    def add_edge(self, source_id, target_id, cost):
+        _check_number(cost, "Edge cost")
+        source, target = self.node(source_id), self.node(target_id)
+        if target in self.succ[source]:
+            raise ValueError(f"Edge ({source_id}, {target_id}) already exists.")
+        if self.position[source] > self.position[target] or source == target:
+            self._reorder(source, target, source_id, target_id)
+        self.edges[source, target] = cost
+        self.succ[source][target] = cost
+        self.pred[target][source] = cost
+        self._float_costs += isinstance(cost, float)
+        self.num_edges += 1
+        self._structure_changed()
+        return source, target
+
+    def remove_edge(self, source_id, target_id):
+        source, target = self.edge(source_id, target_id)
+        self._float_costs -= isinstance(self.edges.pop((source, target)), float)
+        del self.succ[source][target], self.pred[target][source]
+        self.num_edges -= 1
+        self._structure_changed()
+        return source, target
+
+    def set_cost(self, source_id, target_id, cost):
+        _check_number(cost, "Edge cost")
+        source, target = self.edge(source_id, target_id)
+        self._float_costs += isinstance(cost, float) - isinstance(self.edges[source, target], float)
+        self.edges[source, target] = cost
+        self.succ[source][target] = cost
+        self.pred[target][source] = cost
+        self._costs_changed()
+        return source, target
+
+    def _reorder(self, source, target, source_id, target_id):
+        # source -> target goes against the current order: find the nodes
+        # between them that must swap sides (or the cycle the edge would close)
+        # and give them the same positions in a valid order.
+        lower, upper = self.position[target], self.position[source]
+        forward = self._reach(target, self.succ, lambda position: position <= upper)
+        if source in forward:
+            raise ValueError(f"Edge ({source_id}, {target_id}) would create a cycle.")
+        backward = self._reach(source, self.pred, lambda position: position >= lower)
+        nodes = (sorted(backward, key=self.position.__getitem__) +
+                 sorted(forward, key=self.position.__getitem__))
+        positions = sorted(self.position[node] for node in nodes)
+        for node, position in zip(nodes, positions):
+            self.position[node] = position
+
+    def _reach(self, start, adjacency, in_range):
+        reached = {start}
+        stack = [start]
+        while stack:
+            for other in adjacency[stack.pop()]:
+                if other not in reached and in_range(self.position[other]):
+                    reached.add(other)
+                    stack.append(other)
+        return reached
+
+    def to_json(self):
+        return {
+            "nodes": [{"id": node_id, "weight": weight} for node_id, weight in zip(self.node_ids, self.weight_values)],
+            "edges": [{"source": self.node_ids[source], "target": self.node_ids[target], "cost": cost}
+                      for (source, target), cost in self.edges.items()]
+        }
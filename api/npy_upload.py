@@ -0,0 +1,68 @@
+# api/npy_upload.py
+from typing import Literal, Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from api.graph_from_npy import load_npy
+from api.priority_attributes_calculator import MAX_PROCESSORS
+from api.process_pool import PoolError, run_calculation
+from api.result_cache import cached_call
+from api.timed_route import EncodedJSONResponse, ORJSONResponse, TimedRoute
+
+router = APIRouter(default_response_class=ORJSONResponse, route_class=TimedRoute)
+
+# The graph as multipart/form-data of .npy files instead of JSON lists, for
+# graphs too large to send and parse row by row: weights[V], sources[E],
+# targets[E] (int32), costs[E] and optionally node_ids[V] (integers or strings;
+# 0..V-1 otherwise), plus a num_processors form field. Each array is a view on
+# the uploaded bytes and goes into the graph without per-row parsing.
+#
+#   np.save(buffer, sources.astype(np.int32))
+#   curl -F num_processors=4 -F weights=@weights.npy -F sources=@sources.npy \
+#        -F targets=@targets.npy -F costs=@costs.npy "/npy/hlfet-steps?detail=schedule"
+DetailLevel = Literal["schedule", "steps", "full"]
+
+SCHEDULERS = ("hlfet", "mcp", "etf", "dls", "heft", "cpop")
+
+
+def _graph_data(num_processors, **uploads):
+    arrays = {name: load_npy(upload.file.read(), name)
+              for name, upload in uploads.items() if upload is not None}
+    return {"num_processors": num_processors, "arrays": arrays}
+
+
+@router.post("/properties")
+def npy_properties(weights: UploadFile = File(...), sources: UploadFile = File(...),
+                   targets: UploadFile = File(...), costs: UploadFile = File(...),
+                   node_ids: Optional[UploadFile] = File(None), num_processors: Optional[int] = Form(None, ge=1, le=MAX_PROCESSORS)):
+    try:
+        graph_data = _graph_data(num_processors, weights=weights, sources=sources, targets=targets,
+                                 costs=costs, node_ids=node_ids)
+        properties = cached_call(graph_data, "properties",
+                                 lambda json_data: run_calculation(json_data, "obtain_attribute_dict"))
+        return EncodedJSONResponse(properties)
+    except PoolError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{algorithm}-steps")
+def npy_steps(algorithm: str, weights: UploadFile = File(...), sources: UploadFile = File(...),
+              targets: UploadFile = File(...), costs: UploadFile = File(...),
+              node_ids: Optional[UploadFile] = File(None), num_processors: int = Form(..., ge=1, le=MAX_PROCESSORS),
+              detail: DetailLevel = "full", cursor: int = 0, limit: Optional[int] = None, insertion: bool = False):
+    try:
+        if algorithm not in SCHEDULERS:
+            raise ValueError(f"Invalid algorithm. Please provide one of: {', '.join(SCHEDULERS)}.")
+        graph_data = _graph_data(num_processors, weights=weights, sources=sources, targets=targets,
+                                 costs=costs, node_ids=node_ids)
+        # HEFT and CPOP always insert
+        args = (detail, cursor, limit) if algorithm in ("heft", "cpop") else (detail, cursor, limit, insertion)
+        steps = cached_call(graph_data,
+                            f"{algorithm}-steps?detail={detail}&cursor={cursor}&limit={limit}&insertion={insertion}",
+                            lambda json_data: run_calculation(json_data, f"calculate_{algorithm}_steps", *args))
+        return EncodedJSONResponse(steps)
+    except PoolError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,48 @@
+# api/placement_kernel.py
+import os
+
+import numpy as np
+
+# Fewer processors than this are faster as the plain Python loops
+MIN_PROCESSORS = int(os.environ.get("PLACEMENT_KERNEL_MIN_PROCESSORS", 32))
+
+
+class PlacementKernel:
+    # Candidate evaluation of the list schedulers over all processors at once.
+    #
+    # available mirrors the schedulers' processor -> available time dict as an
+    # array (index processor - 1). A task's data-ready time on every processor
+    # is one broadcast over its placed predecessors: end time on the
+    # predecessor's own processor, end time + edge cost on the others. The
+    # earliest start is then argmin over max(available, data-ready), which
+    # returns the first processor on ties like the scan it replaces.
+    #
+    # Only for graphs with integer weights and costs: there Python's and
+    # NumPy's arithmetic agree on every value and type. With floats the Python
+    # loops keep ints (the 0 of an idle processor) that NumPy would turn into
+    # floats, and responses would change.
+    def __init__(self, num_processors):
+        self.processors = np.arange(1, num_processors + 1)
+        self.available = np.zeros(num_processors, dtype=np.int64)
+
+    @staticmethod
+    def applies(graph, num_processors):
+        return (num_processors >= MIN_PROCESSORS and graph.weights.dtype.kind == 'i'
+                and graph.pred_cost.dtype.kind == 'i')
+
+    def occupy(self, processor, available_time):
+        self.available[processor - 1] = available_time
+
+    def data_ready(self, placed):
+        # placed: (processor, end time, cost) of each placed predecessor
+        if not placed:
+            return np.zeros(len(self.processors), dtype=np.int64)
+        pred_processor, pred_end_time, cost = np.array(placed, dtype=np.int64).T
+        same_processor = pred_processor[:, None] == self.processors
+        return np.where(same_processor, pred_end_time[:, None], (pred_end_time + cost)[:, None]).max(axis=0)
+
+    def earliest_start(self, placed):
+        # (processor, start time) with the earliest start, first processor on ties
+        start_time = np.maximum(self.available, self.data_ready(placed))
+        best = start_time.argmin()
+        return best.item() + 1, start_time[best].item()
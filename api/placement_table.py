@@ -0,0 +1,24 @@
+# api/placement_table.py
+
+
+class PlacementTable:
+    # Node -> (processor, start time, end time) index shared by the schedulers.
+    # Nodes are the graph's integer indices, so every lookup is a list access
+    # instead of a scan over every task scheduled so far.
+    def __init__(self, num_nodes):
+        self.processor = [None] * num_nodes
+        self.start_time = [None] * num_nodes
+        self.end_time = [None] * num_nodes
+
+    def __contains__(self, node):
+        return self.processor[node] is not None
+
+    def place(self, node, processor, start_time, end_time):
+        self.processor[node] = processor
+        self.start_time[node] = start_time
+        self.end_time[node] = end_time
+
+    def get(self, node):
+        if self.processor[node] is None:
+            return None
+        return self.processor[node], self.start_time[node], self.end_time[node]
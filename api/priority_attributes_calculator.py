@@ -1,155 +1,301 @@
 # api/priority_attributes_calculator.py
-import itertools
+import heapq
+import math
+import os
 
-import networkx as nx
-import pandas as pd
+from .exact_scheduler import BranchAndBoundScheduler
+from .graph_analytics import graph_analytics
 from .graph_from_json import GraphGivenJSON
+from .level_engine import LevelEngine
+from .metrics import observe_graph, phase
+from .placement_kernel import PlacementKernel
+from .placement_table import PlacementTable
+from .processor_sweep import sweep_makespans
+from .processor_timeline import ProcessorTimeline
+from .ready_list import ReadyList
+from .step_trace import StepTrace
+
+# Largest number of processor counts in one calculate_processor_sweep
+MAX_SWEEP = 256
+# Largest processor count a request may ask for; the schedulers keep state
+# per processor
+MAX_PROCESSORS = int(os.environ.get("MAX_PROCESSORS", 1024))
+
+
+def _with_candidates(details, candidates, processor=None):
+    # Step details carry the candidates only in the full trace. ETF also records
+    # the predecessor details of the chosen processor.
+    if candidates is not None:
+        if processor is not None:
+            details["predecessor_details"] = next(
+                (t['predecessor_details'] for t in candidates if t['processor'] == processor), [])
+        details["candidates"] = candidates
+    return details
 
 
 class PriorityAttributesCalculator:
-    def __init__(self, json_data):
+    # vectorized=False runs the pure-Python loops below, kept as the reference
+    # implementation for the LevelEngine. graph replaces the one parsed from
+    # json_data (a session's MutableGraph); json_data then only gives the processors.
+    def __init__(self, json_data, vectorized=True, graph=None):
         self.graph_from_json = GraphGivenJSON(json_data)
-        self.G = self.graph_from_json.parse_json()
+        with phase("parse_graph"):
+            self.graph = self.graph_from_json.parse_compact() if graph is None else graph
+        observe_graph(self.graph.num_nodes, self.graph.num_edges)
         self.num_processors = json_data['num_processors']
-
-    def calculate_sl(self):
-        sl = {}
-        for node in reversed(list(nx.topological_sort(self.G))):
-            successors = list(self.G.successors(node))
+        # Heterogeneous processors (HEFT, CPOP): a speed per processor, or the
+        # cost of every task on every processor keyed by node id
+        self.processor_speeds = json_data.get('processor_speeds')
+        self.computation_costs = json_data.get('computation_costs')
+        self.vectorized = vectorized
+        self._cache = {}
+        self._cache_graph = self.graph
+
+    def _node_ids(self, nodes):
+        return [self.graph.node_ids[node] for node in nodes]
+
+    def invalidate(self, keep=None):
+        # keep: attributes the caller has already brought up to date, e.g. {"SL": [...]}
+        self._cache = dict(keep or {})
+
+    def _cached(self, name, compute):
+        # Each attribute is computed once per graph and shared by every pass;
+        # the cache is dropped when the calculator is given a different graph.
+        if self._cache_graph is not self.graph:
+            self._cache = {}
+            self._cache_graph = self.graph
+        if name not in self._cache:
+            with phase("attributes"):
+                self._cache[name] = compute()
+        return self._cache[name]
+
+    def _levels(self):
+        return self._cached("levels", lambda: LevelEngine(self.graph))
+
+    def _sl(self):
+        return self._cached("SL", self._compute_sl)
+
+    def _compute_sl(self):
+        if self.vectorized:
+            return self._levels().as_list("SL", self._levels().sl())
+        weights = self.graph.weight_list()
+        sl = [0] * self.graph.num_nodes
+        for node in self.graph.reverse_topological_order():
+            successors = self.graph.successors(node)
             if len(successors) == 0:
-                sl[node] = self.G.nodes[node]['weight']
+                sl[node] = weights[node]
             else:
-                sl[node] = max(sl[pre] for pre in successors) + self.G.nodes[node]['weight']
+                sl[node] = max(sl[succ] for succ in successors) + weights[node]
         return sl
 
+    def calculate_sl(self):
+        sl = self._sl()
+        return {self.graph.node_ids[node]: sl[node] for node in self.graph.reverse_topological_order()}
+
     def calculate_sl_steps(self):
-        steps = []
+        with phase("attributes"):
+            return list(self.iter_sl_steps())
+
+    def iter_sl_steps(self):
         sl = {}
+        node_ids = self.graph.node_ids
+        weights = self.graph.weight_list()
 
-        for node in reversed(list(nx.topological_sort(self.G))):
-            successors = list(self.G.successors(node))
+        for node in self.graph.reverse_topological_order():
+            successors = self.graph.successors(node)
+            successor_ids = self._node_ids(successors)
             if len(successors) == 0:
-                sl[node] = self.G.nodes[node]['weight']
-                steps.append({
-                    "step": f"Calculate SL for node {node}",
-                    "details": {"successors": successors, "sl": sl[node]},
-                    "desc": f"Node {node} has no successors. SL is its weight {self.G.nodes[node]['weight']}."
-                })
+                sl[node] = weights[node]
+                yield {
+                    "step": f"Calculate SL for node {node_ids[node]}",
+                    "details": {"successors": successor_ids, "sl": sl[node]},
+                    "desc": f"Node {node_ids[node]} has no successors. SL is its weight {weights[node]}."
+                }
             else:
-                max_successor_sl = max(sl[pre] for pre in successors)
-                sl[node] = max_successor_sl + self.G.nodes[node]['weight']
-                steps.append({
-                    "step": f"Calculate SL for node {node}",
-                    "details": {"successors": successors, "max_successor_sl": max_successor_sl, "sl": sl[node]},
-                    "desc": f"Node {node} has successors {successors}. SL is its weight {self.G.nodes[node]['weight']} + max successor SL {max_successor_sl}."
-                })
-        return steps
-
-    def calculate_t_level(self):
-        t_level = {}
-        for node in nx.topological_sort(self.G):
-            predecessors = list(self.G.predecessors(node))
+                max_successor_sl = max(sl[succ] for succ in successors)
+                sl[node] = max_successor_sl + weights[node]
+                yield {
+                    "step": f"Calculate SL for node {node_ids[node]}",
+                    "details": {"successors": successor_ids, "max_successor_sl": max_successor_sl, "sl": sl[node]},
+                    "desc": f"Node {node_ids[node]} has successors {successor_ids}. SL is its weight {weights[node]} + max successor SL {max_successor_sl}."
+                }
+
+    def _t_level(self):
+        return self._cached("T-Level", self._compute_t_level)
+
+    def _compute_t_level(self):
+        if self.vectorized:
+            return self._levels().as_list("T-Level", self._levels().t_level())
+        weights = self.graph.weight_list()
+        t_level = [0] * self.graph.num_nodes
+        for node in self.graph.topological_order():
+            predecessors, costs = self.graph.in_edges(node)
             if len(predecessors) == 0:
                 t_level[node] = 0
             else:
                 t_level[node] = max(
-                    t_level[pred] + self.G.nodes[pred]['weight'] + self.G.edges[pred, node]['cost'] for pred in
-                    predecessors)
+                    t_level[pred] + weights[pred] + cost for pred, cost in zip(predecessors, costs))
         return t_level
 
+    def calculate_t_level(self):
+        t_level = self._t_level()
+        return {self.graph.node_ids[node]: t_level[node] for node in self.graph.topological_order()}
+
     def calculate_est_steps(self):
-        steps = []
+        with phase("attributes"):
+            return list(self.iter_est_steps())
+
+    def iter_est_steps(self):
         est = {}
+        node_ids = self.graph.node_ids
+        weights = self.graph.weight_list()
 
-        for node in nx.topological_sort(self.G):
-            predecessors = list(self.G.predecessors(node))
+        for node in self.graph.topological_order():
+            predecessors, costs = self.graph.in_edges(node)
+            predecessor_ids = self._node_ids(predecessors)
             if len(predecessors) == 0:
                 est[node] = 0
-                steps.append({
-                    "step": f"Calculate EST for node {node}",
-                    "details": {"predecessors": predecessors, "EST": est[node]},
-                    "desc": f"Node {node} has no predecessors. EST is initialized to 0."
-                })
+                yield {
+                    "step": f"Calculate EST for node {node_ids[node]}",
+                    "details": {"predecessors": predecessor_ids, "EST": est[node]},
+                    "desc": f"Node {node_ids[node]} has no predecessors. EST is initialized to 0."
+                }
             else:
                 max_pred_est = max(
-                    est[pred] + self.G.nodes[pred]['weight'] + self.G.edges[pred, node]['cost'] for pred in
-                    predecessors)
+                    est[pred] + weights[pred] + cost for pred, cost in zip(predecessors, costs))
                 est[node] = max_pred_est
-                steps.append({
-                    "step": f"Calculate EST for node {node}",
-                    "details": {"predecessors": predecessors, "max_pred_est": max_pred_est,
+                yield {
+                    "step": f"Calculate EST for node {node_ids[node]}",
+                    "details": {"predecessors": predecessor_ids, "max_pred_est": max_pred_est,
                                 "EST": est[node]},
-                    "desc": f"Node {node} has predecessors {predecessors}. EST is the maximum of predecessors' EST + node weight + edge cost."
-                })
-
-        return steps
+                    "desc": f"Node {node_ids[node]} has predecessors {predecessor_ids}. EST is the maximum of predecessors' EST + node weight + edge cost."
+                }
 
     def calculate_est(self):
-        est = {}
-        t_level = self.calculate_t_level()
-        for node in self.G.nodes():
-            est[node] = t_level[node]  # EST is equal to t-level for each node
-        return est
-
-    def calculate_lst(self):
-        lst = {}
-        t_level = self.calculate_t_level()
-        for node in reversed(list(nx.topological_sort(self.G))):
-            successors = list(self.G.successors(node))
+        t_level = self._t_level()
+        # EST is equal to t-level for each node
+        return {node_id: t_level[node] for node, node_id in enumerate(self.graph.node_ids)}
+
+    def _lst(self):
+        return self._cached("LST", self._compute_lst)
+
+    def _compute_lst(self):
+        if self.vectorized:
+            return self._levels().as_list("LST", self._levels().lst(self._t_level()))
+        weights = self.graph.weight_list()
+        t_level = self._t_level()
+        lst = [0] * self.graph.num_nodes
+        for node in self.graph.reverse_topological_order():
+            successors, costs = self.graph.out_edges(node)
             if len(successors) == 0:  # exist task
                 lst[node] = t_level[node]
             else:
-                lst[node] = min(lst[succ] - self.G.edges[node, succ]['cost'] for succ in successors) - \
-                            self.G.nodes[node]['weight']
+                lst[node] = min(lst[succ] - cost for succ, cost in zip(successors, costs)) - weights[node]
         return lst
 
+    def calculate_lst(self):
+        lst = self._lst()
+        return {self.graph.node_ids[node]: lst[node] for node in self.graph.reverse_topological_order()}
+
     def calculate_lst_steps(self):
-        steps = []
+        with phase("attributes"):
+            return list(self.iter_lst_steps())
+
+    def iter_lst_steps(self):
         lst = {}
+        node_ids = self.graph.node_ids
+        weights = self.graph.weight_list()
 
         # Calculate t_level first
-        est_steps = self.calculate_est_steps()
-        for step in est_steps:
-            steps.append(step)
+        yield from self.iter_est_steps()
 
-        t_level = self.calculate_t_level()
+        t_level = self._t_level()
 
         # Initialize LST for end nodes
-        for node in reversed(list(nx.topological_sort(self.G))):
-            successors = list(self.G.successors(node))
+        for node in self.graph.reverse_topological_order():
+            successors = self.graph.successors(node)
             if len(successors) == 0:  # End node
                 lst[node] = t_level[node]
-                steps.append({
-                    "step": f"Calculate LST for node {node}",
-                    "details": {"Successors": successors, "LST": lst[node]},
-                    "desc": f"Node {node} is an end node. LST is initialised to EST, which is {t_level[node]}."
-                })
+                yield {
+                    "step": f"Calculate LST for node {node_ids[node]}",
+                    "details": {"Successors": [], "LST": lst[node]},
+                    "desc": f"Node {node_ids[node]} is an end node. LST is initialised to EST, which is {t_level[node]}."
+                }
 
         # Calculate LST for other nodes
-        for node in reversed(list(nx.topological_sort(self.G))):
-            successors = list(self.G.successors(node))
+        for node in self.graph.reverse_topological_order():
+            successors, costs = self.graph.out_edges(node)
             if len(successors) > 0:  # Non-end node
-                min_successor_lst = min(lst[succ] - self.G.edges[node, succ]['cost'] for succ in successors)
-                lst[node] = min_successor_lst - self.G.nodes[node]['weight']
-                steps.append({
-                    "step": f"Calculate LST for node {node}",
-                    "details": {"successors": successors, "min_successor_lst": min_successor_lst, "LST": lst[node]},
-                    "desc": f"Node {node} has successors {successors}. LST is the minimum of (successors' LST - edge cost) - node weight."
-                })
-
-        return steps
-
-    def calculate_b_level(self):
-        b_level = {}
-        for node in reversed(list(nx.topological_sort(self.G))):
-            successors = list(self.G.successors(node))
+                min_successor_lst = min(lst[succ] - cost for succ, cost in zip(successors, costs))
+                lst[node] = min_successor_lst - weights[node]
+                yield {
+                    "step": f"Calculate LST for node {node_ids[node]}",
+                    "details": {"successors": self._node_ids(successors), "min_successor_lst": min_successor_lst,
+                                "LST": lst[node]},
+                    "desc": f"Node {node_ids[node]} has successors {self._node_ids(successors)}. LST is the minimum of (successors' LST - edge cost) - node weight."
+                }
+
+    def _b_level(self):
+        return self._cached("B-Level", self._compute_b_level)
+
+    def _compute_b_level(self):
+        if self.vectorized:
+            return self._levels().as_list("B-Level", self._levels().b_level())
+        weights = self.graph.weight_list()
+        b_level = [0] * self.graph.num_nodes
+        for node in self.graph.reverse_topological_order():
+            successors, costs = self.graph.out_edges(node)
             if len(successors) == 0:  # exit task
-                b_level[node] = self.G.nodes[node]['weight']
+                b_level[node] = weights[node]
             else:
-                b_level[node] = self.G.nodes[node]['weight'] + max(
-                    b_level[succ] + self.G.edges[node, succ]['cost'] for succ in successors)
+                b_level[node] = weights[node] + max(
+                    b_level[succ] + cost for succ, cost in zip(successors, costs))
         return b_level
 
+    def calculate_b_level(self):
+        b_level = self._b_level()
+        return {self.graph.node_ids[node]: b_level[node] for node in self.graph.reverse_topological_order()}
+
+    def _computation_costs(self):
+        return self._cached(f"costs/{self.num_processors}", self._compute_computation_costs)
+
+    def _compute_computation_costs(self):
+        # Cost of every task on every processor (node x processor). Without
+        # speeds or costs the processors are identical and it is the weight.
+        if self.processor_speeds is not None and self.computation_costs is not None:
+            raise ValueError("Provide either processor_speeds or computation_costs, not both.")
+        if self.computation_costs is not None:
+            costs = []
+            for node_id in self.graph.node_ids:
+                node_costs = self.computation_costs.get(str(node_id))
+                if node_costs is None:
+                    raise ValueError(f"Missing computation costs for node {node_id}.")
+                if len(node_costs) != self.num_processors:
+                    raise ValueError(f"Node {node_id} needs one computation cost per processor "
+                                     f"({self.num_processors}).")
+                costs.append(list(node_costs))
+            return costs
+
+        speeds = self.processor_speeds or [1] * self.num_processors
+        if len(speeds) != self.num_processors:
+            raise ValueError(f"Provide one speed per processor ({self.num_processors}).")
+        if any(speed <= 0 for speed in speeds):
+            raise ValueError("Processor speeds must be positive.")
+        return [[weight if speed == 1 else weight / speed for speed in speeds] for weight in self.graph.weight_list()]
+
+    def _mean_costs(self):
+        return [sum(node_costs) / len(node_costs) for node_costs in self._computation_costs()]
+
+    def _upward_rank(self):
+        # B-Level over the mean computation cost of each task
+        return self._cached(f"rank_u/{self.num_processors}",
+                            lambda: self._levels().b_level(self._mean_costs()).tolist())
+
+    def _downward_rank(self):
+        # T-Level over the mean computation cost of each task
+        return self._cached(f"rank_d/{self.num_processors}",
+                            lambda: self._levels().t_level(self._mean_costs()).tolist())
+
     def obtain_attribute_dict(self, attribute=None):
         if attribute is None:
             return {
@@ -172,7 +318,14 @@ class PriorityAttributesCalculator:
         else:
             raise ValueError("Invalid attribute name. Please provide one of: 'SL', 'T-Level', 'EST', 'LST', 'B-Level'.")
 
+    def calculate_graph_analytics(self):
+        # Critical path, slack, CCR, width and generation sizes from the cached attributes
+        return graph_analytics(self.graph, self._t_level(), self._b_level(), self._lst())
+
     def obtain_attribute_table(self, attribute=None):
+        # pandas is only needed here and takes longer to import than the rest of the app
+        import pandas as pd
+
         if attribute is None:
             all_attributes = {
                 "SL": pd.Series(self.calculate_sl()),
@@ -196,487 +349,670 @@ class PriorityAttributesCalculator:
         else:
             raise ValueError("Invalid attribute name. Please provide one of: 'SL', 'T-Level', 'EST', 'LST', 'B-Level'.")
 
-    def calculate_hlfet_steps(self):
-        steps = []
+    def _processor_candidates(self, node, processors, placements, timelines=None, node_costs=None):
+        # Start/end time of node on every processor, with the per-predecessor breakdown.
+        # node_costs gives its computation cost on each processor when they differ.
+        weight = self.graph.weights[node].item()
+        predecessors, costs = self.graph.in_edges(node)
+        candidates = []
+        for processor, available_time in processors.items():
+            if node_costs is not None:
+                weight = node_costs[processor - 1]
+            start_time = available_time if timelines is None else 0
+            predecessor_details = []
+
+            # Consider the communication cost
+            for predecessor, cost in zip(predecessors, costs):
+                predecessor_task = placements.get(predecessor)
+                if predecessor_task:
+                    pred_processor, pred_start_time, pred_end_time = predecessor_task
+                    if pred_processor == processor:
+                        # If the predecessor is on the same processor, no communication cost
+                        start_time = max(start_time, pred_end_time)
+                        comm_cost = 0
+                    else:
+                        # If the predecessor is on a different processor, add communication cost
+                        comm_cost = cost
+                        start_time = max(start_time, pred_end_time + comm_cost)
+
+                    predecessor_details.append({
+                        "predecessor": self.graph.node_ids[predecessor],
+                        "processor": pred_processor,
+                        "same_processor": pred_processor == processor,
+                        "pred_start_time": pred_start_time,
+                        "pred_end_time": pred_end_time,
+                        "comm_cost": comm_cost,
+                        "available_time": available_time,
+                        "max_start_time": start_time
+                    })
+
+            if timelines is not None:
+                # Earliest idle slot from the data-ready time on
+                start_time = timelines[processor].earliest_start(start_time, weight)
+            candidates.append({
+                "processor": processor,
+                "start_time": start_time,
+                "end_time": start_time + weight,
+                "node_weight": weight,
+                "predecessor_details": predecessor_details
+            })
+        return candidates
+
+    def _trace(self, detail, cursor, limit):
+        # Every scheduler emits two set-up steps followed by one step per task
+        return StepTrace(detail, self.graph.num_nodes + 2, cursor, limit)
+
+    def _timelines(self, insertion):
+        # Per-processor busy intervals for insertion-based scheduling, or None to append
+        if not insertion:
+            return None
+        return {processor: ProcessorTimeline() for processor in range(1, self.num_processors + 1)}
+
+    def _placement_kernel(self):
+        # Array-based candidate evaluation for many processors, or None for the loops
+        if self.vectorized and PlacementKernel.applies(self.graph, self.num_processors):
+            return PlacementKernel(self.num_processors)
+        return None
+
+    def _earliest_start(self, node, processors, placements, timelines=None, kernel=None):
+        # (processor, start time) with the earliest start, first processor on ties
+        predecessors, costs = self.graph.in_edges(node)
+        placed = [(placements.processor[predecessor], placements.end_time[predecessor], cost)
+                  for predecessor, cost in zip(predecessors, costs) if predecessor in placements]
+        if kernel is not None:
+            if timelines is None:
+                return kernel.earliest_start(placed)
+            data_ready = kernel.data_ready(placed).tolist()
+        weight = self.graph.weights[node].item()
+        best_processor = None
+        earliest_start_time = float('inf')
+        for processor, available_time in processors.items():
+            if kernel is not None:
+                start_time = data_ready[processor - 1]
+            else:
+                start_time = available_time if timelines is None else 0
+                for pred_processor, pred_end_time, cost in placed:
+                    start_time = max(start_time,
+                                     pred_end_time if pred_processor == processor else pred_end_time + cost)
+            if timelines is not None:
+                start_time = timelines[processor].earliest_start(start_time, weight)
+            if start_time < earliest_start_time:
+                earliest_start_time = start_time
+                best_processor = processor
+        return best_processor, earliest_start_time
+
+    def _earliest_finish(self, node, processors, placements, timelines, node_costs):
+        # (processor, start time) with the earliest finish on heterogeneous
+        # processors, first processor on ties
+        predecessors, costs = self.graph.in_edges(node)
+        placed = [(placements.processor[predecessor], placements.end_time[predecessor], cost)
+                  for predecessor, cost in zip(predecessors, costs) if predecessor in placements]
+        best_processor = None
+        best_start_time = None
+        earliest_end_time = float('inf')
+        for processor, available_time in processors.items():
+            start_time = available_time if timelines is None else 0
+            for pred_processor, pred_end_time, cost in placed:
+                start_time = max(start_time, pred_end_time if pred_processor == processor else pred_end_time + cost)
+            node_cost = node_costs[processor - 1]
+            if timelines is not None:
+                start_time = timelines[processor].earliest_start(start_time, node_cost)
+            if start_time + node_cost < earliest_end_time:
+                earliest_end_time = start_time + node_cost
+                best_processor = processor
+                best_start_time = start_time
+        return best_processor, best_start_time
+
+    def _occupy(self, processors, timelines, processor, start_time, end_time, kernel=None):
+        if timelines is None:
+            processors[processor] = end_time
+        else:
+            timelines[processor].insert(start_time, end_time)
+            processors[processor] = max(processors[processor], end_time)
+        if kernel is not None:
+            kernel.occupy(processor, processors[processor])
+
+    def _hlfet_order(self):
+        return sorted(self.graph.reverse_topological_order(), key=self._sl().__getitem__, reverse=True)
+
+    def _mcp_order(self):
+        return sorted(self.graph.reverse_topological_order(), key=self._lst().__getitem__)
+
+    def calculate_hlfet_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.collect(self._hlfet_steps(trace, insertion))
+
+    def iter_hlfet_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.stream(self._hlfet_steps(trace, insertion))
+
+    def _hlfet_steps(self, trace, insertion=False, memo=None):
+        node_ids = self.graph.node_ids
+        weights = self.graph.weight_list()
 
         # Step 1: Calculate Static Level (SL) for each task
-        sl = self.calculate_sl()
-        steps.append({
+        sl = self._sl()
+        yield from trace.add(lambda: {
             "step": "Calculate Static Level (SL) for each task.",
-            "details": sl,
+            "details": self.calculate_sl(),
             "desc": "SL calculated for each node based on its successors."
         })
 
         # Step 2: List all tasks and sort them by SL in descending order
-        sorted_tasks = sorted(sl, key=sl.get, reverse=True)
-        steps.append({
+        sorted_tasks = self._hlfet_order()
+        yield from trace.add(lambda: {
             "step": "List all tasks and sort them by SL in descending order.",
-            "details": sorted_tasks,
+            "details": self._node_ids(sorted_tasks),
             "desc": "Tasks sorted by SL in descending order."
         })
 
         # Step 3: Schedule tasks
-        scheduled_tasks = []
+        placements = PlacementTable(self.graph.num_nodes)
         processors = {i: 0 for i in
                       range(1, self.num_processors + 1)}  # Initialize all processors with available time 0
 
-        for task in sorted_tasks:
-            best_processor = None
-            earliest_end_time = float('inf')
-            candidates = []
-
-            for processor, available_time in processors.items():
-                start_time = available_time
-                predecessor_details = []
-
-                # Consider the communication cost
-                for predecessor in self.G.predecessors(task):
-                    predecessor_task = next((t for t in scheduled_tasks if t['node'] == predecessor), None)
-                    if predecessor_task:
-                        if predecessor_task['processor'] == processor:
-                            # If the predecessor is on the same processor, no communication cost
-                            start_time = max(start_time, predecessor_task['end_time'])
-                            comm_cost = 0
-                        else:
-                            # If the predecessor is on a different processor, add communication cost
-                            start_time = max(start_time,
-                                             predecessor_task['end_time'] + self.G.edges[predecessor, task]['cost'])
-                            comm_cost = self.G.edges[predecessor, task]['cost']
-                        predecessor_details.append({
-                            "predecessor": predecessor,
-                            "processor": predecessor_task['processor'],
-                            "same_processor": predecessor_task['processor'] == processor,
-                            "pred_start_time": predecessor_task['start_time'],
-                            "pred_end_time": predecessor_task['end_time'],
-                            "comm_cost": comm_cost,
-                            "available_time": available_time,
-                            "max_start_time": start_time
-                        })
-
-                end_time = start_time + self.G.nodes[task]['weight']
-                candidates.append({
-                    "processor": processor,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "node_weight": self.G.nodes[task]['weight'],
-                    "predecessor_details": predecessor_details
-                })
-
-                if end_time < earliest_end_time:
-                    earliest_start_time = start_time
-                    earliest_end_time = end_time
-                    best_processor = processor
-
-            processors[best_processor] = earliest_end_time
-            scheduled_tasks.append({
-                "processor": best_processor,
-                "node": task,
-                "start_time": earliest_start_time,
-                "end_time": earliest_end_time,
-                "total_time": earliest_end_time,
-                "candidates": candidates
-            })
+        timelines = self._timelines(insertion)
+        kernel = self._placement_kernel()
+        # Leading tasks placed as in a session's previous run
+        reuse = memo.start(sorted_tasks, sl, placements) if memo is not None else 0
+
+        for position, task in enumerate(sorted_tasks):
+            if trace.finished:
+                break
+
+            # Earliest end time, first processor on ties
+            candidates = None
+            if position < reuse:
+                best_processor, earliest_start_time = memo.placement(task)
+            elif trace.wants_candidates:
+                candidates = self._processor_candidates(task, processors, placements, timelines)
+                best = min(candidates, key=lambda candidate: candidate['end_time'])
+                best_processor, earliest_start_time = best['processor'], best['start_time']
+            else:
+                best_processor, earliest_start_time = self._earliest_start(task, processors, placements, timelines,
+                                                                           kernel)
+            earliest_end_time = earliest_start_time + weights[task]
 
-            steps.append({
-                "step": f"Schedule task {task} with SL {sl[task]}.",
-                "details": {
+            self._occupy(processors, timelines, best_processor, earliest_start_time, earliest_end_time, kernel)
+            placements.place(task, best_processor, earliest_start_time, earliest_end_time)
+            trace.place(node_ids[task], best_processor, earliest_start_time, earliest_end_time)
+
+            build_step = lambda: {
+                "step": f"Schedule task {node_ids[task]} with SL {sl[task]}.",
+                "details": _with_candidates({
                     "processor": best_processor,
-                    "node": task,
+                    "node": node_ids[task],
                     "start_time": earliest_start_time,
                     "end_time": earliest_end_time,
-                    "total_time": earliest_end_time,
-                    "candidates": candidates
-                },
-                "desc": f"Scheduled node {task} on processor {best_processor} from time {earliest_start_time} to {earliest_end_time}."
-            })
+                    "total_time": earliest_end_time
+                }, candidates),
+                "desc": f"Scheduled node {node_ids[task]} on processor {best_processor} from time {earliest_start_time} to {earliest_end_time}."
+            }
+            yield from trace.add(build_step if memo is None else memo.keep(position, build_step))
+
+    def calculate_mcp_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.collect(self._mcp_steps(trace, insertion))
 
-        return steps
+    def iter_mcp_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.stream(self._mcp_steps(trace, insertion))
 
-    def calculate_mcp_steps(self):
-        steps = []
+    def _mcp_steps(self, trace, insertion=False, memo=None):
+        node_ids = self.graph.node_ids
+        weights = self.graph.weight_list()
 
         # Step 1: Calculate Latest Start Time (LST) for each task
-        lst = self.calculate_lst()
-        steps.append({
+        lst = self._lst()
+        yield from trace.add(lambda: {
             "step": "Calculate Latest Start Time (LST) for each task in the graph.",
-            "details": lst,
+            "details": self.calculate_lst(),
             "desc": "LST calculated for each node."
         })
 
         # Step 2: List all tasks and sort them by LST in ascending order
-        sorted_tasks_by_lst = sorted(lst, key=lst.get)
-        steps.append({
+        sorted_tasks_by_lst = self._mcp_order()
+        yield from trace.add(lambda: {
             "step": "List all tasks and sort them by LST in ascending order.",
-            "details": sorted_tasks_by_lst,
+            "details": self._node_ids(sorted_tasks_by_lst),
             "desc": "Tasks sorted by LST in ascending order."
         })
 
         # Step 3: Schedule tasks
-        scheduled_tasks = []
+        placements = PlacementTable(self.graph.num_nodes)
         processors = {i: 0 for i in
                       range(1, self.num_processors + 1)}  # Initialize all processors with available time 0
 
-        for task in sorted_tasks_by_lst:
-            best_processor = None
-            earliest_start_time = float('inf')
-            candidates = []
-
-            for processor, available_time in processors.items():
-                start_time = available_time
-                predecessor_details = []
-
-                # Consider the communication cost
-                for predecessor in self.G.predecessors(task):
-                    predecessor_task = next((t for t in scheduled_tasks if t['node'] == predecessor), None)
-                    if predecessor_task:
-                        if predecessor_task['processor'] == processor:
-                            # If the predecessor is on the same processor, no communication cost
-                            start_time = max(start_time, predecessor_task['end_time'])
-                            comm_cost = 0
-                        else:
-                            # If the predecessor is on a different processor, add communication cost
-                            comm_cost = self.G.edges[predecessor, task]['cost']
-                            start_time = max(start_time, predecessor_task['end_time'] + comm_cost)
-                        predecessor_details.append({
-                            "predecessor": predecessor,
-                            "processor": predecessor_task['processor'],
-                            "same_processor": predecessor_task['processor'] == processor,
-                            "pred_start_time": predecessor_task['start_time'],
-                            "pred_end_time": predecessor_task['end_time'],
-                            "comm_cost": comm_cost,
-                            "available_time": available_time,
-                            "max_start_time": start_time
-                        })
-
-                end_time = start_time + self.G.nodes[task]['weight']
-                candidates.append({
-                    "processor": processor,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "node_weight": self.G.nodes[task]['weight'],
-                    "predecessor_details": predecessor_details
-                })
-
-                if start_time < earliest_start_time:
-                    earliest_start_time = start_time
-                    best_processor = processor
-
-            processors[best_processor] = earliest_start_time + self.G.nodes[task]['weight']
-            scheduled_tasks.append({
-                "processor": best_processor,
-                "node": task,
-                "start_time": earliest_start_time,
-                "end_time": earliest_start_time + self.G.nodes[task]['weight'],
-                "total_time": earliest_start_time + self.G.nodes[task]['weight'],
-                "candidates": candidates
-            })
+        timelines = self._timelines(insertion)
+        kernel = self._placement_kernel()
+        # Leading tasks placed as in a session's previous run
+        reuse = memo.start(sorted_tasks_by_lst, lst, placements) if memo is not None else 0
+
+        for position, task in enumerate(sorted_tasks_by_lst):
+            if trace.finished:
+                break
+
+            # Earliest start time, first processor on ties
+            candidates = None
+            if position < reuse:
+                best_processor, earliest_start_time = memo.placement(task)
+            elif trace.wants_candidates:
+                candidates = self._processor_candidates(task, processors, placements, timelines)
+                best = min(candidates, key=lambda candidate: candidate['start_time'])
+                best_processor, earliest_start_time = best['processor'], best['start_time']
+            else:
+                best_processor, earliest_start_time = self._earliest_start(task, processors, placements, timelines,
+                                                                           kernel)
+            end_time = earliest_start_time + weights[task]
 
-            steps.append({
-                "step": f"Schedule task {task} with LST {lst[task]}.",
-                "details": {
+            self._occupy(processors, timelines, best_processor, earliest_start_time, end_time, kernel)
+            placements.place(task, best_processor, earliest_start_time, end_time)
+            trace.place(node_ids[task], best_processor, earliest_start_time, end_time)
+
+            build_step = lambda: {
+                "step": f"Schedule task {node_ids[task]} with LST {lst[task]}.",
+                "details": _with_candidates({
                     "processor": best_processor,
-                    "node": task,
+                    "node": node_ids[task],
                     "start_time": earliest_start_time,
-                    "end_time": earliest_start_time + self.G.nodes[task]['weight'],
-                    "total_time": earliest_start_time + self.G.nodes[task]['weight'],
-                    "candidates": candidates
-                },
-                "desc": f"Scheduled node {task} on processor {best_processor} from time {earliest_start_time} to {earliest_start_time + self.G.nodes[task]['weight']}."
-            })
-
-        return steps
+                    "end_time": end_time,
+                    "total_time": end_time
+                }, candidates),
+                "desc": f"Scheduled node {node_ids[task]} on processor {best_processor} from time {earliest_start_time} to {end_time}."
+            }
+            yield from trace.add(build_step if memo is None else memo.keep(position, build_step))
 
     def calculate_eexct(self):  # earliest execution time
-        est = {}
-        for node in nx.topological_sort(self.G):
-            if not list(self.G.predecessors(node)):
-                est[node] = 0
-            else:
-                est[node] = max(est[pred] + self.G.nodes[pred]['weight'] + self.G.edges[pred, node]['cost']
-                                for pred in self.G.predecessors(node))
-        return est
+        return self.calculate_t_level()
+
+    def calculate_etf_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.collect(self._etf_steps(trace, insertion))
+
+    def iter_etf_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.stream(self._etf_steps(trace, insertion))
 
-    def calculate_etf_steps(self):
-        steps = []
+    def _etf_steps(self, trace, insertion=False):
+        node_ids = self.graph.node_ids
+        weights = self.graph.weight_list()
 
         # Step 1: Calculate Static Level (SL) for each task
-        sl = self.calculate_sl()
-        steps.append({
+        sl = self._sl()
+        yield from trace.add(lambda: {
             "step": "Calculate Static Level (SL) for each task.",
-            "details": sl,
+            "details": self.calculate_sl(),
             "desc": "SL calculated based on task dependencies and weights."
         })
 
         # Step 2: Initialise the ready list with the entry node (root node)
-        ready_nodes = [node for node in self.G.nodes if not list(self.G.predecessors(node))]
-        steps.append({
+        placements = PlacementTable(self.graph.num_nodes)
+        processor_available_times = {i: 0 for i in range(1, self.num_processors + 1)}
+        # Earliest start first, ties broken by the highest SL
+        timelines = self._timelines(insertion)
+        ready_list = ReadyList(self.graph, placements, processor_available_times,
+                               lambda node, start_time: (start_time, -sl[node]), timelines,
+                               self._placement_kernel())
+        yield from trace.add(lambda: {
             "step": "Initialize ready nodes list with entry nodes.",
-            "details": ready_nodes,
+            "details": self._node_ids(ready_list.ready),
             "desc": "Entry nodes identified and added to the ready list."
         })
 
         # Step 3: While there are nodes in the ready list
-        scheduled_tasks = []
-        processor_available_times = {i: 0 for i in range(1, self.num_processors + 1)}
-
-        while ready_nodes:
-            # Calculate earliest execution start time for each node on all processors
-            earliest_execution_times = {}
-
-            for node in ready_nodes:
-                earliest_execution_times[node] = []
-                for processor, available_time in processor_available_times.items():
-                    start_time = available_time
-                    predecessor_details = []
-
-                    # Consider the communication cost
-                    for predecessor in self.G.predecessors(node):
-                        predecessor_task = next((t for t in scheduled_tasks if t['node'] == predecessor), None)
-                        if predecessor_task:
-                            if predecessor_task['processor'] == processor:
-                                start_time = max(start_time, predecessor_task['end_time'])
-                                comm_cost = 0
-                            else:
-                                comm_cost = self.G.edges[predecessor, node]['cost']
-                                start_time = max(start_time, predecessor_task['end_time'] + comm_cost)
-
-                            predecessor_details.append({
-                                "predecessor": predecessor,
-                                "processor": predecessor_task['processor'],
-                                "same_processor": predecessor_task['processor'] == processor,
-                                "pred_start_time": predecessor_task['start_time'],
-                                "pred_end_time": predecessor_task['end_time'],
-                                "comm_cost": comm_cost,
-                                "available_time": available_time,
-                                "max_start_time": start_time
-                            })
-
-                    end_time = start_time + self.G.nodes[node]['weight']
-                    earliest_execution_times[node].append({
-                        "processor": processor,
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "node_weight": self.G.nodes[node]['weight'],
-                        "predecessor_details": predecessor_details
-                    })
-
+        while ready_list and not trace.finished:
             # Choose the node-processor pair with the earliest execution start time
-            best_node = None
-            best_processor = None
-            earliest_start_time = float('inf')
-            highest_sl = -1
-
-            for node, processor_times in earliest_execution_times.items():
-                for times in processor_times:
-                    start_time = times['start_time']
-                    if start_time < earliest_start_time or (
-                            start_time == earliest_start_time and sl[node] > highest_sl):
-                        best_node = node
-                        best_processor = times['processor']
-                        earliest_start_time = start_time
-                        highest_sl = sl[node]
-
-            # Schedule the best_node on the best_processor
-            end_time = earliest_start_time + self.G.nodes[best_node]['weight']
-            best_predecessor_details = next((t['predecessor_details'] for t in earliest_execution_times[best_node] if
-                                             t['processor'] == best_processor), [])
+            best_node, best_processor, earliest_start_time = ready_list.peek()
+            end_time = earliest_start_time + weights[best_node]
 
             # Ensure correct recording of predecessor details
-            candidates = []
-            for times in earliest_execution_times[best_node]:
-                candidates.append({
-                    "processor": times['processor'],
-                    "start_time": times['start_time'],
-                    "end_time": times['end_time'],
-                    "node_weight": times['node_weight'],
-                    "predecessor_details": times['predecessor_details']
-                })
-
-            scheduled_task = {
-                "processor": best_processor,
-                "node": best_node,
-                "start_time": earliest_start_time,
-                "end_time": end_time,
-                "total_time": end_time,
-                "predecessor_details": best_predecessor_details,
-                "candidates": candidates
-            }
-            scheduled_tasks.append(scheduled_task)
+            candidates = None
+            if trace.wants_candidates:
+                candidates = self._processor_candidates(best_node, processor_available_times, placements, timelines)
 
-            # Update processor_available_times for the chosen processor
-            processor_available_times[best_processor] = end_time
-
-            # Remove the scheduled node from ready_nodes
-            ready_nodes.remove(best_node)
-
-            # Add newly ready nodes (nodes whose dependencies are satisfied) to ready_nodes
-            for succ in self.G.successors(best_node):
-                if all(pred in [task['node'] for task in scheduled_tasks] for pred in self.G.predecessors(succ)):
-                    ready_nodes.append(succ)
+            # Schedule the best_node on the best_processor, update its processor's
+            # available time and add the newly ready successors
+            ready_list.schedule(best_node, best_processor, earliest_start_time, end_time)
+            trace.place(node_ids[best_node], best_processor, earliest_start_time, end_time)
 
             # Record this step in the steps list
-            steps.append({
-                "step": f"Schedule task {best_node} with SL {sl[best_node]}.",
-                "details": scheduled_task,
-                "desc": f"Scheduled node {best_node} on processor {best_processor} from time {earliest_start_time} to {end_time}."
+            yield from trace.add(lambda: {
+                "step": f"Schedule task {node_ids[best_node]} with SL {sl[best_node]}.",
+                "details": _with_candidates({
+                    "processor": best_processor,
+                    "node": node_ids[best_node],
+                    "start_time": earliest_start_time,
+                    "end_time": end_time,
+                    "total_time": end_time
+                }, candidates, best_processor),
+                "desc": f"Scheduled node {node_ids[best_node]} on processor {best_processor} from time {earliest_start_time} to {end_time}."
             })
 
-        return steps
+    def calculate_dls_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.collect(self._dls_steps(trace, insertion))
+
+    def iter_dls_steps(self, detail="full", cursor=0, limit=None, insertion=False):
+        trace = self._trace(detail, cursor, limit)
+        return trace.stream(self._dls_steps(trace, insertion))
 
-    # TODO: not working
-    def calculate_dls_steps(self):
-        steps = []
+    def _dls_steps(self, trace, insertion=False):
+        node_ids = self.graph.node_ids
+        weights = self.graph.weight_list()
 
         # Step 1: Calculate Static Level (SL) for each task
-        sl = self.calculate_sl()
-        steps.append({
+        sl = self._sl()
+        yield from trace.add(lambda: {
             "step": "Calculate Static Level (SL) for each task.",
-            "details": sl,
+            "details": self.calculate_sl(),
             "desc": "SL calculated for each node based on its successors."
         })
 
         # Step 2: Initialize ready nodes list with entry nodes
-        ready_nodes = [node for node in self.G.nodes() if self.G.in_degree(node) == 0]
-        steps.append({
+        placements = PlacementTable(self.graph.num_nodes)
+        processors = {i: 0 for i in
+                      range(1, self.num_processors + 1)}  # Initialize all processors with available time 0
+        # Highest dynamic level (SL - start time) first
+        ready_list = ReadyList(self.graph, placements, processors,
+                               lambda node, start_time: (start_time - sl[node],), self._timelines(insertion),
+                               self._placement_kernel())
+        yield from trace.add(lambda: {
             "step": "Initialize ready nodes list with entry nodes.",
-            "details": ready_nodes,
+            "details": self._node_ids(ready_list.ready),
             "desc": "Entry nodes identified and added to the ready list."
         })
 
-        scheduled_tasks = []
-        processors = {i: 0 for i in
-                      range(1, self.num_processors + 1)}  # Initialize all processors with available time 0
-
         # Step 3: Schedule tasks
-        while ready_nodes:
-            best_task = None
-            best_processor = None
-            best_dl = float('-inf')
-            best_start_time = None
-            candidates = []
-
-            for task in ready_nodes:
-                for processor, available_time in processors.items():
-                    start_time = available_time
-
-                    # Consider the communication cost
-                    for predecessor in self.G.predecessors(task):
-                        predecessor_task = next((t for t in scheduled_tasks if t['node'] == predecessor), None)
-                        if predecessor_task:
-                            if predecessor_task['processor'] == processor:
-                                start_time = max(start_time, predecessor_task['end_time'])
-                            else:
-                                start_time = max(start_time,
-                                                 predecessor_task['end_time'] + self.G.edges[predecessor, task]['cost'])
-
-                    dl = sl[task] - start_time
-                    end_time = start_time + self.G.nodes[task]['weight']
+        while ready_list and not trace.finished:
+            best_task, best_processor, best_start_time = ready_list.peek()
+            best_dl = sl[best_task] - best_start_time
+
+            # Dynamic level of the chosen task on every processor
+            candidates = None
+            if trace.wants_candidates:
+                candidates = []
+                for processor in processors:
+                    start_time = ready_list.start_time(best_task, processor)
                     candidates.append(
-                        {"processor": processor, "node": task, "start_time": start_time, "end_time": end_time,
-                         "dl": dl})
-
-                    if dl > best_dl:
-                        best_dl = dl
-                        best_task = task
-                        best_processor = processor
-                        best_start_time = start_time
+                        {"processor": processor, "node": node_ids[best_task], "start_time": start_time,
+                         "end_time": start_time + weights[best_task], "dl": sl[best_task] - start_time})
 
             # Schedule the best task
-            processors[best_processor] = best_start_time + self.G.nodes[best_task]['weight']
-            scheduled_tasks.append({
-                "processor": best_processor,
-                "node": best_task,
-                "start_time": best_start_time,
-                "end_time": best_start_time + self.G.nodes[best_task]['weight'],
-                "total_time": best_start_time + self.G.nodes[best_task]['weight'],
-                "candidates": candidates
-            })
+            end_time = best_start_time + weights[best_task]
+            ready_list.schedule(best_task, best_processor, best_start_time, end_time)
+            trace.place(node_ids[best_task], best_processor, best_start_time, end_time)
 
-            steps.append({
-                "step": f"Schedule task {best_task} with DL {best_dl}.",
-                "details": {
+            yield from trace.add(lambda: {
+                "step": f"Schedule task {node_ids[best_task]} with DL {best_dl}.",
+                "details": _with_candidates({
                     "processor": best_processor,
-                    "node": best_task,
+                    "node": node_ids[best_task],
                     "start_time": best_start_time,
-                    "end_time": best_start_time + self.G.nodes[best_task]['weight'],
-                    "total_time": best_start_time + self.G.nodes[best_task]['weight'],
-                    "candidates": candidates
-                },
-                "desc": f"Scheduled node {best_task} on processor {best_processor} from time {best_start_time} to {best_start_time + self.G.nodes[best_task]['weight']}."
+                    "end_time": end_time,
+                    "total_time": end_time
+                }, candidates),
+                "desc": f"Scheduled node {node_ids[best_task]} on processor {best_processor} from time {best_start_time} to {end_time}."
             })
 
-            # Remove the scheduled task from ready nodes
-            ready_nodes.remove(best_task)
+    def calculate_heft_steps(self, detail="full", cursor=0, limit=None):
+        trace = self._trace(detail, cursor, limit)
+        return trace.collect(self._heft_steps(trace))
+
+    def iter_heft_steps(self, detail="full", cursor=0, limit=None):
+        trace = self._trace(detail, cursor, limit)
+        return trace.stream(self._heft_steps(trace))
 
-            # Add newly ready nodes to the ready list
-            for successor in self.G.successors(best_task):
-                if all(predecessor in [t['node'] for t in scheduled_tasks] for predecessor in
-                       self.G.predecessors(successor)):
-                    ready_nodes.append(successor)
+    def _heft_steps(self, trace):
+        node_ids = self.graph.node_ids
+        costs = self._computation_costs()
 
-        return steps
+        # Step 1: Calculate the upward rank of each task
+        rank_u = self._upward_rank()
+        yield from trace.add(lambda: {
+            "step": "Calculate upward rank for each task.",
+            "details": {node_ids[node]: rank_u[node] for node in self.graph.reverse_topological_order()},
+            "desc": "Upward rank is the B-Level computed with each task's mean cost over the processors."
+        })
 
-    # TODO: BRUTE FORCE SOLUTION
-    def brute_force_solution(self):
+        # Step 2: List all tasks and sort them by upward rank in descending order
+        sorted_tasks = sorted(self.graph.topological_order(), key=rank_u.__getitem__, reverse=True)
+        yield from trace.add(lambda: {
+            "step": "List all tasks and sort them by upward rank in descending order.",
+            "details": self._node_ids(sorted_tasks),
+            "desc": "Tasks sorted by upward rank in descending order."
+        })
+
+        # Step 3: Schedule every task where it finishes earliest, filling idle slots
+        placements = PlacementTable(self.graph.num_nodes)
         processors = {i: 0 for i in range(1, self.num_processors + 1)}
-        schedule = []
-        task_start_times = {}
-
-        tasks = list(self.G.nodes)
-
-        for task in tasks:
-            est = 0
-            for pred in self.G.predecessors(task):
-                pred_end_time = task_start_times[pred] + self.G.nodes[pred]['weight']
-                if task_start_times[pred]['processor'] == processor:
-                    est = max(est, pred_end_time)
-                else:
-                    est = max(est, pred_end_time + self.G.edges[pred, task]['cost'])
-
-            best_processor = None
-            earliest_start_time = float('inf')
-            candidates = []
-
-            for processor, available_time in processors.items():
-                start_time = available_time
-
-                # Consider the communication cost
-                for predecessor in self.G.predecessors(task):
-                    predecessor_task = next((t for t in schedule if t['task'] == predecessor), None)
-                    if predecessor_task:
-                        if predecessor_task['processor'] == processor:
-                            start_time = max(start_time, predecessor_task['end_time'])
-                        else:
-                            start_time = max(start_time,
-                                             predecessor_task['end_time'] + self.G.edges[predecessor, task]['cost'])
-
-                end_time = start_time + self.G.nodes[task]['weight']
-                candidates.append({
-                    "processor": processor,
+        timelines = self._timelines(True)
+
+        for task in sorted_tasks:
+            if trace.finished:
+                break
+
+            candidates = None
+            if trace.wants_candidates:
+                candidates = self._processor_candidates(task, processors, placements, timelines, costs[task])
+                best = min(candidates, key=lambda candidate: candidate['end_time'])
+                best_processor, start_time = best['processor'], best['start_time']
+            else:
+                best_processor, start_time = self._earliest_finish(task, processors, placements, timelines,
+                                                                   costs[task])
+            end_time = start_time + costs[task][best_processor - 1]
+
+            self._occupy(processors, timelines, best_processor, start_time, end_time)
+            placements.place(task, best_processor, start_time, end_time)
+            trace.place(node_ids[task], best_processor, start_time, end_time)
+
+            yield from trace.add(lambda: {
+                "step": f"Schedule task {node_ids[task]} with upward rank {rank_u[task]}.",
+                "details": _with_candidates({
+                    "processor": best_processor,
+                    "node": node_ids[task],
                     "start_time": start_time,
-                    "end_time": end_time
-                })
-
-                if start_time < earliest_start_time:
-                    earliest_start_time = start_time
-                    best_processor = processor
-
-            processors[best_processor] = earliest_start_time + self.G.nodes[task]['weight']
-            schedule.append({
-                'task': task,
-                'processor': best_processor,
-                'start_time': earliest_start_time,
-                'end_time': earliest_start_time + self.G.nodes[task]['weight'],
-                'total_time': earliest_start_time + self.G.nodes[task]['weight'],
-                'candidates': candidates
+                    "end_time": end_time,
+                    "total_time": end_time
+                }, candidates),
+                "desc": f"Scheduled node {node_ids[task]} on processor {best_processor} from time {start_time} to {end_time}."
             })
 
-            task_start_times[task] = {
-                'processor': best_processor,
-                'start_time': earliest_start_time,
-                'end_time': earliest_start_time + self.G.nodes[task]['weight'],
-                'total_time': earliest_start_time + self.G.nodes[task]['weight'],
-                'candidates': candidates
-            }
+    def calculate_cpop_steps(self, detail="full", cursor=0, limit=None):
+        trace = self._trace(detail, cursor, limit)
+        return trace.collect(self._cpop_steps(trace))
+
+    def iter_cpop_steps(self, detail="full", cursor=0, limit=None):
+        trace = self._trace(detail, cursor, limit)
+        return trace.stream(self._cpop_steps(trace))
+
+    def _cpop_steps(self, trace):
+        node_ids = self.graph.node_ids
+        costs = self._computation_costs()
+
+        # Step 1: Calculate each task's priority, upward rank + downward rank
+        rank_u = self._upward_rank()
+        rank_d = self._downward_rank()
+        priority = [up + down for up, down in zip(rank_u, rank_d)]
+        yield from trace.add(lambda: {
+            "step": "Calculate priority (upward rank + downward rank) for each task.",
+            "details": {node_ids[node]: priority[node] for node in self.graph.topological_order()},
+            "desc": "Upward and downward ranks are the B-Level and T-Level computed with each task's mean cost."
+        })
+
+        # Step 2: Follow the critical path from the entry task with the highest
+        # priority and pick the processor that runs it fastest
+        in_degrees = self.graph.in_degrees()
+        entries = [node for node in self.graph.topological_order() if in_degrees[node] == 0]
+        critical_path = []
+        cp_length = 0
+        if entries:
+            node = max(entries, key=priority.__getitem__)
+            cp_length = priority[node]
+            while node is not None:
+                critical_path.append(node)
+                node = next((successor for successor in self.graph.successors(node)
+                             if math.isclose(priority[successor], cp_length, rel_tol=1e-9, abs_tol=1e-9)), None)
+        on_critical_path = set(critical_path)
+        cp_processor = min(range(1, self.num_processors + 1),
+                           key=lambda processor: sum(costs[node][processor - 1] for node in critical_path))
+        yield from trace.add(lambda: {
+            "step": "Identify the critical path and the processor that runs it fastest.",
+            "details": {"critical_path": self._node_ids(critical_path), "length": cp_length,
+                        "processor": cp_processor},
+            "desc": f"Critical path tasks are all scheduled on processor {cp_processor}."
+        })
 
-        return schedule
+        # Step 3: Schedule ready tasks by highest priority: critical path tasks
+        # on the critical path processor, the others where they finish earliest
+        placements = PlacementTable(self.graph.num_nodes)
+        processors = {i: 0 for i in range(1, self.num_processors + 1)}
+        timelines = self._timelines(True)
+        remaining = list(in_degrees)
+        ready = [(-priority[node], sequence, node) for sequence, node in enumerate(entries)]
+        heapq.heapify(ready)
+        sequence = len(ready)
+
+        while ready and not trace.finished:
+            _, _, task = heapq.heappop(ready)
+
+            candidates = None
+            if trace.wants_candidates:
+                candidates = self._processor_candidates(task, processors, placements, timelines, costs[task])
+            if task in on_critical_path:
+                best_processor = cp_processor
+                start_time = (candidates[cp_processor - 1]['start_time'] if candidates is not None else
+                              self._earliest_finish(task, {cp_processor: processors[cp_processor]},
+                                                    placements, timelines, costs[task])[1])
+            elif candidates is not None:
+                best = min(candidates, key=lambda candidate: candidate['end_time'])
+                best_processor, start_time = best['processor'], best['start_time']
+            else:
+                best_processor, start_time = self._earliest_finish(task, processors, placements, timelines,
+                                                                   costs[task])
+            end_time = start_time + costs[task][best_processor - 1]
+
+            self._occupy(processors, timelines, best_processor, start_time, end_time)
+            placements.place(task, best_processor, start_time, end_time)
+            trace.place(node_ids[task], best_processor, start_time, end_time)
+            for successor in self.graph.successors(task):
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    heapq.heappush(ready, (-priority[successor], sequence, successor))
+                    sequence += 1
+
+            yield from trace.add(lambda: {
+                "step": f"Schedule task {node_ids[task]} with priority {priority[task]}.",
+                "details": _with_candidates({
+                    "processor": best_processor,
+                    "node": node_ids[task],
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "total_time": end_time,
+                    "critical_path": task in on_critical_path
+                }, candidates),
+                "desc": f"Scheduled node {node_ids[task]} on processor {best_processor} from time {start_time} to {end_time}."
+            })
+
+    def calculate_processor_sweep(self, algorithm="hlfet", min_processors=1, max_processors=32, insertion=False):
+        # Makespan, speedup and efficiency on min_processors..max_processors
+        # processors. Speedup is over running every task on one processor (the
+        # sum of the weights). HLFET and MCP sort their priority list once and
+        # place it for every processor count together; ETF, DLS and insertion
+        # run the scheduler per count, sharing the attributes.
+        if algorithm not in ("hlfet", "mcp", "etf", "dls"):
+            raise ValueError("Invalid algorithm. Please provide one of: hlfet, mcp, etf, dls.")
+        if not 1 <= min_processors <= max_processors:
+            raise ValueError("Processor counts must satisfy 1 <= min_processors <= max_processors.")
+        if max_processors - min_processors >= MAX_SWEEP:
+            raise ValueError(f"A sweep covers at most {MAX_SWEEP} processor counts.")
+        if max_processors > MAX_PROCESSORS:
+            raise ValueError(f"max_processors must be at most {MAX_PROCESSORS}.")
+        processor_counts = list(range(min_processors, max_processors + 1))
+
+        with phase("schedule"):
+            if algorithm in ("hlfet", "mcp") and not insertion:
+                order = self._hlfet_order() if algorithm == "hlfet" else self._mcp_order()
+                makespans = sweep_makespans(self.graph, order, processor_counts)
+            else:
+                num_processors = self.num_processors
+                makespans = []
+                try:
+                    for count in processor_counts:
+                        self.num_processors = count
+                        makespans.append(getattr(self, f"calculate_{algorithm}_steps")(
+                            detail="schedule", insertion=insertion)['makespan'])
+                finally:
+                    self.num_processors = num_processors
+
+        sequential_time = self.graph.weights.sum().item()
+        curve = []
+        for count, makespan in zip(processor_counts, makespans):
+            speedup = sequential_time / makespan if makespan else 1.0
+            curve.append({
+                "num_processors": count,
+                "makespan": makespan,
+                "speedup": speedup,
+                "efficiency": speedup / count
+            })
+        return {"algorithm": algorithm, "insertion": insertion, "sequential_time": sequential_time, "curve": curve}
+
+    def _respects_edges(self, schedule):
+        # HLFET and MCP place a task even before a predecessor that ties it in
+        # priority (zero weights and costs); such a schedule is no upper bound
+        placed = {placement['node']: placement for placement in schedule}
+        node_ids = self.graph.node_ids
+        for node in range(self.graph.num_nodes):
+            target = placed[node_ids[node]]
+            for predecessor, cost in zip(*self.graph.in_edges(node)):
+                source = placed[node_ids[predecessor]]
+                if target['start_time'] < source['end_time'] + (0 if source['processor'] == target['processor']
+                                                                else cost):
+                    return False
+        return True
+
+    def brute_force_solution(self, time_limit=10.0, node_limit=1_000_000, workers=None):
+        # Optimal schedule by branch-and-bound, seeded with the best heuristic
+        # makespan and searched by up to `workers` processes (default: one per
+        # core). More workers than cores only split the search without running
+        # it faster, so there are never more. "optimal" is False when the
+        # budget ran out first; the schedule is then the best one found.
+        if workers is not None and workers < 1:
+            raise ValueError("Workers must be positive.")
+        cores = os.cpu_count() or 1
+        workers = cores if workers is None else min(workers, cores)
+        heuristics = {name: getattr(self, f"calculate_{name}_steps")(detail="schedule")
+                      for name in ("hlfet", "mcp", "etf", "dls")}
+        feasible = {name: self._respects_edges(result['schedule']) for name, result in heuristics.items()}
+        upper_bound, seed = float('inf'), None
+        seeds = [name for name in heuristics if feasible[name]]
+        if seeds:
+            best = min(seeds, key=lambda name: heuristics[name]['makespan'])
+            index = self.graph.index
+            upper_bound = heuristics[best]['makespan']
+            seed = [(index[placement['node']], placement['processor'] - 1, placement['start_time'],
+                     placement['end_time']) for placement in heuristics[best]['schedule']]
+
+        scheduler = BranchAndBoundScheduler(self.graph, self.num_processors, self._sl(),
+                                            upper_bound, seed, time_limit, node_limit)
+        with phase("exact_search"):
+            makespan, schedule, optimal = scheduler.solve(workers)
+        node_ids = self.graph.node_ids
+        return {
+            "makespan": makespan,
+            "optimal": optimal,
+            "lower_bound": makespan if optimal else scheduler.lower_bound(),
+            "explored": scheduler.explored,
+            "schedule": [{
+                "node": node_ids[node],
+                "processor": processor + 1,
+                "start_time": start_time,
+                "end_time": end_time
+            } for node, processor, start_time, end_time in sorted(schedule, key=lambda placement: placement[2])],
+            "heuristics": {
+                name: {
+                    "makespan": result['makespan'],
+                    "gap": (result['makespan'] - makespan) / makespan if makespan else 0.0,
+                    "feasible": feasible[name]
+                } for name, result in heuristics.items()
+            }
+        }
@@ -0,0 +1,142 @@
+# api/process_pool.py
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import orjson
+
+from .metrics import count_pool_event, merge_phases, phase, register_gauge, worker_phases
+from .priority_attributes_calculator import PriorityAttributesCalculator
+
+# Scheduling and attribute work runs in this pool, so that a huge graph only
+# holds one worker and never the event loop or the GIL of the server process.
+# Work that is cheaper to compute than to send runs on the request thread: a
+# graph smaller than POOL_MIN_NODES whose (V + E) * P is under POOL_MIN_WORK.
+# That product counts a schedule's candidate evaluations and also bounds the
+# size of a full step trace (a candidate per processor for every task, with
+# its predecessors), so dense graphs on many processors go to the pool.
+WORKERS = int(os.environ.get("PROCESS_POOL_WORKERS", os.cpu_count() or 1))
+# Tasks queued or running; further requests get a 503 instead of queueing
+MAX_PENDING = int(os.environ.get("PROCESS_POOL_MAX_PENDING", 4 * WORKERS))
+REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT", 60))
+POOL_MIN_NODES = int(os.environ.get("POOL_MIN_NODES", 200))
+POOL_MIN_WORK = int(os.environ.get("POOL_MIN_WORK", 20_000))
+
+_process_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+
+class PoolError(Exception):
+    status_code = 500
+
+
+class PoolBusy(PoolError):
+    status_code = 503
+
+
+class PoolTimeout(PoolError):
+    status_code = 504
+
+
+def get_process_pool():
+    # One pool per server process, created on first use
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=WORKERS)
+        return _process_pool
+
+
+def _discard_broken_pool():
+    # A worker died (out of memory, killed): the next task starts a new pool
+    global _process_pool
+    count_pool_event("broken")
+    with _pool_lock:
+        if _process_pool is not None and _process_pool._broken:
+            _process_pool = None
+
+
+def _task_done(future):
+    global _pending
+    with _pool_lock:
+        _pending -= 1
+
+
+def submit(fn, *args):
+    # Queues fn(*args) on the pool, or raises PoolBusy when MAX_PENDING tasks are
+    # already queued or running. A task counts until it finishes, even after its
+    # request timed out, since it still holds a worker.
+    global _pending
+    with _pool_lock:
+        if _pending >= MAX_PENDING:
+            count_pool_event("rejected")
+            raise PoolBusy(f"All {MAX_PENDING} scheduling slots are busy. Please retry later.")
+        _pending += 1
+    try:
+        try:
+            future = get_process_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            _discard_broken_pool()
+            future = get_process_pool().submit(fn, *args)
+    except BaseException:
+        _task_done(None)
+        raise
+    future.add_done_callback(_task_done)
+    return future
+
+
+def wait(future, timeout=REQUEST_TIMEOUT):
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        count_pool_event("timeout")
+        raise PoolTimeout(f"The computation did not finish within the {REQUEST_TIMEOUT:g} second request timeout.")
+    except BrokenProcessPool:
+        _discard_broken_pool()
+        raise PoolError("A worker process died while computing the result.")
+
+
+def encode(result):
+    # Same encoding as ORJSONResponse
+    with phase("encode"):
+        return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _calculate(json_data, method, args):
+    return encode(getattr(PriorityAttributesCalculator(json_data), method)(*args))
+
+
+def _calculate_in_worker(json_data, method, args):
+    with worker_phases() as record:
+        content = _calculate(json_data, method, args)
+    return content, record.phases, record.graphs
+
+
+def runs_inline(json_data, min_nodes=POOL_MIN_NODES):
+    if 'arrays' in json_data:
+        num_nodes, num_edges = len(json_data['arrays']['weights']), len(json_data['arrays']['sources'])
+    else:
+        num_nodes, num_edges = len(json_data['nodes']), len(json_data['edges'])
+    processors = json_data.get('num_processors') or 1
+    return num_nodes < min_nodes and (num_nodes + num_edges) * processors < POOL_MIN_WORK
+
+
+def run_calculation(json_data, method, *args, min_nodes=POOL_MIN_NODES):
+    # JSON bytes of PriorityAttributesCalculator(json_data).method(*args). The
+    # worker encodes the result itself, so the server only copies bytes.
+    # min_nodes=0 sends even small graphs to the pool (searches that run for seconds).
+    if runs_inline(json_data, min_nodes):
+        return _calculate(json_data, method, args)
+    future = submit(_calculate_in_worker, json_data, method, args)
+    with phase("pool"):
+        content, phases, graphs = wait(future)
+        merge_phases(phases, graphs)
+    return content
+
+
+register_gauge("process_pool_pending", "Tasks queued or running in the process pool.", lambda: _pending)
+register_gauge("process_pool_max_pending", "Tasks the process pool accepts before answering 503.",
+               lambda: MAX_PENDING)
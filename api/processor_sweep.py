@@ -0,0 +1,77 @@
+# api/processor_sweep.py
+import numpy as np
+
+
+def sweep_makespans(graph, order, processor_counts):
+    # Makespan of the list schedule of order (HLFET, MCP: earliest start on
+    # appending, first processor on ties) for every processor count in one pass.
+    #
+    # Row k of every array is the schedule on processor_counts[k] processors,
+    # and processors a row does not have are never available. A task's start
+    # time on every processor of every row is one broadcast: a predecessor
+    # counts with its end time on its own processor and with end time + edge
+    # cost on the others. Predecessors that are not placed yet (after the task
+    # in order) are ignored, as in the scheduler.
+    counts = np.asarray(processor_counts, dtype=np.int64)
+    rows = np.arange(len(counts))
+    processors = np.arange(counts.max())
+    weights = graph.weights
+    pred_ptr, pred_idx, pred_cost = graph.pred_ptr, graph.pred_idx, graph.pred_cost
+    dtype = np.result_type(weights, pred_cost)
+    never = np.inf if dtype.kind == 'f' else np.iinfo(dtype).max
+    # With integer weights and float costs the scheduler's times are ints until
+    # a cost takes part, so track which ones Python would hold as floats
+    track_floats = weights.dtype.kind == 'i' and pred_cost.dtype.kind == 'f'
+
+    available = np.zeros((len(counts), len(processors)), dtype=dtype)
+    available[processors[None, :] >= counts[:, None]] = never
+    available_float = np.zeros(available.shape, dtype=bool)
+    processor = np.zeros((len(counts), graph.num_nodes), dtype=np.int32)
+    end_time = np.zeros((len(counts), graph.num_nodes), dtype=dtype)
+    end_float = np.zeros(end_time.shape, dtype=bool)
+    placed = np.zeros(graph.num_nodes, dtype=bool)
+
+    for task in order:
+        predecessors = pred_idx[pred_ptr[task]:pred_ptr[task + 1]]
+        costs = pred_cost[pred_ptr[task]:pred_ptr[task + 1]]
+        is_placed = placed[predecessors]
+        start_float = available_float
+        if is_placed.any():
+            predecessors, costs = predecessors[is_placed], costs[is_placed]
+            pred_end = end_time[:, predecessors]
+            same_processor = processor[:, predecessors, None] == processors
+            ready = np.where(same_processor, pred_end[:, :, None], (pred_end + costs)[:, :, None])
+            if track_floats:
+                # The scheduler's max() over available time, then the predecessors
+                # in edge order keeps the first of equal values
+                candidates = np.concatenate([available[:, None, :], ready], axis=1)
+                first = candidates.argmax(axis=1)[:, None, :]
+                start_time = np.take_along_axis(candidates, first, axis=1)[:, 0, :]
+                candidate_floats = np.concatenate(
+                    [available_float[:, None, :], ~same_processor | end_float[:, predecessors, None]], axis=1)
+                start_float = np.take_along_axis(candidate_floats, first, axis=1)[:, 0, :]
+            else:
+                start_time = np.maximum(available, ready.max(axis=1))
+        else:
+            start_time = available
+        best = start_time.argmin(axis=1)
+        end = start_time[rows, best] + weights[task]
+        end_float[:, task] = start_float[rows, best]
+        available[rows, best] = end
+        available_float[rows, best] = end_float[:, task]
+        processor[:, task] = best
+        end_time[:, task] = end
+        placed[task] = True
+
+    if graph.num_nodes == 0:
+        return [0] * len(counts)
+    # The first end time in order that reaches the makespan is the one
+    # returned, and a makespan of 0 stays the scheduler's initial int
+    ends = end_time[:, order]
+    last = ends.argmax(axis=1)
+    makespans = ends[rows, last].tolist()
+    if dtype.kind == 'f':
+        is_float = end_float[:, order][rows, last] if track_floats else np.ones(len(counts), dtype=bool)
+        makespans = [makespan if is_float[row] and makespan else int(makespan)
+                     for row, makespan in enumerate(makespans)]
+    return makespans
@@ -0,0 +1,120 @@
+# api/processor_timeline.py
+import random
+
+
+class ProcessorTimeline:
+    # Idle gaps of one processor, for insertion-based scheduling.
+    #
+    # Busy intervals never overlap, so the idle time before end_time is a
+    # sequence of gaps sorted by start: one before the first interval (from 0)
+    # and one between every two neighbouring intervals, of length 0 when they
+    # touch (a zero-length task still fits there). The gaps are the nodes of a
+    # treap in that order, and every node keeps the longest gap of its subtree:
+    #   - earliest_start finds the gap ready_time falls in (the last one
+    #     starting at or before it) and otherwise descends to the first later
+    #     gap that is long enough, skipping every subtree whose longest gap is
+    #     too short
+    #   - insert splits the gap a task goes into, or adds the gap between the
+    #     old end and a task appended after it
+    # Both take O(log n) expected time for n intervals.
+    def __init__(self):
+        # Node 0 is the empty subtree
+        self._start = [0]
+        self._end = [0]
+        self._left = [0]
+        self._right = [0]
+        self._priority = [0.0]
+        self._longest = [-1]
+        self._root = 0
+        self.end_time = 0
+
+    def earliest_start(self, ready_time, duration):
+        # Earliest start >= ready_time of an idle slot at least duration long
+        if ready_time >= self.end_time or self._longest[self._root] < duration:
+            return max(ready_time, self.end_time)
+
+        start, end, left, right = self._start, self._end, self._left, self._right
+        node, gap = self._root, 0
+        while node:
+            if start[node] <= ready_time:
+                gap, node = node, right[node]
+            else:
+                node = left[node]
+        if ready_time + duration <= end[gap]:
+            return ready_time
+
+        later = self._first_fit(self._root, ready_time, duration)
+        return start[later] if later else self.end_time
+
+    def _first_fit(self, node, ready_time, duration):
+        # First gap in node's subtree starting after ready_time that is at least duration long
+        if not node or self._longest[node] < duration:
+            return 0
+        if self._start[node] <= ready_time:
+            return self._first_fit(self._right[node], ready_time, duration)
+        found = self._first_fit(self._left[node], ready_time, duration)
+        if found:
+            return found
+        if self._end[node] - self._start[node] >= duration:
+            return node
+        return self._first_fit(self._right[node], ready_time, duration)
+
+    def insert(self, start_time, end_time):
+        if start_time >= self.end_time:
+            self._root = self._merge(self._root, self._new_gap(self.end_time, start_time))
+            self.end_time = end_time
+            return
+
+        # The task fills part of the last gap starting at or before it
+        before, after = self._split(self._root, start_time)
+        before, gap = self._pop_last(before)
+        gap_end = self._end[gap]
+        self._end[gap] = start_time
+        self._update(gap)
+        self._root = self._merge(self._merge(before, gap),
+                                 self._merge(self._new_gap(end_time, gap_end), after))
+
+    def _new_gap(self, start_time, end_time):
+        self._start.append(start_time)
+        self._end.append(end_time)
+        self._left.append(0)
+        self._right.append(0)
+        self._priority.append(random.random())
+        self._longest.append(end_time - start_time)
+        return len(self._start) - 1
+
+    def _update(self, node):
+        self._longest[node] = max(self._end[node] - self._start[node],
+                                  self._longest[self._left[node]], self._longest[self._right[node]])
+
+    def _split(self, node, start_time):
+        # (gaps starting at or before start_time, gaps starting after it)
+        if not node:
+            return 0, 0
+        if self._start[node] <= start_time:
+            self._right[node], after = self._split(self._right[node], start_time)
+            self._update(node)
+            return node, after
+        before, self._left[node] = self._split(self._left[node], start_time)
+        self._update(node)
+        return before, node
+
+    def _merge(self, first, second):
+        if not first or not second:
+            return first or second
+        if self._priority[first] > self._priority[second]:
+            self._right[first] = self._merge(self._right[first], second)
+            self._update(first)
+            return first
+        self._left[second] = self._merge(first, self._left[second])
+        self._update(second)
+        return second
+
+    def _pop_last(self, node):
+        # (node's subtree without its last gap, that gap on its own)
+        if not self._right[node]:
+            rest, self._left[node] = self._left[node], 0
+            return rest, node
+        self._right[node], last = self._pop_last(self._right[node])
+        self._update(node)
+        return node, last
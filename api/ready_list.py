@@ -0,0 +1,240 @@
+# api/ready_list.py
+import heapq
+
+
+class ReadyList:
+    # Incremental ready list for the dynamic list schedulers (ETF, DLS).
+    #
+    # A node becomes ready when its last predecessor is placed (in-degree
+    # counters). From then on its data-ready time on every processor is fixed,
+    # so its earliest start on processor p is max(available time of p,
+    # data-ready time on p) and only changes when p itself changes.
+    #
+    # Every processor keeps two heaps of ready nodes:
+    #   waiting   - data arrives after the processor is free; start = data-ready
+    #               time, which never changes
+    #   available - data is already there; start = processor available time,
+    #               shared by all of them, so the order within the heap is fixed
+    # When a processor's available time grows, waiting nodes whose data has
+    # arrived move to its available heap. Each (node, processor) pair moves at
+    # most once, and nodes that are already scheduled are dropped lazily.
+    #
+    # priority(node, start_time) returns the key to minimise; ties are broken
+    # by ready order and then processor, like a scan over the ready list. It
+    # must order nodes with the same start time the same way for any start
+    # time (true for ETF's (start, -SL) and DLS's start - SL).
+    #
+    # With timelines (insertion-based scheduling) a node starts in the earliest
+    # idle slot on p that fits it. Nodes that fit no idle gap start at the end
+    # of p, exactly as above, and stay in those heaps. The few that fit a gap
+    # move to a third heap, keyed by their slot start:
+    #   - appending a task to p opens the gap between the old end and its
+    #     start; fits_early (keyed by weight, data already there) and
+    #     fits_late (keyed by data-ready time + weight) find the tail nodes
+    #     that fit it
+    #   - inserting a task into a gap only re-keys the gap nodes whose slot it
+    #     overlaps; a node whose new slot is the end goes back to the tail
+    #
+    # kernel (a PlacementKernel) computes a new node's data-ready times on all
+    # processors in one broadcast instead of the loop over processors.
+    def __init__(self, graph, placements, processors, priority, timelines=None, kernel=None):
+        self.graph = graph
+        self.placements = placements
+        self.processors = processors
+        self.priority = priority
+        self.timelines = timelines
+        self.kernel = kernel
+        self.weights = graph.weight_list()
+        self.remaining = graph.in_degrees()
+        self.ready = {}
+        self.sequence = {}
+        self.data_ready = {}
+        self.arrivals = {processor: [] for processor in processors}
+        self.waiting = {processor: [] for processor in processors}
+        self.available = {processor: [] for processor in processors}
+        # Insertion only: node -> {processor: slot start} for the nodes that fit an idle gap
+        self.gap_start = {}
+        self.gap_nodes = {processor: set() for processor in processors}
+        self.slots = {processor: [] for processor in processors}
+        self.fits_early = {processor: [] for processor in processors}
+        self.fits_late = {processor: [] for processor in processors}
+
+        for node in range(graph.num_nodes):
+            if self.remaining[node] == 0:
+                self._add(node)
+
+    def __bool__(self):
+        return bool(self.ready)
+
+    def _add(self, node):
+        self.sequence[node] = len(self.sequence)
+        self.ready[node] = None
+        self.gap_start[node] = {}
+
+        predecessors, costs = self.graph.in_edges(node)
+        pred_processors = [self.placements.processor[predecessor] for predecessor in predecessors]
+        pred_end_times = [self.placements.end_time[predecessor] for predecessor in predecessors]
+
+        data_ready = self.data_ready[node] = {}
+        if self.kernel is not None:
+            ready_times = self.kernel.data_ready(list(zip(pred_processors, pred_end_times, costs))).tolist()
+        for processor in self.processors:
+            if self.kernel is not None:
+                ready_time = ready_times[processor - 1]
+            else:
+                ready_time = 0
+                for pred_processor, pred_end_time, cost in zip(pred_processors, pred_end_times, costs):
+                    if pred_processor == processor:
+                        ready_time = max(ready_time, pred_end_time)
+                    else:
+                        ready_time = max(ready_time, pred_end_time + cost)
+            data_ready[processor] = ready_time
+
+            if self.timelines is not None:
+                timeline = self.timelines[processor]
+                start_time = timeline.earliest_start(ready_time, self.weights[node])
+                if start_time < timeline.end_time:
+                    self._push_gap(node, processor, start_time)
+                    continue
+            self._push_tail(node, processor)
+
+    def _push_tail(self, node, processor):
+        sequence = self.sequence[node]
+        ready_time = self.data_ready[node][processor]
+        if ready_time > self.processors[processor]:
+            heapq.heappush(self.arrivals[processor], (ready_time, sequence, node))
+            heapq.heappush(self.waiting[processor], self.priority(node, ready_time) + (sequence, node))
+            if self.timelines is not None:
+                heapq.heappush(self.fits_late[processor], (ready_time + self.weights[node], sequence, node))
+        else:
+            heapq.heappush(self.available[processor], self.priority(node, 0) + (sequence, node))
+            if self.timelines is not None:
+                heapq.heappush(self.fits_early[processor], (self.weights[node], sequence, node))
+
+    def _push_gap(self, node, processor, start_time):
+        self.gap_start[node][processor] = start_time
+        self.gap_nodes[processor].add(node)
+        heapq.heappush(self.slots[processor],
+                       self.priority(node, start_time) + (self.sequence[node], start_time, node))
+
+    def _on_tail(self, node, processor):
+        return node in self.ready and processor not in self.gap_start[node]
+
+    def start_time(self, node, processor):
+        gap_start = self.gap_start[node]
+        if processor in gap_start:
+            return gap_start[processor]
+        return max(self.processors[processor], self.data_ready[node][processor])
+
+    def _best_slot_on(self, processor):
+        # Heap entries are dropped lazily once their node is scheduled or re-keyed
+        slots = self.slots[processor]
+        while slots and (slots[0][-1] not in self.ready or
+                         self.gap_start[slots[0][-1]].get(processor) != slots[0][-2]):
+            heapq.heappop(slots)
+        if not slots:
+            return None
+        return slots[0][:-2] + (processor,), slots[0][-1], slots[0][-2]
+
+    def _best_on(self, processor):
+        # Best (key, node, start_time) on one processor, or None
+        available_time = self.processors[processor]
+
+        available = self.available[processor]
+        while available and not self._on_tail(available[0][-1], processor):
+            heapq.heappop(available)
+        waiting = self.waiting[processor]
+        while waiting and (not self._on_tail(waiting[0][-1], processor) or
+                           self.data_ready[waiting[0][-1]][processor] <= available_time):
+            heapq.heappop(waiting)
+
+        best = None
+        if available:
+            node = available[0][-1]
+            best = (self.priority(node, available_time) + (available[0][-2], processor), node, available_time)
+        if waiting:
+            node = waiting[0][-1]
+            key = waiting[0][:-1] + (processor,)
+            if best is None or key < best[0]:
+                best = (key, node, self.data_ready[node][processor])
+        if self.timelines is not None:
+            slot = self._best_slot_on(processor)
+            if slot is not None and (best is None or slot[0] < best[0]):
+                best = slot
+        return best
+
+    def peek(self):
+        # Best (node, processor, start_time) under the priority, without removing it.
+        best = None
+        for processor in self.processors:
+            candidate = self._best_on(processor)
+            if candidate is not None and (best is None or candidate[0] < best[0]):
+                best = candidate + (processor,)
+        if best is None:
+            return None
+        _, node, start_time, processor = best
+        return node, processor, start_time
+
+    def schedule(self, node, processor, start_time, end_time):
+        self.placements.place(node, processor, start_time, end_time)
+        del self.ready[node]
+        for gap_processor in self.gap_start[node]:
+            self.gap_nodes[gap_processor].discard(node)
+        if self.timelines is not None:
+            self._insert(processor, start_time, end_time)
+        else:
+            self._append(processor, end_time)
+
+        for successor in self.graph.successors(node):
+            self.remaining[successor] -= 1
+            if self.remaining[successor] == 0:
+                self._add(successor)
+
+    def _insert(self, processor, start_time, end_time):
+        timeline = self.timelines[processor]
+        previous_end = timeline.end_time
+        timeline.insert(start_time, end_time)
+        if start_time >= previous_end:
+            self._fill_gap(processor, previous_end, start_time)
+            self._append(processor, end_time)
+            return
+
+        # Only slots that overlap the new task have moved, and only later: gaps
+        # never grow, so the search restarts from the old slot
+        for ready_node in list(self.gap_nodes[processor]):
+            slot_start = self.gap_start[ready_node][processor]
+            if slot_start < end_time and slot_start + self.weights[ready_node] >= start_time:
+                slot_start = timeline.earliest_start(slot_start, self.weights[ready_node])
+                if slot_start < timeline.end_time:
+                    self._push_gap(ready_node, processor, slot_start)
+                else:
+                    del self.gap_start[ready_node][processor]
+                    self.gap_nodes[processor].discard(ready_node)
+                    self._push_tail(ready_node, processor)
+
+    def _fill_gap(self, processor, gap_start, gap_end):
+        # Tail nodes that fit the idle gap [gap_start, gap_end) just opened on processor
+        fits_early = self.fits_early[processor]
+        while fits_early and fits_early[0][0] <= gap_end - gap_start:
+            _, _, ready_node = heapq.heappop(fits_early)
+            if self._on_tail(ready_node, processor):
+                self._push_gap(ready_node, processor, gap_start)
+        fits_late = self.fits_late[processor]
+        while fits_late and fits_late[0][0] <= gap_end:
+            _, _, ready_node = heapq.heappop(fits_late)
+            ready_time = self.data_ready[ready_node][processor]
+            # Nodes whose data was already there are in fits_early
+            if self._on_tail(ready_node, processor) and ready_time > gap_start:
+                self._push_gap(ready_node, processor, ready_time)
+
+    def _append(self, processor, end_time):
+        self.processors[processor] = end_time
+
+        # Only the processor that just changed can have nodes whose data is now there
+        arrivals = self.arrivals[processor]
+        while arrivals and arrivals[0][0] <= end_time:
+            _, sequence, ready_node = heapq.heappop(arrivals)
+            if self._on_tail(ready_node, processor):
+                heapq.heappush(self.available[processor], self.priority(ready_node, 0) + (sequence, ready_node))
+                if self.timelines is not None:
+                    heapq.heappush(self.fits_early[processor], (self.weights[ready_node], sequence, ready_node))
@@ -0,0 +1,123 @@
+# api/result_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import orjson
+
+
+def graph_key(json_data, endpoint):
+    # Canonical hash of (nodes, edges, processors, endpoint). Dict keys are
+    # sorted, list order is kept because it decides the schedulers' tie-breaks.
+    if 'graph_id' in json_data:
+        # a graph from the graph store, already identified by its content hash
+        graph = {"graph_id": json_data['graph_id']}
+    elif 'arrays' in json_data:
+        # binary upload: a digest of every array stands in for nodes and edges
+        graph = {name: [str(array.dtype), hashlib.sha256(np.ascontiguousarray(array)).hexdigest()]
+                 for name, array in json_data['arrays'].items()}
+    else:
+        graph = {"nodes": json_data['nodes'], "edges": json_data['edges']}
+    payload = {
+        **graph,
+        "num_processors": json_data.get('num_processors'),
+        "processor_speeds": json_data.get('processor_speeds'),
+        "computation_costs": json_data.get('computation_costs'),
+        "endpoint": endpoint
+    }
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ResultCache:
+    # LRU cache of endpoint results (encoded response bodies), bounded by entry
+    # count and by their total size. A body larger than max_bytes is returned
+    # but not kept. Concurrent requests for a key that is still being computed
+    # wait for that computation instead of repeating it.
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        else:
+            size = len(flight.result)
+            if size <= self.max_bytes:
+                with self._lock:
+                    self._entries[key] = flight.result
+                    self.bytes += size
+                    while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                        self.bytes -= len(self._entries.popitem(last=False)[1])
+            return flight.result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.deduplicated
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "deduplicated": self.deduplicated,
+                "hit_rate": (self.hits + self.deduplicated) / lookups if lookups else 0.0
+            }
+
+
+result_cache = ResultCache(int(os.environ.get("RESULT_CACHE_SIZE", 128)),
+                           int(os.environ.get("RESULT_CACHE_BYTES", 256 * 2 ** 20)))
+
+
+def cached_call(graph_data, endpoint, compute):
+    # Runs compute(json_data) once per distinct (graph, endpoint). dict() is a
+    # shallow view of the request model; .dict() would deep-copy every node and edge.
+    json_data = dict(graph_data)
+    return result_cache.get_or_compute(graph_key(json_data, endpoint), lambda: compute(json_data))
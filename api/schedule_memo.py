@@ -0,0 +1,57 @@
+# api/schedule_memo.py
+
+
+class ScheduleMemo:
+    # A list scheduler's previous run on a session graph (HLFET, MCP).
+    #
+    # A task's placement only depends on the tasks before it in the priority
+    # list, its weight and its incoming edges. After an edit the next run
+    # replays the placements and steps of the leading tasks that are unchanged
+    # (same task at that position, same priority, no edit to its weight or
+    # incoming edges) and schedules from the first one that is not.
+    def __init__(self):
+        self.order = []
+        self.priorities = []
+        self.placements = None
+        self.steps = []
+        self.dirty = set()
+        self.reuse = 0
+        self._previous = None
+
+    def touch(self, node):
+        # node's weight or incoming edges changed
+        self.dirty.add(node)
+
+    def start(self, order, priority, placements):
+        # Called with the new run's priority list and placement table; returns
+        # how many of its leading tasks are replayed
+        reuse = 0
+        for old, new in zip(self.order, order):
+            previous = self.priorities[reuse]
+            # the priority is printed in the step, so 0 and 0.0 differ
+            if (old != new or new in self.dirty or previous != priority[new] or
+                    type(previous) is not type(priority[new])):
+                break
+            reuse += 1
+        self.reuse = reuse
+        self._previous = self.placements, self.steps
+        self.order = order
+        self.priorities = [priority[task] for task in order]
+        self.placements = placements
+        self.steps = []
+        self.dirty = set()
+        return reuse
+
+    def placement(self, task):
+        # (processor, start time) of a replayed task
+        placements = self._previous[0]
+        return placements.processor[task], placements.start_time[task]
+
+    def keep(self, position, build_step):
+        # Step builder for trace.add: the previous run's step for a replayed
+        # task, and every step is kept for the next run
+        def build():
+            step = self._previous[1][position] if position < self.reuse else build_step()
+            self.steps.append(step)
+            return step
+        return build
@@ -0,0 +1,108 @@
+# api/sessions.py
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from api.graph_session import SessionNotFound, sessions
+from api.priority_attributes_calculator import MAX_PROCESSORS
+from api.timed_route import ORJSONResponse, TimedRoute
+
+router = APIRouter(default_response_class=ORJSONResponse, route_class=TimedRoute)
+
+# A session holds one graph on this server process: create it once, send small
+# edits, and read properties or schedules of the current graph. Only the values
+# an edit affects are recomputed. Sessions run on the request thread, not the
+# process pool, since the state lives here.
+#
+# Edits, applied in order:
+#   {"op": "add_node", "id": ..., "weight": ...}       {"op": "remove_node", "id": ...}
+#   {"op": "set_weight", "id": ..., "weight": ...}
+#   {"op": "add_edge", "source": ..., "target": ..., "cost": ...}
+#   {"op": "remove_edge", "source": ..., "target": ...}
+#   {"op": "set_cost", "source": ..., "target": ..., "cost": ...}
+DetailLevel = Literal["schedule", "steps", "full"]
+
+
+class SessionData(BaseModel):
+    num_processors: int = Field(ge=1, le=MAX_PROCESSORS)
+    nodes: list
+    edges: list
+    processor_speeds: Optional[List[float]] = None
+    computation_costs: Optional[Dict[str, List[float]]] = None
+
+
+class EditData(BaseModel):
+    edits: list
+
+
+def _session(session_id):
+    try:
+        return sessions.get(session_id)
+    except SessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def _summary(session_id, session):
+    return {
+        "session_id": session_id,
+        "version": session.version,
+        "num_nodes": session.graph.num_nodes,
+        "num_edges": session.graph.num_edges
+    }
+
+
+@router.post("")
+def create_session(session_data: SessionData):
+    try:
+        session_id, session = sessions.create(dict(session_data))
+        return _summary(session_id, session)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{session_id}/edits")
+def edit_session(session_id: str, edit_data: EditData):
+    session = _session(session_id)
+    try:
+        with session.lock:
+            recomputed = session.apply(edit_data.edits)
+            return dict(_summary(session_id, session), recomputed=recomputed)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{session_id}/graph")
+def session_graph(session_id: str):
+    session = _session(session_id)
+    with session.lock:
+        return session.to_json()
+
+
+@router.get("/{session_id}/properties")
+def session_properties(session_id: str, attribute: Optional[str] = None):
+    session = _session(session_id)
+    try:
+        with session.lock:
+            return session.properties(attribute)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{session_id}/{algorithm}-steps")
+def session_steps(session_id: str, algorithm: str, detail: DetailLevel = "full", cursor: int = 0,
+                  limit: Optional[int] = None, insertion: bool = False):
+    session = _session(session_id)
+    try:
+        with session.lock:
+            return session.run(algorithm, detail, cursor, limit, insertion)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/{session_id}")
+def close_session(session_id: str):
+    try:
+        sessions.close(session_id)
+    except SessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"session_id": session_id, "closed": True}
@@ -0,0 +1,82 @@
+# api/step_trace.py
+from .metrics import phase
+
+DETAIL_LEVELS = ("schedule", "steps", "full")
+
+
+class StepTrace:
+    # Collects a scheduler's output at the requested level of detail:
+    #   schedule - final placements and makespan only
+    #   steps    - every step, without per-processor candidates
+    #   full     - every step with candidates and predecessor details
+    # With a cursor/limit only the steps in [cursor, cursor + limit) are built,
+    # and the scheduler can stop once it is past that window.
+    def __init__(self, detail, total, cursor=0, limit=None):
+        if detail not in DETAIL_LEVELS:
+            raise ValueError(f"Invalid detail level. Please provide one of: {', '.join(DETAIL_LEVELS)}.")
+        if cursor < 0 or cursor > total:
+            raise ValueError(f"Cursor must be between 0 and {total}.")
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be positive.")
+        self.detail = detail
+        self.total = total
+        self.cursor = cursor
+        self.limit = limit
+        self.stop = total if limit is None else min(total, cursor + limit)
+        self.index = 0
+        self.schedule = []
+        self.makespan = 0
+
+    @property
+    def in_window(self):
+        return self.detail != "schedule" and self.cursor <= self.index < self.stop
+
+    @property
+    def wants_candidates(self):
+        return self.detail == "full" and self.in_window
+
+    @property
+    def finished(self):
+        return self.detail != "schedule" and self.index >= self.stop
+
+    def add(self, build_step):
+        # Schedulers `yield from trace.add(...)`: build_step is only called, and
+        # the step only emitted, when the client asked for it
+        in_window = self.in_window
+        self.index += 1
+        return (build_step(),) if in_window else ()
+
+    def place(self, node, processor, start_time, end_time):
+        if self.detail == "schedule":
+            self.schedule.append({
+                "node": node,
+                "processor": processor,
+                "start_time": start_time,
+                "end_time": end_time
+            })
+            self.makespan = max(self.makespan, end_time)
+
+    def collect(self, steps):
+        # Whole response: the step list, a page of it, or the schedule
+        with phase("schedule"):
+            steps = list(steps)
+        if self.detail == "schedule":
+            return {"schedule": self.schedule, "makespan": self.makespan}
+        return self.page(steps)
+
+    def page(self, steps):
+        # Response for the steps in [cursor, stop)
+        if self.cursor == 0 and self.limit is None:
+            return steps
+        return {
+            "steps": steps,
+            "cursor": self.cursor,
+            "next_cursor": self.stop if self.stop < self.total else None,
+            "total": self.total
+        }
+
+    def stream(self, steps):
+        # Steps one at a time; the schedule detail level ends with the schedule
+        yield from steps
+        if self.detail == "schedule":
+            yield {"schedule": self.schedule, "makespan": self.makespan}
@@ -0,0 +1,49 @@
+# api/streaming.py
+import itertools
+import os
+import threading
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+from .priority_attributes_calculator import PriorityAttributesCalculator
+from .process_pool import WORKERS, PoolBusy, runs_inline
+
+# Streams too large to compute inline still run as generators, so steps go
+# out as they are computed and memory stays constant, but at most MAX_STREAMS
+# of them at a time. Further ones get a 503 like a full process pool.
+MAX_STREAMS = int(os.environ.get("MAX_STREAMS", WORKERS))
+
+_stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+
+def ndjson_response(steps):
+    # One JSON document per line, written as the generator produces them. The
+    # first step is pulled before the response starts, so errors raised while
+    # setting up (unknown nodes, cycles) still reach the route's 400 handler.
+    steps = iter(steps)
+    first = list(itertools.islice(steps, 1))
+    lines = (orjson.dumps(step, option=orjson.OPT_NON_STR_KEYS) + b"\n" for step in itertools.chain(first, steps))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+def _holding_slot(steps):
+    # Releases the stream slot when the steps run out, fail or the client goes away
+    try:
+        yield from steps
+    finally:
+        _stream_slots.release()
+
+
+def stream_calculation(json_data, method, *args):
+    # NDJSON of the steps PriorityAttributesCalculator(json_data).method(*args) yields
+    if runs_inline(json_data):
+        return ndjson_response(getattr(PriorityAttributesCalculator(json_data), method)(*args))
+    if not _stream_slots.acquire(blocking=False):
+        raise PoolBusy(f"All {MAX_STREAMS} streaming slots are busy. Please retry later.")
+    try:
+        steps = getattr(PriorityAttributesCalculator(json_data), method)(*args)
+    except BaseException:
+        _stream_slots.release()
+        raise
+    return ndjson_response(_holding_slot(steps))
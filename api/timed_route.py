@@ -0,0 +1,82 @@
+# api/timed_route.py
+import asyncio
+import time
+
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse as _ORJSONResponse, Response
+from fastapi.routing import APIRoute
+
+from .metrics import body_decoded, endpoint_entered, phase, start_profiler, stop_profiler, timed_request
+
+
+class ORJSONResponse(_ORJSONResponse):
+    # Times the encoding of the response body
+    def render(self, content):
+        with phase("encode"):
+            return super().render(content)
+
+
+class EncodedJSONResponse(Response):
+    # Body already encoded to JSON bytes (by run_calculation or the result cache)
+    media_type = "application/json"
+
+
+def _timed_call(call, endpoint):
+    # The endpoint function's own time is the "route" phase
+    if asyncio.iscoroutinefunction(call):
+        async def timed_call(**values):
+            endpoint_entered()
+            with phase("route"):
+                return await call(**values)
+        return timed_call
+
+    def timed_call(**values):
+        # Sync endpoints run alone on a worker thread, so cProfile only sees this request
+        endpoint_entered()
+        profiler = start_profiler()
+        start = time.perf_counter()
+        try:
+            with phase("route"):
+                return call(**values)
+        finally:
+            if profiler is not None:
+                stop_profiler(profiler, endpoint, time.perf_counter() - start)
+    return timed_call
+
+
+class TimedRoute(APIRoute):
+    # Route class of the API routers: every request is timed per endpoint and
+    # split into phases. Streamed responses are timed until their first step.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dependant.call = _timed_call(self.dependant.call, self.path_format)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        endpoint = self.path_format
+
+        async def timed_handler(request):
+            with timed_request(endpoint) as record:
+                try:
+                    # FastAPI reuses the body and the decoded JSON cached on the request
+                    with phase("read_body"):
+                        body = await request.body()
+                    if body and request.headers.get("content-type", "").startswith("application/json"):
+                        with phase("decode_json"):
+                            try:
+                                await request.json()
+                            except ValueError:
+                                pass  # FastAPI answers malformed JSON itself
+                    body_decoded()
+                    response = await handler(request)
+                    record.status = response.status_code
+                    return response
+                except RequestValidationError:
+                    record.status = 422
+                    raise
+                except Exception as e:
+                    # HTTPException and the process pool's errors carry their status
+                    record.status = getattr(e, "status_code", 500)
+                    raise
+
+        return timed_handler
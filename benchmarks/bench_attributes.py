@@ -0,0 +1,36 @@
+# benchmarks/bench_attributes.py
+# Times obtain_attribute_dict with the LevelEngine and with the pure-Python
+# reference loops, and checks that both give the same values.
+#
+#   python -m benchmarks.bench_attributes --sizes 1000 10000 50000
+import argparse
+import time
+
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from benchmarks.generators import layered_dag
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'V':>8}{'E':>8}{'reference':>12}{'vectorized':>12}{'speedup':>10}")
+    for size in args.sizes:
+        graph = layered_dag(size)
+        timings = {}
+        results = {}
+        for vectorized in [False, True]:
+            calculator = PriorityAttributesCalculator(graph, vectorized=vectorized)
+            calculator.graph.topological_order()
+            start = time.perf_counter()
+            results[vectorized] = calculator.obtain_attribute_dict()
+            timings[vectorized] = time.perf_counter() - start
+        if results[False] != results[True]:
+            raise SystemExit("LevelEngine disagrees with the reference implementation")
+        print(f"{size:>8}{len(graph['edges']):>8}{timings[False]:>12.3f}{timings[True]:>12.3f}"
+              f"{timings[False] / timings[True]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_graph_build.py
+# Build time and retained memory of the networkx graph vs the compact CSR graph,
+# from JSON rows or from the .npy arrays of a binary upload (/npy/...).
+#
+#   python -m benchmarks.bench_graph_build --sizes 10000 35000
+import argparse
+import io
+import time
+import tracemalloc
+
+import numpy as np
+
+from api.graph_from_json import GraphGivenJSON
+from api.graph_from_npy import load_npy, parse_arrays
+from benchmarks.generators import layered_dag
+
+
+def npy_files(graph):
+    # The upload of graph: one .npy file per array
+    index = {node['id']: i for i, node in enumerate(graph['nodes'])}
+    arrays = {
+        "weights": np.array([node['weight'] for node in graph['nodes']], dtype=np.int64),
+        "sources": np.array([index[edge['source']] for edge in graph['edges']], dtype=np.int32),
+        "targets": np.array([index[edge['target']] for edge in graph['edges']], dtype=np.int32),
+        "costs": np.array([edge['cost'] for edge in graph['edges']], dtype=np.int64),
+    }
+    files = {}
+    for name, array in arrays.items():
+        buffer = io.BytesIO()
+        np.save(buffer, array)
+        files[name] = buffer.getvalue()
+    return files
+
+
+def parse_npy(files):
+    return parse_arrays({name: load_npy(buffer, name) for name, buffer in files.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 35000])
+    args = parser.parse_args()
+
+    print(f"{'parser':<16}{'V':>8}{'E':>8}{'seconds':>10}{'MB':>8}")
+    for size in args.sizes:
+        graph = layered_dag(size)
+        files = npy_files(graph)
+        parsers = {
+            "parse_json": lambda: GraphGivenJSON(graph).parse_json(),
+            "parse_compact": lambda: GraphGivenJSON(graph).parse_compact(),
+            "parse_npy": lambda: parse_npy(files),
+        }
+        for parser_name, parse in parsers.items():
+            tracemalloc.start()
+            start = time.perf_counter()
+            parsed = parse()
+            elapsed = time.perf_counter() - start
+            retained, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del parsed
+            print(f"{parser_name:<16}{size:>8}{len(graph['edges']):>8}{elapsed:>10.3f}{retained / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
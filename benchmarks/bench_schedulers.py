@@ -0,0 +1,39 @@
+# benchmarks/bench_schedulers.py
+# Times the list schedulers on growing layered DAGs. With O(1) placement lookups
+# the time per (edge x processor) should stay roughly flat as V grows.
+#
+#   python -m benchmarks.bench_schedulers --sizes 500 1000 2000 4000 --processors 4
+#   python -m benchmarks.bench_schedulers --sizes 4000 --levels 3 --schedulers calculate_etf_steps
+#   python -m benchmarks.bench_schedulers --insertion
+import argparse
+import time
+
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from benchmarks.generators import layered_dag
+
+SCHEDULERS = ["calculate_hlfet_steps", "calculate_mcp_steps", "calculate_etf_steps", "calculate_dls_steps"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--processors", type=int, default=4)
+    parser.add_argument("--levels", type=int, default=None, help="few levels give wide graphs with large ready lists")
+    parser.add_argument("--schedulers", nargs="+", default=SCHEDULERS)
+    parser.add_argument("--insertion", action="store_true", help="fill idle gaps instead of appending")
+    args = parser.parse_args()
+
+    print(f"{'scheduler':<24}{'V':>8}{'E':>8}{'seconds':>10}{'us/(E*P)':>12}")
+    for scheduler in args.schedulers:
+        for size in args.sizes:
+            graph = layered_dag(size, num_levels=args.levels, num_processors=args.processors)
+            calculator = PriorityAttributesCalculator(graph)
+            start = time.perf_counter()
+            getattr(calculator, scheduler)(insertion=args.insertion)
+            elapsed = time.perf_counter() - start
+            work = max(1, len(graph["edges"]) * args.processors)
+            print(f"{scheduler:<24}{size:>8}{len(graph['edges']):>8}{elapsed:>10.3f}{elapsed / work * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
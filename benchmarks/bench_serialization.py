@@ -0,0 +1,54 @@
+# benchmarks/bench_serialization.py
+# Response encoding cost per endpoint: FastAPI's default path (.dict() on the
+# request, jsonable_encoder, JSONResponse) against the orjson path the routers
+# use now (shallow dict(), ORJSONResponse straight from the result).
+#
+#   python -m benchmarks.bench_serialization --size 300 --processors 8
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from api.algorithms import GraphData
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from benchmarks.generators import layered_dag
+
+ENDPOINTS = {
+    "/graph/properties": lambda calculator: calculator.obtain_attribute_dict(),
+    "/graph/properties/lst": lambda calculator: calculator.calculate_lst_steps(),
+    "/algorithm/hlfet-steps": lambda calculator: calculator.calculate_hlfet_steps(),
+    "/algorithm/mcp-steps": lambda calculator: calculator.calculate_mcp_steps(),
+    "/algorithm/etf-steps": lambda calculator: calculator.calculate_etf_steps(),
+}
+
+
+def _time(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--processors", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    graph_data = GraphData(**layered_dag(args.size, num_processors=args.processors))
+    print(f"request model: .dict() {_time(graph_data.dict, args.repeat) * 1e3:.2f}ms, "
+          f"dict() {_time(lambda: dict(graph_data), args.repeat) * 1e3:.3f}ms")
+
+    print(f"{'endpoint':<26}{'MB':>8}{'default ms':>12}{'orjson ms':>12}{'speedup':>10}")
+    for endpoint, compute in ENDPOINTS.items():
+        result = compute(PriorityAttributesCalculator(dict(graph_data)))
+        default = _time(lambda: JSONResponse(jsonable_encoder(result)), args.repeat)
+        fast = _time(lambda: ORJSONResponse(result), args.repeat)
+        size = len(ORJSONResponse(result).body) / 1e6
+        print(f"{endpoint:<26}{size:>8.2f}{default * 1e3:>12.1f}{fast * 1e3:>12.1f}{default / fast:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
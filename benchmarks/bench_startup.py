@@ -0,0 +1,64 @@
+# benchmarks/bench_startup.py
+# Cold start: time from `import main` until the app has run its startup, each
+# run in a fresh interpreter, and which heavy modules were imported on the
+# way. Exits with status 1 when the median is over --budget or a module that
+# should only load on demand was imported, so CI can enforce both.
+#
+#   python -m benchmarks.bench_startup --runs 10 --budget 1.5
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Imported only by the code paths that use them (obtain_attribute_table, GraphGivenJSON.parse_json)
+LAZY_MODULES = ("pandas", "networkx", "matplotlib")
+BUDGET = 1.5
+
+PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import main
+
+async def ready():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(ready())
+print(json.dumps({"seconds": time.perf_counter() - start,
+                  "loaded": [module for module in %r if module in sys.modules]}))
+"""
+
+
+def measure_startup():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", PROBE % (LAZY_MODULES,)], cwd=root,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=BUDGET, help="maximum median startup in seconds")
+    args = parser.parse_args()
+
+    runs = [measure_startup() for _ in range(args.runs)]
+    seconds = [run["seconds"] for run in runs]
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+    median = statistics.median(seconds)
+    print(f"startup over {args.runs} runs: median {median:.3f}s, min {min(seconds):.3f}s, max {max(seconds):.3f}s")
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"median startup {median:.3f}s is over the {args.budget:.3f}s budget")
+    if loaded:
+        failures.append(f"imported at startup: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/bench_suite.py
+# Runs every attribute method and scheduler behind the API endpoints on the
+# synthetic DAG families, and records time, peak memory and makespan. Results
+# go to a JSON baseline; --compare reruns the baseline's configuration and
+# exits with status 1 on a slowdown beyond --tolerance or a changed makespan.
+# Timings are machine-specific: regenerate the baseline before comparing on a
+# different machine (makespans are deterministic and compare anywhere).
+#
+#   python -m benchmarks.bench_suite --sizes 500 2000 --ccr 0.1 1 10 --output benchmarks/baseline.json
+#   python -m benchmarks.bench_suite --compare benchmarks/baseline.json --tolerance 0.25
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from benchmarks.generators import FAMILIES
+
+# method -> keyword arguments; each run builds a fresh calculator, like an endpoint
+METHODS = {
+    "obtain_attribute_dict": {},
+    "calculate_sl": {},
+    "calculate_t_level": {},
+    "calculate_est": {},
+    "calculate_lst": {},
+    "calculate_b_level": {},
+    "calculate_graph_analytics": {},
+    "calculate_sl_steps": {},
+    "calculate_est_steps": {},
+    "calculate_lst_steps": {},
+    "calculate_hlfet_steps": {"detail": "schedule"},
+    "calculate_mcp_steps": {"detail": "schedule"},
+    "calculate_etf_steps": {"detail": "schedule"},
+    "calculate_dls_steps": {"detail": "schedule"},
+    "calculate_heft_steps": {"detail": "schedule"},
+    "calculate_cpop_steps": {"detail": "schedule"},
+    "calculate_hlfet_steps+full": {"detail": "full"},
+    "calculate_etf_steps+insertion": {"detail": "schedule", "insertion": True},
+    "calculate_processor_sweep": {"algorithm": "hlfet", "max_processors": 32},
+}
+
+
+def run(graph, method):
+    name = method.split("+")[0]
+    return getattr(PriorityAttributesCalculator(graph), name)(**METHODS[method])
+
+
+def makespan_of(result):
+    # Schedule detail carries the makespan (a sweep, the sum over its processor
+    # counts); step lists end with the placements
+    if isinstance(result, dict):
+        if "curve" in result:
+            return sum(row["makespan"] for row in result["curve"])
+        return result.get("makespan")
+    end_times = [step["details"]["end_time"] for step in result
+                 if isinstance(step.get("details"), dict) and "end_time" in step["details"]]
+    return max(end_times) if end_times else None
+
+
+def measure(graph, method, repeat):
+    # Best-of-repeat time, then one traced run for the peak memory
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(graph, method)
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    run(graph, method)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 6), "peak_mb": round(peak / 1e6, 3), "makespan": makespan_of(result)}
+
+
+def run_suite(config):
+    results = []
+    for family in config["families"]:
+        for size in config["sizes"]:
+            for ccr in config["ccr"]:
+                graph = FAMILIES[family](size, config["density"], ccr, config["processors"], config["seed"])
+                for method in config["methods"]:
+                    row = {"family": family, "size": size, "ccr": ccr, "method": method,
+                           "V": len(graph["nodes"]), "E": len(graph["edges"])}
+                    row.update(measure(graph, method, config["repeat"]))
+                    results.append(row)
+                    print(f"{family:<22}{row['V']:>7}{row['E']:>8}{ccr:>6}  {method:<32}"
+                          f"{row['seconds']:>10.4f}{row['peak_mb']:>9.2f}{row['makespan'] or '':>10}",
+                          flush=True)
+    return results
+
+
+def compare(baseline, results, tolerance):
+    # Rows slower than baseline * (1 + tolerance), or whose makespan changed
+    previous = {(row["family"], row["size"], row["ccr"], row["method"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get((row["family"], row["size"], row["ccr"], row["method"]))
+        if old is None:
+            continue
+        ratio = row["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        if ratio > 1 + tolerance or row["makespan"] != old["makespan"]:
+            regressions.append((row, old, ratio))
+    for row, old, ratio in regressions:
+        print(f"REGRESSION {row['family']} size={row['size']} ccr={row['ccr']} {row['method']}: "
+              f"{old['seconds']:.4f}s -> {row['seconds']:.4f}s ({ratio:.2f}x), "
+              f"makespan {old['makespan']} -> {row['makespan']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--ccr", type=float, nargs="+", default=[0.1, 1.0, 10.0])
+    parser.add_argument("--density", type=int, default=3, help="edges per node (layered, montage, erdos_renyi)")
+    parser.add_argument("--processors", type=int, default=4)
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=list(METHODS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="rerun the configuration of this baseline and compare")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown when comparing")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        config = baseline["config"]
+    else:
+        baseline = None
+        config = {key: getattr(args, key) for key in
+                  ("families", "sizes", "ccr", "density", "processors", "methods", "repeat", "seed")}
+
+    print(f"{'family':<22}{'V':>7}{'E':>8}{'ccr':>6}  {'method':<32}{'seconds':>10}{'peak MB':>9}{'makespan':>10}")
+    results = run_suite(config)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": config, "python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, f, indent=1)
+    if baseline is not None:
+        regressions = compare(baseline, results, args.tolerance)
+        print(f"{len(regressions)} regression(s) against {args.compare}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
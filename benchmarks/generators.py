@@ -0,0 +1,161 @@
+# benchmarks/generators.py
+# Synthetic task graphs in the same JSON shape the API receives. Every family
+# takes a target number of nodes, a seed and the CCR (communication to
+# computation ratio: mean edge cost / mean node weight); density is the
+# number of edges per node for the families whose shape allows it.
+import math
+import random
+
+
+def _graph(rng, node_ids, edges, max_weight, ccr, num_processors):
+    # Weights uniform in [1, max_weight]; costs uniform with mean ccr * mean weight
+    max_cost = round(2 * ccr * (1 + max_weight) / 2)
+    nodes = [{"id": str(node), "weight": rng.randint(1, max_weight)} for node in node_ids]
+    edges = [{"source": str(source), "target": str(target), "cost": rng.randint(0, max_cost)}
+             for source, target in edges]
+    return {"num_processors": num_processors, "nodes": nodes, "edges": edges}
+
+
+def layered_dag(num_nodes, num_levels=None, out_degree=3, max_weight=10, max_cost=10, num_processors=4, seed=0):
+    # Random layered DAG: every node takes out_degree parents from the level above.
+    rng = random.Random(seed)
+    num_levels = num_levels or max(1, int(num_nodes ** 0.5))
+    levels = [[] for _ in range(num_levels)]
+    for node in range(num_nodes):
+        levels[node * num_levels // num_nodes].append(str(node))
+
+    nodes = [{"id": node, "weight": rng.randint(1, max_weight)} for level in levels for node in level]
+    edges = []
+    for upper, lower in zip(levels, levels[1:]):
+        for target in lower:
+            for source in rng.sample(upper, min(out_degree, len(upper))):
+                edges.append({"source": source, "target": target, "cost": rng.randint(0, max_cost)})
+
+    return {"num_processors": num_processors, "nodes": nodes, "edges": edges}
+
+
+def fork_join(num_nodes, width=None, max_weight=10, ccr=1.0, num_processors=4, seed=0):
+    # Chain of fork-join phases: fork -> width parallel tasks -> join, where
+    # each join is the next phase's fork.
+    rng = random.Random(seed)
+    width = width or max(1, int(num_nodes ** 0.5))
+    phases = max(1, (num_nodes - 1) // (width + 1))
+    node_ids = [0]
+    edges = []
+    fork = 0
+    for _ in range(phases):
+        tasks = range(len(node_ids), len(node_ids) + width)
+        join = len(node_ids) + width
+        node_ids.extend(tasks)
+        node_ids.append(join)
+        edges.extend((fork, task) for task in tasks)
+        edges.extend((task, join) for task in tasks)
+        fork = join
+    return _graph(rng, node_ids, edges, max_weight, ccr, num_processors)
+
+
+def fft(num_nodes, max_weight=10, ccr=1.0, num_processors=4, seed=0):
+    # FFT task graph for the largest m = 2^k points that fits: a binary tree
+    # of 2m - 1 recursive calls, whose m leaves feed log2(m) butterfly stages
+    # of m tasks each.
+    rng = random.Random(seed)
+    points = 2
+    while 2 * (points * 2) - 1 + (points * 2) * int(math.log2(points * 2)) <= num_nodes:
+        points *= 2
+    calls = 2 * points - 1
+    # Recursive calls in heap order: node i calls 2i + 1 and 2i + 2
+    edges = [(parent, child) for parent in range(points - 1) for child in (2 * parent + 1, 2 * parent + 2)]
+    previous = list(range(points - 1, calls))
+    next_id = calls
+    for stage in range(int(math.log2(points))):
+        current = list(range(next_id, next_id + points))
+        next_id += points
+        for i, task in enumerate(current):
+            edges.append((previous[i], task))
+            edges.append((previous[i ^ (1 << stage)], task))
+        previous = current
+    return _graph(rng, range(next_id), edges, max_weight, ccr, num_processors)
+
+
+def gaussian_elimination(num_nodes, max_weight=10, ccr=1.0, num_processors=4, seed=0):
+    # Gaussian elimination on the largest m x m matrix that fits, (m^2 + m - 2) / 2
+    # tasks: step k has a pivot task followed by one update per remaining column.
+    rng = random.Random(seed)
+    size = 2
+    while ((size + 1) ** 2 + (size + 1) - 2) // 2 <= num_nodes:
+        size += 1
+    ids = {}
+    for step in range(1, size):
+        ids[step, step] = len(ids)
+        for column in range(step + 1, size + 1):
+            ids[step, column] = len(ids)
+    edges = []
+    for step in range(1, size):
+        for column in range(step + 1, size + 1):
+            edges.append((ids[step, step], ids[step, column]))
+            if step + 1 < size:
+                # column step + 1 becomes the next pivot, the others its updates
+                edges.append((ids[step, column], ids[step + 1, column]))
+    return _graph(rng, range(len(ids)), edges, max_weight, ccr, num_processors)
+
+
+def montage(num_nodes, density=2, max_weight=10, ccr=1.0, num_processors=4, seed=0):
+    # Montage-like mosaic workflow: project every image, fit the difference of
+    # each overlapping pair (each image overlaps `density` later ones), then
+    # concat fits -> background model -> correct every image -> table -> add ->
+    # shrink -> jpeg.
+    rng = random.Random(seed)
+    images = max(2, (num_nodes - 5) // (density + 2))
+    project = list(range(images))
+    pairs = [(i, j) for i in range(images) for j in range(i + 1, min(images, i + 1 + density))]
+    diff = list(range(images, images + len(pairs)))
+    concat, model = images + len(pairs), images + len(pairs) + 1
+    background = list(range(model + 1, model + 1 + images))
+    table, add, shrink, jpeg = range(background[-1] + 1, background[-1] + 5)
+
+    edges = []
+    for task, (i, j) in zip(diff, pairs):
+        edges += [(project[i], task), (project[j], task), (task, concat)]
+    edges.append((concat, model))
+    for image, task in enumerate(background):
+        edges += [(project[image], task), (model, task), (task, table)]
+    edges += [(table, add), (add, shrink), (shrink, jpeg)]
+    return _graph(rng, range(jpeg + 1), edges, max_weight, ccr, num_processors)
+
+
+def erdos_renyi(num_nodes, density=3, max_weight=10, ccr=1.0, num_processors=4, seed=0):
+    # Erdos-Renyi DAG: density * V edges drawn uniformly among the pairs i < j
+    # of a random node order.
+    rng = random.Random(seed)
+    order = list(range(num_nodes))
+    rng.shuffle(order)
+    num_edges = min(density * num_nodes, num_nodes * (num_nodes - 1) // 2)
+    pairs = set()
+    while len(pairs) < num_edges:
+        i, j = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if i != j:
+            pairs.add((min(i, j), max(i, j)))
+    edges = [(order[i], order[j]) for i, j in sorted(pairs)]
+    return _graph(rng, order, edges, max_weight, ccr, num_processors)
+
+
+def layered(num_nodes, density=3, max_weight=10, ccr=1.0, num_processors=4, seed=0):
+    return layered_dag(num_nodes, out_degree=density, max_weight=max_weight,
+                       max_cost=round(2 * ccr * (1 + max_weight) / 2), num_processors=num_processors, seed=seed)
+
+
+# family name -> generator(num_nodes, density, ccr, num_processors, seed)
+FAMILIES = {
+    "layered": lambda num_nodes, density, ccr, num_processors, seed: layered(
+        num_nodes, density, ccr=ccr, num_processors=num_processors, seed=seed),
+    "fork_join": lambda num_nodes, density, ccr, num_processors, seed: fork_join(
+        num_nodes, ccr=ccr, num_processors=num_processors, seed=seed),
+    "fft": lambda num_nodes, density, ccr, num_processors, seed: fft(
+        num_nodes, ccr=ccr, num_processors=num_processors, seed=seed),
+    "gaussian_elimination": lambda num_nodes, density, ccr, num_processors, seed: gaussian_elimination(
+        num_nodes, ccr=ccr, num_processors=num_processors, seed=seed),
+    "montage": lambda num_nodes, density, ccr, num_processors, seed: montage(
+        num_nodes, density, ccr=ccr, num_processors=num_processors, seed=seed),
+    "erdos_renyi": lambda num_nodes, density, ccr, num_processors, seed: erdos_renyi(
+        num_nodes, density, ccr=ccr, num_processors=num_processors, seed=seed),
+}
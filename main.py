@@ -1,7 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from api.graph_properties import router as graph_properties_router
 from api.algorithms import router as algorithm_steps_router
+from api.npy_upload import router as npy_upload_router
+from api.sessions import router as session_router
+from api.metrics import render as render_metrics, slow_profiles
+from api.graph_store import GraphNotFound, graph_store
+from api.process_pool import PoolBusy, PoolError
+from api.result_cache import result_cache
 
 app = FastAPI()
 
@@ -18,13 +25,49 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST"],
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"],
 )
 
 # Include the routers
 app.include_router(graph_properties_router, prefix="/graph")
 app.include_router(algorithm_steps_router, prefix="/algorithm")
+app.include_router(npy_upload_router, prefix="/npy")
+app.include_router(session_router, prefix="/session")
+
+
+@app.exception_handler(PoolError)
+def pool_error(request, e):
+    # 503 when the process pool is full, 504 when a computation timed out
+    headers = {"Retry-After": "1"} if isinstance(e, PoolBusy) else None
+    return JSONResponse({"detail": str(e)}, status_code=e.status_code, headers=headers)
+
+
+@app.exception_handler(GraphNotFound)
+def graph_not_found(request, e):
+    return JSONResponse({"detail": str(e)}, status_code=404)
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return result_cache.stats()
+
+
+@app.get("/graph/store/stats")
+def graph_store_stats():
+    return graph_store.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text format: per-endpoint latency and phase histograms, graph sizes, cache hit rates
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/profiles")
+def profiles():
+    # cProfile summaries of the sampled requests slower than PROFILE_THRESHOLD, newest last
+    return list(slow_profiles)
 
 if __name__ == "__main__":
     import uvicorn
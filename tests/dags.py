@@ -0,0 +1,15 @@
+# Seeded random DAGs for the parity tests
+def random_dag(rng, num_nodes, values="int", max_in_degree=3):
+    # values: "int", "float" (every weight and cost) or "mixed" (either, per value)
+    def value(high):
+        if values == "int" or (values == "mixed" and rng.random() < 0.5):
+            return rng.randint(0, high)
+        return round(rng.random() * high, 2)
+
+    nodes = [{"id": f"n{node}", "weight": value(9)} for node in range(num_nodes)]
+    edges = []
+    for target in range(num_nodes):
+        for source in rng.sample(range(target), min(target, rng.randint(0, max_in_degree))):
+            edges.append({"source": f"n{source}", "target": f"n{target}", "cost": value(5)})
+    rng.shuffle(nodes)
+    return {"nodes": nodes, "edges": edges}
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+GRAPH = {
+    "nodes": [{"id": 1, "weight": 2}, {"id": 2, "weight": 3}, {"id": 3, "weight": 4}],
+    "edges": [{"source": 1, "target": 2, "cost": 1}, {"source": 1, "target": 3, "cost": 2}]
+}
+
+
+def test_brute_force_rejects_workers_below_one():
+    response = client.post("/algorithm/brute-force?workers=0", json=dict(GRAPH, num_processors=2))
+    assert response.status_code == 400
+
+
+def test_brute_force_rejects_workers_above_cap():
+    response = client.post("/algorithm/brute-force?workers=1000", json=dict(GRAPH, num_processors=2))
+    assert response.status_code == 400
+    assert "Workers must be between 1 and" in response.json()["detail"]
+
+
+def test_brute_force_clamps_budget():
+    response = client.post("/algorithm/brute-force?time_limit=1e9&node_limit=1000000000000",
+                           json=dict(GRAPH, num_processors=2))
+    assert response.status_code == 200
+    assert response.json()["optimal"] is True
+
+
+def test_batch_rejects_processor_counts_out_of_range():
+    for num_processors in [0, -1, 10 ** 9]:
+        response = client.post("/algorithm/batch", json={
+            "graphs": [GRAPH], "jobs": [{"graph": 0, "algorithm": "hlfet", "num_processors": num_processors}]})
+        assert response.status_code == 400
+        assert "num_processors must be between 1 and" in response.json()["detail"]
+
+
+def test_sweep_rejects_max_processors_above_cap():
+    response = client.post("/algorithm/sweep?min_processors=1000000000&max_processors=1000000100", json=GRAPH)
+    assert response.status_code == 400
+    assert "max_processors must be at most" in response.json()["detail"]
+
+
+def test_processor_count_out_of_range_is_rejected():
+    for num_processors in [0, 10 ** 9]:
+        for url in ["/algorithm/hlfet-steps", "/algorithm/etf-steps?stream=true", "/graph/properties"]:
+            response = client.post(url, json=dict(GRAPH, num_processors=num_processors))
+            assert response.status_code == 422, url
+        response = client.post("/session", json=dict(GRAPH, num_processors=num_processors))
+        assert response.status_code == 422
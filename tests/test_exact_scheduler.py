@@ -0,0 +1,94 @@
+import itertools
+import random
+
+from api import exact_scheduler
+from api.exact_scheduler import BranchAndBoundScheduler
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from dags import random_dag
+
+
+def exhaustive_makespan(graph, num_processors):
+    # Every task order that respects the edges, with every processor
+    # assignment, each task appended at its earliest start. Left-shifting any
+    # schedule gives one of these, so the minimum is the optimum.
+    nodes = [node['id'] for node in graph['nodes']]
+    weight = {node['id']: node['weight'] for node in graph['nodes']}
+    predecessors = {node: [] for node in nodes}
+    for edge in graph['edges']:
+        predecessors[edge['target']].append((edge['source'], edge['cost']))
+
+    best = float('inf')
+    for order in itertools.permutations(nodes):
+        position = {node: index for index, node in enumerate(order)}
+        if any(position[source] > position[target] for target in nodes for source, _ in predecessors[target]):
+            continue
+        for assignment in itertools.product(range(num_processors), repeat=len(nodes)):
+            processor = dict(zip(order, assignment))
+            available = [0] * num_processors
+            end = {}
+            for node in order:
+                start = available[processor[node]]
+                for source, cost in predecessors[node]:
+                    start = max(start, end[source] + (0 if processor[source] == processor[node] else cost))
+                end[node] = available[processor[node]] = start + weight[node]
+            best = min(best, max(end.values(), default=0))
+    return best
+
+
+def test_branch_and_bound_finds_the_optimum():
+    rng = random.Random(11)
+    for _ in range(25):
+        graph = dict(random_dag(rng, rng.randint(1, 6)), num_processors=rng.randint(1, 3))
+        result = PriorityAttributesCalculator(graph).brute_force_solution(workers=1)
+        assert result["optimal"] is True
+        assert result["makespan"] == exhaustive_makespan(graph, graph["num_processors"])
+
+
+def test_schedule_is_feasible_and_gives_the_makespan():
+    rng = random.Random(12)
+    for _ in range(25):
+        graph = dict(random_dag(rng, rng.randint(2, 10)), num_processors=rng.randint(1, 3))
+        result = PriorityAttributesCalculator(graph).brute_force_solution(workers=1)
+        placed = {placement['node']: placement for placement in result['schedule']}
+        weight = {node['id']: node['weight'] for node in graph['nodes']}
+        assert sorted(placed) == sorted(weight)
+        for edge in graph['edges']:
+            source, target = placed[edge['source']], placed[edge['target']]
+            cost = 0 if source['processor'] == target['processor'] else edge['cost']
+            assert target['start_time'] >= source['end_time'] + cost
+        by_processor = {}
+        for placement in placed.values():
+            assert placement['end_time'] == placement['start_time'] + weight[placement['node']]
+            by_processor.setdefault(placement['processor'], []).append(placement)
+        for placements in by_processor.values():
+            placements.sort(key=lambda placement: (placement['start_time'], placement['end_time']))
+            for first, second in zip(placements, placements[1:]):
+                assert second['start_time'] >= first['end_time']
+        assert result['makespan'] == max(placement['end_time'] for placement in placed.values())
+
+
+def test_infeasible_heuristic_schedule_is_not_a_seed():
+    # HLFET places n4 before its zero-weight predecessor n3 (equal SL)
+    graph = {
+        "nodes": [{"id": "n4", "weight": 5}, {"id": "n2", "weight": 3}, {"id": "n3", "weight": 0},
+                  {"id": "n1", "weight": 1}, {"id": "n0", "weight": 5}],
+        "edges": [{"source": "n0", "target": "n1", "cost": 5}, {"source": "n1", "target": "n2", "cost": 4},
+                  {"source": "n0", "target": "n2", "cost": 1}, {"source": "n0", "target": "n3", "cost": 3},
+                  {"source": "n1", "target": "n3", "cost": 4}, {"source": "n3", "target": "n4", "cost": 3}],
+        "num_processors": 3
+    }
+    result = PriorityAttributesCalculator(graph).brute_force_solution(workers=1)
+    assert result["heuristics"]["hlfet"]["feasible"] is False
+    assert result["makespan"] == exhaustive_makespan(graph, 3)
+
+
+def test_parallel_search_matches_serial(monkeypatch):
+    # A probe smaller than the search, so the subtrees go to the worker pool
+    monkeypatch.setattr(exact_scheduler, "PROBE_NODES", 50)
+    rng = random.Random(13)
+    for _ in range(4):
+        calculator = PriorityAttributesCalculator(dict(random_dag(rng, 9), num_processors=3))
+        serial = BranchAndBoundScheduler(calculator.graph, 3, calculator._sl()).solve(workers=1)
+        parallel = BranchAndBoundScheduler(calculator.graph, 3, calculator._sl()).solve(workers=2)
+        assert serial[2] is parallel[2] is True
+        assert serial[0] == parallel[0]
@@ -0,0 +1,80 @@
+import itertools
+import random
+
+import orjson
+import pytest
+
+from api.graph_session import GraphSession
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from dags import random_dag
+
+RUNS = [(algorithm, detail, insertion)
+        for algorithm in ["hlfet", "mcp", "etf", "dls", "heft", "cpop"]
+        for detail in ["schedule", "steps", "full"]
+        for insertion in [False, True]
+        if not (algorithm in ("heft", "cpop") and insertion)]
+
+
+def dumps(value):
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def random_edit(rng, session, counter, values):
+    graph = session.graph
+    node_ids = graph.node_ids
+    number = (lambda: rng.randint(0, 9) + 0.5 * rng.randint(0, 1)) if values == "float" else (lambda: rng.randint(0, 9))
+    op = rng.choice(["add_node", "remove_node", "set_weight", "add_edge", "add_edge", "remove_edge", "set_cost"])
+    if op == "add_node" or not node_ids:
+        return {"op": "add_node", "id": f"x{next(counter)}", "weight": number()}
+    if op == "remove_node":
+        return {"op": "remove_node", "id": rng.choice(node_ids)}
+    if op == "add_edge":
+        return {"op": "add_edge", "source": rng.choice(node_ids), "target": rng.choice(node_ids), "cost": number()}
+    if op == "set_weight" or not graph.edges:
+        return {"op": "set_weight", "id": rng.choice(node_ids), "weight": number()}
+    source, target = rng.choice(list(graph.edges))
+    if op == "remove_edge":
+        return {"op": "remove_edge", "source": node_ids[source], "target": node_ids[target]}
+    return {"op": "set_cost", "source": node_ids[source], "target": node_ids[target], "cost": number()}
+
+
+def assert_matches_stateless(session, rng):
+    json_data = session.to_json()
+    assert dumps(session.properties()) == dumps(PriorityAttributesCalculator(json_data).obtain_attribute_dict())
+    for algorithm, detail, insertion in RUNS:
+        args = (detail, 0, None) + ((insertion,) if algorithm not in ("heft", "cpop") else ())
+        expected = getattr(PriorityAttributesCalculator(json_data), f"calculate_{algorithm}_steps")(*args)
+        assert dumps(session.run(algorithm, detail, 0, None, insertion)) == dumps(expected), (algorithm, detail, insertion)
+    cursor, limit = rng.randint(0, session.graph.num_nodes + 2), rng.choice([None, 1, 3])
+    expected = PriorityAttributesCalculator(json_data).calculate_hlfet_steps("steps", cursor, limit)
+    assert dumps(session.run("hlfet", "steps", cursor, limit)) == dumps(expected)
+
+
+@pytest.mark.parametrize("values", ["int", "float"])
+def test_session_replay_matches_stateless(values):
+    rng = random.Random(20)
+    for _ in range(6):
+        graph = dict(random_dag(rng, rng.randint(1, 20), values), num_processors=rng.randint(1, 3))
+        session = GraphSession(graph)
+        counter = itertools.count()
+        assert_matches_stateless(session, rng)
+        for _ in range(10):
+            batch = [random_edit(rng, session, counter, values) for _ in range(rng.randint(1, 3))]
+            try:
+                session.apply(batch)
+            except ValueError:
+                # A failing edit (cycle, unknown id) stops the batch; the edits
+                # before it stay applied
+                pass
+            assert_matches_stateless(session, rng)
+
+
+def test_edits_before_a_failing_edit_stay_applied():
+    session = GraphSession(dict(random_dag(random.Random(20), 5), num_processors=2))
+    with pytest.raises(ValueError, match="Edit 1"):
+        session.apply([{"op": "set_weight", "id": "n0", "weight": 42},
+                       {"op": "set_weight", "id": "missing", "weight": 1},
+                       {"op": "set_weight", "id": "n1", "weight": 43}])
+    weights = {node["id"]: node["weight"] for node in session.to_json()["nodes"]}
+    assert weights["n0"] == 42 and weights["n1"] != 43
+    assert_matches_stateless(session, random.Random(20))
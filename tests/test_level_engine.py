@@ -0,0 +1,29 @@
+import random
+
+import orjson
+import pytest
+
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from dags import random_dag
+
+
+def dumps(result):
+    return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+
+
+@pytest.mark.parametrize("values", ["int", "float", "mixed"])
+def test_vectorized_attributes_match_reference(values):
+    rng = random.Random(4)
+    for _ in range(100):
+        graph = dict(random_dag(rng, rng.randint(1, 40), values), num_processors=2)
+        vectorized = PriorityAttributesCalculator(graph).obtain_attribute_dict()
+        reference = PriorityAttributesCalculator(graph, vectorized=False).obtain_attribute_dict()
+        # Compared as JSON: 0 and 0.0 are equal in Python but not in the response
+        assert dumps(vectorized) == dumps(reference)
+
+
+def test_entry_nodes_keep_integer_zero_in_float_graphs():
+    graph = {"nodes": [{"id": "a", "weight": 1.5}, {"id": "b", "weight": 2.5}],
+             "edges": [{"source": "a", "target": "b", "cost": 0.5}], "num_processors": 1}
+    t_level = PriorityAttributesCalculator(graph).calculate_t_level()
+    assert dumps(t_level) == b'{"a":0,"b":2.0}'
@@ -0,0 +1,38 @@
+import random
+
+import orjson
+import pytest
+
+from api import placement_kernel
+from api.placement_kernel import PlacementKernel
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from dags import random_dag
+
+ALGORITHMS = ["hlfet", "mcp", "etf", "dls"]
+
+
+def run_all(graph):
+    return [getattr(PriorityAttributesCalculator(graph), f"calculate_{algorithm}_steps")(detail, 0, None, insertion)
+            for algorithm in ALGORITHMS
+            for detail in ["schedule", "steps", "full"]
+            for insertion in [False, True]]
+
+
+def test_kernel_matches_python_loops(monkeypatch):
+    rng = random.Random(24)
+    for _ in range(25):
+        graph = dict(random_dag(rng, rng.randint(1, 30), "int"), num_processors=rng.choice([1, 2, 3, 5, 8, 40]))
+        monkeypatch.setattr(placement_kernel, "MIN_PROCESSORS", 10 ** 9)
+        expected = run_all(graph)
+        monkeypatch.setattr(placement_kernel, "MIN_PROCESSORS", 1)
+        assert orjson.dumps(run_all(graph), option=orjson.OPT_NON_STR_KEYS) == \
+            orjson.dumps(expected, option=orjson.OPT_NON_STR_KEYS)
+
+
+@pytest.mark.parametrize("values", ["float", "mixed"])
+def test_kernel_skips_float_graphs(monkeypatch, values):
+    monkeypatch.setattr(placement_kernel, "MIN_PROCESSORS", 1)
+    graph = dict(random_dag(random.Random(24), 20, values), num_processors=64)
+    assert PriorityAttributesCalculator(graph)._placement_kernel() is None
+    graph = dict(random_dag(random.Random(24), 20, "int"), num_processors=64)
+    assert isinstance(PriorityAttributesCalculator(graph)._placement_kernel(), PlacementKernel)
@@ -0,0 +1,84 @@
+import threading
+
+import orjson
+from fastapi.testclient import TestClient
+
+from api import batch, process_pool, streaming
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from api.process_pool import runs_inline
+from benchmarks.generators import layered_dag
+from main import app
+
+client = TestClient(app)
+
+
+def test_dense_graph_on_many_processors_goes_to_pool():
+    nodes = [{"id": i, "weight": 1} for i in range(199)]
+    edges = [{"source": s, "target": t, "cost": 1} for t in range(199) for s in range(t)]
+    assert runs_inline({"nodes": nodes, "edges": edges, "num_processors": 2}) is False
+    assert runs_inline({"nodes": nodes, "edges": [], "num_processors": 256}) is False
+    assert runs_inline({"nodes": nodes[:20], "edges": edges[:30], "num_processors": 4}) is True
+
+
+def test_large_stream_matches_inline_stream(monkeypatch):
+    graph = layered_dag(60, num_processors=4)
+    url = "/algorithm/hlfet-steps?stream=true&detail=full"
+    inline = client.post(url, json=graph)
+    monkeypatch.setattr(process_pool, "POOL_MIN_WORK", 0)
+    large = client.post(url, json=graph)
+    assert large.status_code == inline.status_code == 200
+    assert large.headers["content-type"] == inline.headers["content-type"]
+    assert large.content == inline.content
+    assert [orjson.loads(line) for line in large.content.splitlines()][0]["step"]
+
+
+def test_large_stream_reports_errors(monkeypatch):
+    monkeypatch.setattr(process_pool, "POOL_MIN_WORK", 0)
+    graph = {"nodes": [{"id": 1, "weight": 1}], "edges": [{"source": 1, "target": 2, "cost": 1}],
+             "num_processors": 2}
+    assert client.post("/algorithm/etf-steps?stream=true", json=graph).status_code == 400
+
+
+def test_large_streams_share_bounded_slots(monkeypatch):
+    monkeypatch.setattr(process_pool, "POOL_MIN_WORK", 0)
+    monkeypatch.setattr(streaming, "_stream_slots", threading.BoundedSemaphore(1))
+    graph = layered_dag(30, num_processors=2)
+    # Finished and failed streams give their slot back
+    assert client.post("/algorithm/hlfet-steps?stream=true", json=graph).status_code == 200
+    assert client.post("/algorithm/etf-steps?stream=true", json=dict(graph, nodes=[])).status_code == 400
+    assert client.post("/algorithm/etf-steps?stream=true", json=graph).status_code == 200
+    streaming._stream_slots.acquire()
+    assert client.post("/algorithm/etf-steps?stream=true", json=graph).status_code == 503
+
+
+def test_batch_with_more_graphs_than_pool_slots(monkeypatch):
+    monkeypatch.setattr(process_pool, "MAX_PENDING", 2)
+    monkeypatch.setattr(batch, "WORKERS", 2)
+    graphs = [layered_dag(20 + i, num_processors=None) for i in range(7)]
+    jobs = [{"graph": i, "algorithm": "hlfet", "num_processors": 2} for i in range(len(graphs))]
+    response = client.post("/algorithm/batch", json={"graphs": graphs, "jobs": jobs})
+    assert response.status_code == 200
+    assert [result["graph"] for result in response.json()["results"]] == list(range(len(graphs)))
+    assert all("makespan" in result for result in response.json()["results"])
+
+
+def test_batch_is_busy_when_the_pool_is_full(monkeypatch):
+    monkeypatch.setattr(process_pool, "MAX_PENDING", 0)
+    graph = layered_dag(20, num_processors=None)
+    response = client.post("/algorithm/batch", json={
+        "graphs": [graph], "jobs": [{"graph": 0, "algorithm": "hlfet", "num_processors": 2}]})
+    assert response.status_code == 503
+
+
+def test_large_graph_in_a_worker_matches_inline():
+    graph = layered_dag(250, num_processors=4)
+    response = client.post("/algorithm/hlfet-steps?detail=schedule", json=graph)
+    assert response.status_code == 200
+    expected = PriorityAttributesCalculator(graph).calculate_hlfet_steps(detail="schedule")
+    assert response.json() == orjson.loads(orjson.dumps(expected))
+
+
+def test_full_pool_is_busy(monkeypatch):
+    monkeypatch.setattr(process_pool, "MAX_PENDING", 0)
+    response = client.post("/algorithm/mcp-steps?detail=schedule", json=layered_dag(260, num_processors=4))
+    assert response.status_code == 503
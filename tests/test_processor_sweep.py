@@ -0,0 +1,27 @@
+import random
+
+import orjson
+import pytest
+
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from dags import random_dag
+
+
+def with_types(graph, weight_type, cost_type):
+    return {"nodes": [dict(node, weight=weight_type(node["weight"])) for node in graph["nodes"]],
+            "edges": [dict(edge, cost=cost_type(edge["cost"])) for edge in graph["edges"]]}
+
+
+@pytest.mark.parametrize("weight_type, cost_type", [(int, int), (int, float), (float, int), (float, float)])
+@pytest.mark.parametrize("algorithm", ["hlfet", "mcp"])
+def test_sweep_matches_single_processor_counts(algorithm, weight_type, cost_type):
+    rng = random.Random(23)
+    for trial in range(40):
+        graph = with_types(random_dag(rng, rng.randint(0, 20), "mixed"), weight_type, cost_type)
+        if trial % 10 == 0:
+            graph["nodes"] = [dict(node, weight=node["weight"] * 0) for node in graph["nodes"]]
+        sweep = PriorityAttributesCalculator(dict(graph, num_processors=1)).calculate_processor_sweep(algorithm, 1, 5)
+        for entry in sweep["curve"]:
+            single = getattr(PriorityAttributesCalculator(dict(graph, num_processors=entry["num_processors"])),
+                             f"calculate_{algorithm}_steps")(detail="schedule")
+            assert orjson.dumps(entry["makespan"]) == orjson.dumps(single["makespan"])
@@ -0,0 +1,30 @@
+import random
+
+from api.processor_timeline import ProcessorTimeline
+
+
+def scan_earliest_start(busy, ready_time, duration):
+    # Walk the sorted busy intervals from ready_time to the first idle slot that fits
+    start_time = ready_time
+    for busy_start, busy_end in busy:
+        if busy_end <= start_time:
+            continue
+        if start_time + duration <= busy_start:
+            return start_time
+        start_time = max(start_time, busy_end)
+    return start_time
+
+
+def test_timeline_matches_interval_scan():
+    rng = random.Random(14)
+    for _ in range(200):
+        timeline, busy = ProcessorTimeline(), []
+        for _ in range(rng.randint(1, 60)):
+            ready_time = rng.randint(0, 80) + rng.choice([0, 0.5])
+            duration = rng.choice([0, rng.randint(1, 8)])
+            start_time = timeline.earliest_start(ready_time, duration)
+            assert start_time == scan_earliest_start(busy, ready_time, duration)
+            timeline.insert(start_time, start_time + duration)
+            busy.append((start_time, start_time + duration))
+            busy.sort(key=lambda interval: (interval[1], interval[0]))
+            assert timeline.end_time == max(end for _, end in busy)
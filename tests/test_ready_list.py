@@ -0,0 +1,83 @@
+import random
+
+import orjson
+import pytest
+
+from api.priority_attributes_calculator import PriorityAttributesCalculator
+from dags import random_dag
+
+
+def earliest_slot(busy, ready_time, duration):
+    # First idle gap on a processor from ready_time on that fits duration
+    start_time = ready_time
+    for busy_start, busy_end in sorted(busy):
+        if busy_end <= start_time:
+            continue
+        if start_time + duration <= busy_start:
+            return start_time
+        start_time = max(start_time, busy_end)
+    return start_time
+
+
+def scan_schedule(graph, num_processors, algorithm, insertion):
+    # ETF / DLS as a plain scan: every ready node (in the order they became
+    # ready) on every processor, keeping the first minimal key
+    nodes = [node['id'] for node in graph['nodes']]
+    weight = {node['id']: node['weight'] for node in graph['nodes']}
+    predecessors = {node: [] for node in nodes}
+    successors = {node: [] for node in nodes}
+    for edge in graph['edges']:
+        predecessors[edge['target']].append((edge['source'], edge['cost']))
+        successors[edge['source']].append(edge['target'])
+    sl = {}
+
+    def static_level(node):
+        if node not in sl:
+            sl[node] = weight[node] + max((static_level(successor) for successor in successors[node]), default=0)
+        return sl[node]
+
+    available = {processor: 0 for processor in range(1, num_processors + 1)}
+    busy = {processor: [] for processor in available}
+    placed = {}
+    ready = [node for node in nodes if not predecessors[node]]
+    schedule = []
+    while ready:
+        best = None
+        for node in ready:
+            for processor in available:
+                ready_time = 0
+                for source, cost in predecessors[node]:
+                    source_processor, source_end = placed[source]
+                    ready_time = max(ready_time, source_end if source_processor == processor else source_end + cost)
+                if insertion:
+                    start_time = earliest_slot(busy[processor], ready_time, weight[node])
+                else:
+                    start_time = max(available[processor], ready_time)
+                key = (start_time, -static_level(node)) if algorithm == "etf" else (start_time - static_level(node),)
+                if best is None or key < best[0]:
+                    best = (key, node, processor, start_time)
+        _, node, processor, start_time = best
+        end_time = start_time + weight[node]
+        placed[node] = (processor, end_time)
+        busy[processor].append((start_time, end_time))
+        available[processor] = max(available[processor], end_time)
+        schedule.append({"node": node, "processor": processor, "start_time": start_time, "end_time": end_time})
+        ready.remove(node)
+        for successor in successors[node]:
+            if all(source in placed for source, _ in predecessors[successor]):
+                ready.append(successor)
+    return schedule
+
+
+@pytest.mark.parametrize("algorithm", ["etf", "dls"])
+@pytest.mark.parametrize("insertion", [False, True])
+def test_ready_list_matches_scan(algorithm, insertion):
+    rng = random.Random(14)
+    for _ in range(120):
+        values = rng.choice(["int", "float"])
+        num_processors = rng.randint(1, 4)
+        graph = dict(random_dag(rng, rng.randint(1, 30), values), num_processors=num_processors)
+        result = getattr(PriorityAttributesCalculator(graph), f"calculate_{algorithm}_steps")(
+            detail="schedule", insertion=insertion)
+        expected = scan_schedule(graph, num_processors, algorithm, insertion)
+        assert orjson.dumps(result['schedule']) == orjson.dumps(expected)
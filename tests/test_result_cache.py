@@ -0,0 +1,31 @@
+from api.result_cache import ResultCache
+
+
+def test_evicts_least_recently_used_entries():
+    cache = ResultCache(max_entries=2, max_bytes=100)
+    cache.get_or_compute("a", lambda: b"1")
+    cache.get_or_compute("b", lambda: b"2")
+    cache.get_or_compute("a", lambda: b"")
+    cache.get_or_compute("c", lambda: b"3")
+    assert cache.get_or_compute("a", lambda: b"new") == b"1"
+    assert cache.get_or_compute("b", lambda: b"new") == b"new"
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = ResultCache(max_entries=10, max_bytes=10)
+    cache.get_or_compute("a", lambda: b"1234")
+    cache.get_or_compute("b", lambda: b"1234")
+    cache.get_or_compute("a", lambda: b"")
+    cache.get_or_compute("c", lambda: b"1234")
+    assert cache.stats()["bytes"] == 8
+    assert cache.get_or_compute("a", lambda: b"new") == b"1234"
+    assert cache.get_or_compute("b", lambda: b"new") == b"new"
+
+
+def test_does_not_keep_bodies_larger_than_the_limit():
+    cache = ResultCache(max_entries=10, max_bytes=10)
+    cache.get_or_compute("small", lambda: b"12")
+    assert cache.get_or_compute("large", lambda: b"x" * 11) == b"x" * 11
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["bytes"] == 2
+    assert cache.get_or_compute("large", lambda: b"again") == b"again"
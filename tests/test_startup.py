@@ -0,0 +1,9 @@
+import statistics
+
+from benchmarks.bench_startup import BUDGET, measure_startup
+
+
+def test_startup_within_budget_without_lazy_modules():
+    runs = [measure_startup() for _ in range(3)]
+    assert [run["loaded"] for run in runs] == [[]] * len(runs)
+    assert statistics.median(run["seconds"] for run in runs) <= BUDGET